@@ -1,23 +1,133 @@
 """
 Adzuna: fetch all jobs for a list of job titles.
 
-Core utility (non-test) that loops over job_titles, calls the Adzuna API per title/page,
-aggregates results and dedupes by job id. No default job list; callers pass job_titles
-(e.g. from top_jobs.TOP_JOBS).
+Core utility (non-test) that fans out over job_titles through the shared async HTTP
+layer (http_client), pages through each title, aggregates results and dedupes by
+job id. With checkpoints only postings newer than the last run are fetched. No default
+job list; callers pass job_titles (e.g. from top_jobs.TOP_JOBS).
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional
 
 try:
-    from backend.app.api.adzuna.test_adzuna_api import test_adzuna_api
+    from backend.app.api.adzuna.test_adzuna_api import fetch_adzuna_page
+    from backend.app.api.http_client import (
+        HttpSession, iter_completed, open_session, run_sync, stream_sync,
+    )
+    from backend.app.api.checkpoints import Checkpoint
 except ImportError:
-    from test_adzuna_api import test_adzuna_api
+    from test_adzuna_api import fetch_adzuna_page
+    import os
+    import sys
+    _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if _api_dir not in sys.path:
+        sys.path.insert(0, _api_dir)
+    from http_client import HttpSession, iter_completed, open_session, run_sync, stream_sync
+    from checkpoints import Checkpoint
+
+
+async def _fetch_title(
+    http: HttpSession,
+    title: str,
+    results_per_page: int,
+    max_pages_per_job: int,
+    checkpoint: Optional[Checkpoint],
+) -> List[Dict[str, Any]]:
+    """
+    Pages for one title. With a checkpoint, pages are requested newest-first and
+    paging stops at the first page that reaches postings from an earlier run.
+
+    When max_pages_per_job runs out first, the checkpoint keeps its date mark and
+    the next run continues from the following page (resume_page) instead of page 1,
+    until it reaches postings older than the mark. Postings added meanwhile only
+    push already-fetched ones onto later pages, where their ids filter them out.
+    """
+    jobs: List[Dict[str, Any]] = []
+    first = (checkpoint.resume_page if checkpoint is not None else None) or 1
+    complete = False
+    page = first
+    for page in range(first, first + max_pages_per_job):
+        data = await fetch_adzuna_page(
+            http,
+            page=page,
+            keywords=title,
+            results_per_page=results_per_page,
+            sort_by="date" if checkpoint is not None else None,
+        )
+        results = data.get("results") or []
+        if checkpoint is not None:
+            fresh = checkpoint.filter_new(results)
+            jobs.extend(fresh)
+            # A resumed fetch re-reads ids it already has, so only the date mark ends it
+            if checkpoint.resume_page:
+                reached = checkpoint.older_than_mark(results)
+            else:
+                reached = len(fresh) < len(results)
+            if reached:
+                complete = True
+                break
+        else:
+            jobs.extend(results)
+        # "count" is the total before the title filter in fetch_adzuna_page
+        if not results or page * results_per_page >= (data.get("count") or 0):
+            complete = True
+            break
+    if checkpoint is not None:
+        checkpoint.advance(jobs, complete=complete, resume_page=page + 1)
+    return jobs
+
+
+async def fetch_all_top_jobs_async(
+    job_titles: List[str],
+    results_per_page: int = 50,
+    max_pages_per_job: int = 1,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_all_top_jobs: titles are fetched concurrently (pages of one
+    title in order), paced by the session's Adzuna rate limit and concurrency bound.
+    """
+    checkpoints = checkpoints or {}
+    async with open_session(session) as http:
+        responses = await asyncio.gather(
+            *(
+                _fetch_title(
+                    http,
+                    title,
+                    results_per_page,
+                    max_pages_per_job,
+                    checkpoints.get(title),
+                )
+                for title in job_titles
+            ),
+            return_exceptions=True,
+        )
+
+    all_jobs: List[Dict[str, Any]] = []
+    seen_ids: set = set()
+
+    # Merge in request order so the output matches the sequential loop
+    for title, results in zip(job_titles, responses):
+        if isinstance(results, BaseException):
+            # Retries / circuit breaking already happened in the HTTP layer
+            print(f"⚠️ Skipping Adzuna '{title}': {results}")
+            continue
+        for job in results:
+            job_id = job.get("id")
+            if job_id is not None and job_id not in seen_ids:
+                seen_ids.add(job_id)
+                all_jobs.append(job)
+
+    return all_jobs
 
 
 def fetch_all_top_jobs(
     job_titles: List[str],
     results_per_page: int = 50,
     max_pages_per_job: int = 1,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch jobs from Adzuna for each title in job_titles, across pages, and dedupe by job id.
@@ -26,28 +136,64 @@ def fetch_all_top_jobs(
         job_titles: List of job title strings to search for (no default; from top_jobs.TOP_JOBS).
         results_per_page: Number of results per API page (default 50).
         max_pages_per_job: Max pages to fetch per job title (default 1).
+        checkpoints: Optional title -> Checkpoint; only postings newer than each
+                     title's checkpoint are returned (and the checkpoint advanced).
 
     Returns:
         Combined, deduplicated list of raw Adzuna job dicts.
     """
-    all_jobs: List[Dict[str, Any]] = []
-    seen_ids: set = set()
+    return run_sync(fetch_all_top_jobs_async(
+        job_titles,
+        results_per_page=results_per_page,
+        max_pages_per_job=max_pages_per_job,
+        checkpoints=checkpoints,
+    ))
 
-    for title in job_titles:
-        for page in range(1, max_pages_per_job + 1):
-            try:
-                data = test_adzuna_api(
-                    page=page,
-                    keywords=title,
-                    results_per_page=results_per_page,
-                )
-            except Exception:
+
+async def iter_all_top_jobs_async(
+    job_titles: List[str],
+    results_per_page: int = 50,
+    max_pages_per_job: int = 1,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming version of fetch_all_top_jobs_async: yields deduplicated jobs title by
+    title as each title finishes (completion order, not title order).
+    """
+    checkpoints = checkpoints or {}
+    seen_ids: set = set()
+    async with open_session(session) as http:
+        titles = iter_completed(
+            job_titles,
+            lambda title: _fetch_title(
+                http, title, results_per_page, max_pages_per_job, checkpoints.get(title)
+            ),
+        )
+        async for title, results in titles:
+            if isinstance(results, BaseException):
+                print(f"⚠️ Skipping Adzuna '{title}': {results}")
                 continue
-            results = data.get("results") or []
             for job in results:
                 job_id = job.get("id")
                 if job_id is not None and job_id not in seen_ids:
                     seen_ids.add(job_id)
-                    all_jobs.append(job)
+                    yield job
 
-    return all_jobs
+
+def iter_all_top_jobs(
+    job_titles: List[str],
+    results_per_page: int = 50,
+    max_pages_per_job: int = 1,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Same jobs as fetch_all_top_jobs, streamed while the fetch is still running
+    (see http_client.stream_sync); feed it to run_ingestion for batched inserts.
+    """
+    return stream_sync(iter_all_top_jobs_async(
+        job_titles,
+        results_per_page=results_per_page,
+        max_pages_per_job=max_pages_per_job,
+        checkpoints=checkpoints,
+    ))
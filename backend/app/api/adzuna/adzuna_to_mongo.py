@@ -17,13 +17,13 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.adzuna.test_adzuna_api import test_adzuna_api, normalize_adzuna_job
@@ -31,10 +31,41 @@ except ImportError:
     from test_adzuna_api import test_adzuna_api, normalize_adzuna_job
 
 
+SOURCE = "Adzuna"
+
+
+def checkpoint_query(keywords: Optional[str] = "Software Engineer") -> str:
+    """Checkpoint query key for a fetch configuration."""
+    return keywords or "Software Engineer"
+
+
+def fetch_jobs(
+    keywords: Optional[str] = "Software Engineer",
+    page: int = 1,
+    results_per_page: int = 50,
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch raw Adzuna jobs; with a checkpoint, only postings newer than the last run."""
+    result = test_adzuna_api(
+        page=page,
+        keywords=keywords,
+        results_per_page=results_per_page,
+    )
+    jobs = result.get("results", [])
+    if checkpoint is not None:
+        fresh = checkpoint.filter_new(jobs)
+        # A full page of unseen postings may have more behind it: keep the date mark
+        last_page = page * results_per_page >= (result.get("count") or 0)
+        checkpoint.advance(fresh, complete=len(fresh) < len(jobs) or last_page)
+        jobs = fresh
+    return jobs
+
+
 def run(
     keywords: Optional[str] = "Software Engineer",
     page: int = 1,
     results_per_page: int = 50,
+    incremental: bool = True,
 ) -> int:
     """
     Fetch jobs from Adzuna for the given keyword, then insert into MongoDB.
@@ -43,20 +74,22 @@ def run(
     print("Adzuna → MongoDB (single keyword)")
     print("=" * 50)
 
-    def fetch_jobs():
-        result = test_adzuna_api(
-            page=page,
-            keywords=keywords,
-            results_per_page=results_per_page,
-        )
-        return result.get("results", [])
+    # Only postings newer than the last successful run for this query
+    query = checkpoint_query(keywords)
+    checkpoint = load_checkpoints(SOURCE, [query])[query] if incremental else None
 
-    jobs = fetch_jobs()
+    jobs = fetch_jobs(
+        keywords=keywords,
+        page=page,
+        results_per_page=results_per_page,
+        checkpoint=checkpoint,
+    )
     print(f"Retrieved {len(jobs)} job postings from Adzuna.")
     count = run_ingestion(
-        source="Adzuna",
+        source=SOURCE,
         normalizer=normalize_adzuna_job,
         fetch_jobs=lambda: jobs,
+        checkpoints=[checkpoint] if checkpoint is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
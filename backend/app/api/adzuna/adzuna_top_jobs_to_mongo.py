@@ -11,23 +11,23 @@ Run from backend: python app/api/adzuna/adzuna_top_jobs_to_mongo.py
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
-    from backend.app.api.adzuna.adzuna_fetch_top_jobs import fetch_all_top_jobs
+    from backend.app.api.adzuna.adzuna_fetch_top_jobs import iter_all_top_jobs
     from backend.app.api.adzuna.test_adzuna_api import normalize_adzuna_job
     from backend.app.api.top_jobs import TOP_JOBS
 except ImportError:
-    from adzuna_fetch_top_jobs import fetch_all_top_jobs
+    from adzuna_fetch_top_jobs import iter_all_top_jobs
     from test_adzuna_api import normalize_adzuna_job
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -36,25 +36,47 @@ except ImportError:
     from top_jobs import TOP_JOBS
 
 
+SOURCE = "Adzuna"
+
+
+def fetch_jobs(
+    job_titles: Optional[List[str]] = None,
+    results_per_page: int = 50,
+    max_pages_per_job: int = 1,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream raw Adzuna jobs for each title in TOP_JOBS (or given list), deduped."""
+    return iter_all_top_jobs(
+        job_titles=job_titles or TOP_JOBS,
+        results_per_page=results_per_page,
+        max_pages_per_job=max_pages_per_job,
+        checkpoints=checkpoints,
+    )
+
+
 def run(
     job_titles: Optional[List[str]] = None,
     results_per_page: int = 50,
     max_pages_per_job: int = 1,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from Adzuna for the top jobs list (or given titles), then insert into MongoDB."""
     print("Adzuna → MongoDB (Top Jobs)")
     print("=" * 50)
     titles = job_titles or TOP_JOBS
-    all_jobs = fetch_all_top_jobs(
-        job_titles=titles,
-        results_per_page=results_per_page,
-        max_pages_per_job=max_pages_per_job,
-    )
-    print(f"Retrieved {len(all_jobs)} job postings from Adzuna.")
+    # Per-title checkpoints: only postings newer than the last successful run
+    checkpoints = load_checkpoints(SOURCE, titles) if incremental else None
+    # Streams jobs while titles are still being fetched; inserted in batches
     count = run_ingestion(
-        source="Adzuna",
+        source=SOURCE,
         normalizer=normalize_adzuna_job,
-        fetch_jobs=lambda: all_jobs,
+        fetch_jobs=lambda: fetch_jobs(
+            job_titles=titles,
+            results_per_page=results_per_page,
+            max_pages_per_job=max_pages_per_job,
+            checkpoints=checkpoints,
+        ),
+        checkpoints=checkpoints.values() if checkpoints is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
@@ -7,7 +7,7 @@ Type: Job aggregator API
 Auth: API key required
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -18,12 +18,14 @@ from dotenv import load_dotenv
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import HttpSession, run_with_session
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import HttpSession, run_with_session
 
 # Load environment variables from .env file in backend directory
 env_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
@@ -57,6 +59,29 @@ def test_adzuna_api(page: int = 1, keywords: Optional[str] = None,
     Raises:
         ValueError: If app_id is not provided
     """
+    return run_with_session(
+        lambda session: fetch_adzuna_page(
+            session,
+            page=page,
+            keywords=keywords,
+            app_id=app_id,
+            app_key=app_key,
+            results_per_page=results_per_page,
+        )
+    )
+
+
+async def fetch_adzuna_page(session: HttpSession,
+                            page: int = 1,
+                            keywords: Optional[str] = None,
+                            app_id: Optional[str] = None,
+                            app_key: Optional[str] = None,
+                            results_per_page: int = 50,
+                            sort_by: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async Adzuna call through the shared HttpSession (same arguments and result as test_adzuna_api).
+    sort_by="date" returns newest postings first (used for incremental fetching).
+    """
     try:
         # Adzuna API endpoint format - page number goes in the URL path
         url = f'https://api.adzuna.com/v1/api/jobs/us/search/{page}'
@@ -84,10 +109,10 @@ def test_adzuna_api(page: int = 1, keywords: Optional[str] = None,
         
         # Search for Software Engineer
         params['what'] = keywords or "Software Engineer"
+        if sort_by:
+            params['sort_by'] = sort_by
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = await session.get_json("Adzuna", url, params=params)
         
         # Post-process to filter by job title: keep jobs whose title contains the search keyword
         if 'results' in data and params.get('what'):
@@ -102,10 +127,11 @@ def test_adzuna_api(page: int = 1, keywords: Optional[str] = None,
                 data['results'] = filtered_results
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Adzuna API: {error}')
-        if hasattr(error.response, 'text'):
-            print(f'Response: {error.response.text}')
+        response = getattr(error, 'response', None)
+        if response is not None:
+            print(f'Response: {response.text}')
         raise
 
 
@@ -7,7 +7,7 @@ Type: Job aggregator API
 Auth: API key required
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -31,6 +31,7 @@ try:
     from backend.app.api.top_jobs import TOP_JOBS
     from backend.app.api.job_schema import export_canonical_to_csv
     from backend.app.api.adzuna.test_adzuna_api import normalize_adzuna_job
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -39,6 +40,7 @@ except ImportError:
     from top_jobs import TOP_JOBS
     from job_schema import export_canonical_to_csv
     from test_adzuna_api import normalize_adzuna_job
+    from http_client import get_json
 
 
 def search_adzuna_jobs(keywords: str, page: int = 1,
@@ -68,13 +70,12 @@ def search_adzuna_jobs(keywords: str, page: int = 1,
             'results_per_page': results_per_page,
             'what': keywords
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as error:
+        return get_json("Adzuna", url, params=params)
+    except httpx.HTTPError as error:
         print(f'Error calling Adzuna API for "{keywords}": {error}')
-        if error.response is not None:
-            print(f'Response: {error.response.text}')
+        response = getattr(error, 'response', None)
+        if response is not None:
+            print(f'Response: {response.text}')
         return {'results': []}
 
 
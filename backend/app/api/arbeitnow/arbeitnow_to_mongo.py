@@ -14,13 +14,13 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.arbeitnow.test_arbeitnow_api import test_arbeitnow_api, normalize_arbeitnow_job
@@ -28,33 +28,70 @@ except ImportError:
     from test_arbeitnow_api import test_arbeitnow_api, normalize_arbeitnow_job
 
 
+SOURCE = "Arbeitnow"
+
+
+def checkpoint_query(keywords: Optional[str] = "Software Engineer") -> str:
+    """Checkpoint query key for a fetch configuration."""
+    return keywords or "all"
+
+
+def fetch_jobs(
+    page: Optional[int] = None,
+    remote_only: bool = True,
+    keywords: Optional[str] = "Software Engineer",
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch raw Arbeitnow jobs; with a checkpoint, only postings newer than the last run."""
+    data = test_arbeitnow_api(
+        page=page,
+        remote_only=remote_only,
+        keywords=keywords,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+    jobs = data.get("data", [])
+    if checkpoint is not None:
+        fresh = checkpoint.filter_new(jobs)
+        # A page of unseen postings with more pages behind it: keep the date mark
+        last_page = not (data.get("links") or {}).get("next")
+        checkpoint.advance(fresh, complete=len(fresh) < len(jobs) or last_page)
+        jobs = fresh
+    return jobs
+
+
 def run(
     page: Optional[int] = None,
     remote_only: bool = True,
     keywords: Optional[str] = "Software Engineer",
     salary_min: Optional[int] = None,
     salary_max: Optional[int] = None,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from Arbeitnow and insert into MongoDB. Returns count inserted."""
     print("Arbeitnow → MongoDB")
     print("=" * 50)
 
-    def fetch_jobs():
-        data = test_arbeitnow_api(
-            page=page,
-            remote_only=remote_only,
-            keywords=keywords,
-            salary_min=salary_min,
-            salary_max=salary_max,
-        )
-        return data.get("data", [])
-
-    jobs = fetch_jobs()
+    # Only postings newer than the last successful run for this query
+    query = checkpoint_query(keywords)
+    checkpoint = load_checkpoints(SOURCE, [query])[query] if incremental else None
+
+    jobs = fetch_jobs(
+        page=page,
+        remote_only=remote_only,
+        keywords=keywords,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        checkpoint=checkpoint,
+    )
     print(f"Retrieved {len(jobs)} job postings from Arbeitnow.")
     count = run_ingestion(
-        source="Arbeitnow",
+        source=SOURCE,
         normalizer=normalize_arbeitnow_job,
         fetch_jobs=lambda: jobs,
+        checkpoints=[checkpoint] if checkpoint is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
@@ -9,7 +9,7 @@ Auth: None
 Coverage: European companies and remote roles
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -19,12 +19,14 @@ from typing import Dict, Any, List, Optional
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import get_json
 
 
 def test_arbeitnow_api(page: Optional[int] = None, 
@@ -51,9 +53,7 @@ def test_arbeitnow_api(page: Optional[int] = None,
         if page:
             params['page'] = page
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json("Arbeitnow", url, params=params)
         
         # Filter for remote jobs, keywords, and optional salary range
         if 'data' in data:
@@ -83,7 +83,7 @@ def test_arbeitnow_api(page: Optional[int] = None,
             data['data'] = filtered_jobs
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Arbeitnow API: {error}')
         raise
 
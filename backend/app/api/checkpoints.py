@@ -0,0 +1,209 @@
+"""
+Per-source, per-query ingestion checkpoints (high-water marks).
+
+A checkpoint records the newest posted_date seen for one (source, query) plus a
+bounded window of the most recent raw ids. Fetchers use it to drop postings that
+were already ingested and to stop paginating once a page reaches them; the
+*_to_mongo scripts commit the advanced checkpoints only after the insert succeeds,
+so a failed run is simply re-fetched next time.
+
+A fetch cut short by its page cap has not reached the previous run's postings, so
+unseen postings older than the ones it fetched are still waiting. The date mark then
+stays where it was (moving it would hide them for good): the fetched ids are
+remembered, the newest date seen is parked in pending_posted_date, and paginated
+fetchers resume from resume_page next run until they catch up.
+
+Stored in the ingestion database (collection MONGO_CHECKPOINTS_COLLECTION,
+default "ingestion_checkpoints"), one document per (source, query):
+  _id: "{source}|{query}", source, query, posted_date, last_ids, pending_posted_date,
+  resume_page, updated_at
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo.collection import Collection
+
+try:
+    from backend.app.api.job_schema import _parse_date
+except ImportError:
+    from job_schema import _parse_date
+
+# Raw ids kept per checkpoint; covers postings that share the newest timestamp
+# or have no usable date at all (e.g. SerpAPI's relative "3 days ago").
+CHECKPOINT_ID_WINDOW = 500
+
+# source -> (raw id, raw posted date) extractor, matching each source's normalizer
+SOURCE_MARKERS: Dict[str, Callable[[Dict[str, Any]], Tuple[Any, Any]]] = {
+    "Adzuna": lambda job: (job.get("id"), job.get("created")),
+    "Jobicy": lambda job: (job.get("id"), job.get("pubDate")),
+    "SerpAPI": lambda job: (job.get("job_id"), None),
+    "Arbeitnow": lambda job: (job.get("id") or job.get("slug"), job.get("published_at")),
+    "The Muse": lambda job: (job.get("id"), job.get("publication_date")),
+    "Remotive": lambda job: (job.get("id"), job.get("publication_date")),
+    "RemoteOK": lambda job: (job.get("id"), job.get("date")),
+    "USAJobs": lambda job: (
+        job.get("MatchedObjectId"),
+        (job.get("MatchedObjectDescriptor") or {}).get("PublicationStartDate"),
+    ),
+}
+
+
+def job_marker(source: str, job: Dict[str, Any]) -> Tuple[Optional[str], Optional[datetime]]:
+    """(raw id as str, posted date as UTC datetime) for one raw job; either may be None."""
+    extract = SOURCE_MARKERS.get(source)
+    if extract is None:
+        return None, None
+    raw_id, raw_date = extract(job)
+    raw_id = str(raw_id) if raw_id not in (None, "", "N/A") else None
+    return raw_id, _parse_date(raw_date, source=source, field="marker")
+
+
+class Checkpoint:
+    """
+    High-water mark for one (source, query).
+
+    is_known() / filter_new() answer "was this posting already ingested?";
+    advance() records postings fetched in this run. The stored mark only moves
+    when the store saves the checkpoint. resume_page is set while an earlier,
+    page-capped fetch still has older postings to catch up on.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        query: str,
+        posted_date: Optional[datetime] = None,
+        last_ids: Optional[List[str]] = None,
+        pending_posted_date: Optional[datetime] = None,
+        resume_page: Optional[int] = None,
+    ):
+        self.source = source
+        self.query = query
+        self.posted_date = posted_date
+        self.last_ids = list(last_ids or [])
+        self.pending_posted_date = pending_posted_date
+        self.resume_page = resume_page
+        self._known_ids = set(self.last_ids)
+        self._new_ids: List[str] = []
+        self._newest = max(filter(None, (posted_date, pending_posted_date)), default=None)
+        self._resume_page = resume_page
+        self._complete = pending_posted_date is None and resume_page is None
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}|{self.query}"
+
+    @property
+    def changed(self) -> bool:
+        return (
+            bool(self._new_ids)
+            or self._newest != self.posted_date
+            or self._resume_page != self.resume_page
+            or self._complete != (self.pending_posted_date is None and self.resume_page is None)
+        )
+
+    def is_known(self, job: Dict[str, Any]) -> bool:
+        raw_id, posted_date = job_marker(self.source, job)
+        if raw_id is not None and raw_id in self._known_ids:
+            return True
+        # Strictly older than the mark; equal timestamps fall back to the id window
+        return (
+            posted_date is not None
+            and self.posted_date is not None
+            and posted_date < self.posted_date
+        )
+
+    def filter_new(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Postings not ingested by an earlier run (does not move the mark)."""
+        return [job for job in jobs if not self.is_known(job)]
+
+    def older_than_mark(self, jobs: Iterable[Dict[str, Any]]) -> bool:
+        """True when any job predates the mark, i.e. paging reached an earlier run's postings."""
+        if self.posted_date is None:
+            return False
+        for job in jobs:
+            _, posted_date = job_marker(self.source, job)
+            if posted_date is not None and posted_date < self.posted_date:
+                return True
+        return False
+
+    def advance(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        complete: bool = True,
+        resume_page: Optional[int] = None,
+    ) -> None:
+        """
+        Move the mark past jobs. Call once a query has been fetched, so a query that
+        fails halfway keeps its old mark and is fully re-fetched next run.
+
+        complete: False when the fetch stopped at its page cap (or a full single page)
+                  without reaching postings from an earlier run. The ids are recorded
+                  but the date mark stays put until a later fetch catches up.
+        resume_page: For an incomplete paginated fetch, the page to continue from.
+        """
+        self._complete = complete
+        self._resume_page = None if complete else resume_page
+        for job in jobs:
+            raw_id, posted_date = job_marker(self.source, job)
+            if raw_id is not None and raw_id not in self._known_ids:
+                self._known_ids.add(raw_id)
+                self._new_ids.append(raw_id)
+            if posted_date is not None and (self._newest is None or posted_date > self._newest):
+                self._newest = posted_date
+
+    def to_document(self) -> Dict[str, Any]:
+        return {
+            "_id": self.key,
+            "source": self.source,
+            "query": self.query,
+            "posted_date": self._newest if self._complete else self.posted_date,
+            "last_ids": (self._new_ids + self.last_ids)[:CHECKPOINT_ID_WINDOW],
+            "pending_posted_date": None if self._complete else self._newest,
+            "resume_page": self._resume_page,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Mongo hands datetimes back naive (UTC)
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class CheckpointStore:
+    """Loads and saves Checkpoints in a Mongo collection (sync, like the ingestion utils)."""
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+
+    def load(self, source: str, queries: Iterable[str]) -> Dict[str, Checkpoint]:
+        """Checkpoints for every query of a source (empty ones for queries never seen)."""
+        queries = list(queries)
+        keys = [f"{source}|{query}" for query in queries]
+        stored = {doc["_id"]: doc for doc in self.collection.find({"_id": {"$in": keys}})}
+        checkpoints = {}
+        for query, key in zip(queries, keys):
+            doc = stored.get(key) or {}
+            checkpoints[query] = Checkpoint(
+                source,
+                query,
+                _as_utc(doc.get("posted_date")),
+                doc.get("last_ids"),
+                pending_posted_date=_as_utc(doc.get("pending_posted_date")),
+                resume_page=doc.get("resume_page"),
+            )
+        return checkpoints
+
+    def save(self, checkpoints: Iterable[Checkpoint]) -> int:
+        """Persist checkpoints that advanced in this run; returns how many were written."""
+        written = 0
+        for checkpoint in checkpoints:
+            if not checkpoint.changed:
+                continue
+            doc = checkpoint.to_document()
+            self.collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+            written += 1
+        return written
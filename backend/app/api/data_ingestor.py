@@ -2,52 +2,184 @@
 Shared ingestion orchestration for API → MongoDB scripts.
 
 Provides run_ingestion(source, normalizer, fetch_jobs) so each *_to_mongo.py script
-can avoid duplicating .env loading and the "fetch → get collection → insert" flow.
+can avoid duplicating .env loading and the "fetch → get collection → insert" flow,
+load_checkpoints() for incremental fetching (see checkpoints.py), and
+plan_queries() / record_query_results() for skipping redundant queries (see query_planner.py).
+Each run_ingestion() call is recorded in ingestion_runs with its per-source metrics (see run_metrics.py).
 Mongo-only logic (get_mongo_collection, insert_jobs_into_mongo) stays in mongo_ingestion_utils.
 
 Only *_to_mongo.py scripts use this module; test_*.py do not.
 """
 
-from typing import Iterable, Dict, Any, Callable
+import time
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable, Iterator, Dict, Any, Callable, List, Optional
 
 import os
 
 try:
-    from backend.app.api.mongo_ingestion_utils import get_mongo_collection, insert_jobs_into_mongo
+    from backend.app.api.mongo_ingestion_utils import (
+        get_checkpoint_store,
+        get_mongo_collection,
+        get_near_duplicate_index,
+        get_query_stats_store,
+        insert_jobs_into_mongo,
+        new_write_report,
+    )
+    from backend.app.api.checkpoints import Checkpoint
+    from backend.app.api.http_client import request_log
+    from backend.app.api.run_metrics import finish_source_report, new_source_report, record_run
+    from backend.app.api.query_planner import QueryPlan, QueryPlanner, planner_enabled
 except ImportError:
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
     import sys
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from mongo_ingestion_utils import get_mongo_collection, insert_jobs_into_mongo
+    from mongo_ingestion_utils import (
+        get_checkpoint_store,
+        get_mongo_collection,
+        get_near_duplicate_index,
+        get_query_stats_store,
+        insert_jobs_into_mongo,
+        new_write_report,
+    )
+    from checkpoints import Checkpoint
+    from http_client import request_log
+    from run_metrics import finish_source_report, new_source_report, record_run
+    from query_planner import QueryPlan, QueryPlanner, planner_enabled
+
+
+def _fetch_stream(jobs: Iterable[Dict[str, Any]], source: str,
+                  metrics: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Re-raise errors from a streaming fetch as fetch failures, like an eager fetch.
+    Counts jobs into metrics["fetched"] and the time spent waiting on the fetch into
+    metrics["fetch_seconds"].
+    """
+    jobs = iter(jobs)
+    while True:
+        waited_from = time.perf_counter()
+        try:
+            job = next(jobs)
+        except StopIteration:
+            return
+        except Exception as e:
+            raise RuntimeError(f"{source} ingestion failed during fetch") from e
+        finally:
+            metrics["fetch_seconds"] += time.perf_counter() - waited_from
+        metrics["fetched"] += 1
+        yield job
 
 
 def run_ingestion(
     source: str,
     normalizer: Callable[[Dict[str, Any]], Dict[str, Any]],
     fetch_jobs: Callable[[], Iterable[Dict[str, Any]]],
+    checkpoints: Optional[Iterable[Checkpoint]] = None,
+    mode: Optional[str] = None,
+    report: Optional[Dict[str, Any]] = None,
 ) -> int:
     """
     Load jobs via fetch_jobs(), then insert into MongoDB using mongo_ingestion_utils.
 
     .env is loaded by get_mongo_collection() when needed. Data key names (e.g. "results",
     "data", "jobs", "jobs_results") are handled inside the fetch_jobs callable; this
-    function only receives a list of raw job dicts.
+    function only receives raw job dicts.
+
+    fetch_jobs may return a list or a generator (e.g. the fetchers' iter_all_top_jobs).
+    Jobs are normalized lazily and written in MONGO_INSERT_BATCH_SIZE batches as they arrive,
+    so memory stays bounded and writes start before the fetch has finished.
 
     Args:
         source: Source label (e.g. "Adzuna", "Jobicy", "Arbeitnow").
         normalizer: Function that takes one raw job dict and returns a normalized dict
                     for job_schema.to_canonical_document.
-        fetch_jobs: No-arg callable that returns the list of raw job dicts.
+        fetch_jobs: No-arg callable that returns (or streams) raw job dicts.
+        checkpoints: Checkpoints advanced by the fetch (see checkpoints.py); saved only
+                     after the insert succeeds.
+        mode: "upsert" or "insert" (see insert_jobs_into_mongo); defaults to
+              INGESTION_WRITE_MODE (read when the write starts, after .env is
+              loaded), else "insert".
+        report: Optional dict filled with inserted / updated / unchanged counts and
+                changed_ids (see mongo_ingestion_utils.new_write_report).
 
     Returns:
-        Number of documents inserted, or 0 if no jobs.
+        Number of documents written (inserted + updated), or 0 if no jobs.
     """
+    if report is None:
+        report = new_write_report()
+    else:
+        for key, value in new_write_report().items():
+            report.setdefault(key, value)
+    metrics = new_source_report()
+    http_mark = request_log.mark(source)
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
     try:
-        jobs = fetch_jobs()
+        try:
+            jobs = iter(fetch_jobs())
+        except Exception as e:
+            raise RuntimeError(f"{source} ingestion failed during fetch") from e
+        jobs = _fetch_stream(jobs, source, metrics)
+        count = 0
+        first = next(jobs, None)
+        if first is not None:
+            collection = get_mongo_collection()
+            count = insert_jobs_into_mongo(
+                chain([first], jobs),
+                collection,
+                source=source,
+                normalizer=normalizer,
+                mode=mode,
+                report=report,
+                clusters=get_near_duplicate_index(collection),
+            )
+            print(f"{source}: {report['inserted']} inserted, {report['updated']} updated, "
+                  f"{report['unchanged']} unchanged, {report['near_duplicates']} near-duplicate(s).")
+        if checkpoints is not None:
+            saved = get_checkpoint_store().save(checkpoints)
+            if saved:
+                print(f"Advanced {saved} {source} checkpoint(s).")
     except Exception as e:
-        raise RuntimeError(f"{source} ingestion failed during fetch") from e
-    if not jobs:
-        return 0
-    collection = get_mongo_collection()
-    return insert_jobs_into_mongo(jobs, collection, source=source, normalizer=normalizer)
+        metrics["error"] = str(e)
+        raise
+    finally:
+        # Fetching and writing interleave; whatever was not spent waiting on the fetch was writing
+        elapsed = time.perf_counter() - started
+        metrics.update({key: report[key] for key in
+                        ("inserted", "updated", "unchanged", "duplicate_keys", "near_duplicates")})
+        metrics["fetch_seconds"] = round(metrics["fetch_seconds"], 3)
+        metrics["write_seconds"] = round(max(0.0, elapsed - metrics["fetch_seconds"]), 3)
+        finish_source_report(metrics, source, http_mark)
+        http = metrics["http"]
+        print(f"{source}: {metrics['fetched']} fetched from {http['pages']} page(s) "
+              f"(p90 {http['p90_ms']} ms, {http['failed_requests']} failed), "
+              f"{metrics['docs_per_second']} docs/s.")
+        record_run({source: metrics}, started_at, wall_seconds=round(elapsed, 3))
+    return count
+
+
+def load_checkpoints(source: str, queries: List[str]) -> Dict[str, Checkpoint]:
+    """Load the stored checkpoint for each query of a source (for incremental fetching)."""
+    return get_checkpoint_store().load(source, queries)
+
+
+def plan_queries(source: str, queries: List[str]) -> QueryPlan:
+    """
+    Queries worth running for a source this time (see query_planner.py); every query
+    when the source is not in QUERY_PLANNER_SOURCES.
+    """
+    queries = list(queries)
+    if not planner_enabled(source):
+        return QueryPlan(source, queries, queries, {}, {})
+    plan = QueryPlanner.from_env().plan(source, queries, get_query_stats_store().load(source, queries))
+    if plan.merged:
+        print(f"⏭️ {plan.summary()}")
+    return plan
+
+
+def record_query_results(plan: QueryPlan, results: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Record what each planned query returned, so the next plan can learn the overlap."""
+    if planner_enabled(plan.source):
+        get_query_stats_store().record(plan, results)
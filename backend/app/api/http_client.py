@@ -0,0 +1,750 @@
+"""
+Shared async HTTP layer for the job-source adapters.
+
+Every provider request goes through an HttpSession: one httpx.AsyncClient per
+ingestion run (connection pooling + keep-alive, so the ~60 TOP_JOBS queries reuse
+a handful of TLS connections) and one semaphore per source that bounds how many
+requests to that provider are in flight at once.
+
+Async fan-out code opens a session with open_session() and awaits
+session.get_json(); sync callers (the *_to_mongo.run() scripts and the test_*
+helpers) use run_sync() or the one-shot get_json(), and stream_sync() to
+consume an async generator of results while it is still fetching.
+
+Each source also has a SourcePolicy: a token bucket caps its request rate,
+429 / 5xx / transport errors are retried with jittered exponential backoff
+(a Retry-After header wins over the computed delay), and a circuit breaker
+fails fast with CircuitOpenError once a source has failed repeatedly. Bucket
+and breaker state is process-wide, so it carries across sessions and runs.
+
+INGESTION_HTTP_MODE selects where responses come from:
+  live    (default) call the providers
+  record  call the providers and save every JSON body under INGESTION_FIXTURE_DIR
+  replay  serve saved bodies only (no network, no rate limiting), so the
+          *_to_mongo scripts run offline at full speed for profiling
+Fixtures are keyed by source, URL and query parameters with credentials removed.
+
+get_json(..., cache_ttl=seconds) keeps the decoded body in a process-wide
+ResponseCache: within cache_ttl it is served without a request, after that the
+request is revalidated with If-None-Match / If-Modified-Since and a 304 reuses
+the cached body. Used for large feeds fetched whole (the RemoteOK dump).
+
+Every request is also counted in the process-wide RequestLog (request_log): per
+source, requests sent, pages received, retries, failed calls and recent latencies.
+Take request_log.mark(source) before a run and request_log.summary(source, mark)
+after it for that run's numbers (see run_metrics.py).
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple,
+    TypeVar,
+)
+
+import httpx
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class SourcePolicy:
+    """
+    Request limits for one source.
+
+    Args:
+        rate: Sustained requests per second (token refill rate).
+        burst: Bucket size; requests allowed back-to-back before rate applies.
+        concurrency: Max in-flight requests per session.
+        max_retries: Retries after the first attempt for 429 / 5xx / transport errors.
+        backoff_base: First backoff delay in seconds (doubles per retry, full jitter).
+        backoff_max: Upper bound for any single delay, including Retry-After.
+        failure_threshold: Consecutive failed requests that open the circuit.
+        reset_timeout: Seconds the circuit stays open before a trial request.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+
+# Published / observed provider limits; rate is requests per second
+SOURCE_POLICIES: Dict[str, SourcePolicy] = {
+    "Adzuna": SourcePolicy(rate=0.4, burst=4, concurrency=4),       # 25/min
+    "Jobicy": SourcePolicy(rate=1.0, burst=4, concurrency=4),
+    "SerpAPI": SourcePolicy(rate=1.0, burst=4, concurrency=4),
+    "The Muse": SourcePolicy(rate=1.0, burst=2, concurrency=2),     # 3600/hour with key
+    "USAJobs": SourcePolicy(rate=2.0, burst=2, concurrency=2),
+    "Arbeitnow": SourcePolicy(rate=1.0, burst=2, concurrency=2),
+    "Remotive": SourcePolicy(rate=2 / 60, burst=1, concurrency=1),  # asks for <= 2/min
+    "RemoteOK": SourcePolicy(rate=1 / 60, burst=1, concurrency=1),  # single feed
+}
+DEFAULT_POLICY = SourcePolicy(rate=1.0, burst=4, concurrency=4)
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without touching the network while a source's circuit is open."""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} circuit open; retry in {retry_in:.0f}s")
+        self.source = source
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    reserve() takes a token immediately (the balance may go negative) and returns
+    how long the caller must wait, so concurrent callers queue up fairly without
+    polling. Guarded by a threading lock because run_sync() can drive sessions on
+    different event loops.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures; after
+    reset_timeout one trial call is let through (half-open) and its outcome
+    closes or re-opens the circuit. check() is called once per get_json call
+    (not per retry), and the caller records exactly one outcome for it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def check(self, source: str) -> bool:
+        """
+        Raise CircuitOpenError unless a call may be made now.
+        Returns True when the call is the half-open trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(source, max(remaining, 0.0))
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class _SourceState:
+    def __init__(self, policy: SourcePolicy):
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+
+
+_source_states: Dict[str, _SourceState] = {}
+_source_states_lock = threading.Lock()
+
+
+def source_state(source: str, policy: SourcePolicy) -> _SourceState:
+    """Process-wide rate-limit / circuit state for a source (created on first use)."""
+    with _source_states_lock:
+        state = _source_states.get(source)
+        if state is None:
+            state = _source_states[source] = _SourceState(policy)
+        return state
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date); None if absent/invalid."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(policy: SourcePolicy, attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry number (0-based)."""
+    return random.uniform(0, min(policy.backoff_max, policy.backoff_base * (2 ** attempt)))
+
+
+HTTP_MODES = ("live", "record", "replay")
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Query parameters that carry credentials; never part of a fixture key or file
+SECRET_PARAMS = {"app_id", "app_key", "api_key", "apikey", "key", "token"}
+
+
+class FixtureNotFoundError(httpx.HTTPError):
+    """Replay mode found no recorded response for a request."""
+
+    def __init__(self, source: str, url: str, path: str):
+        super().__init__(f"No recorded {source} response for {url} (expected {path})")
+        self.path = path
+
+
+class FixtureStore:
+    """Recorded provider responses on disk: {fixture_dir}/{source}/{key}.json."""
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+
+    @staticmethod
+    def public_params(params: Any) -> list:
+        """Params as sorted (name, value) pairs, minus credentials."""
+        if not params:
+            return []
+        items = params.items() if isinstance(params, dict) else params
+        return sorted(
+            (str(name), str(value))
+            for name, value in items
+            if value is not None and str(name).lower() not in SECRET_PARAMS
+        )
+
+    def key(self, source: str, url: str, params: Any) -> str:
+        material = json.dumps([source, url, self.public_params(params)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:24]
+
+    def path(self, source: str, url: str, params: Any) -> str:
+        folder = "".join(c if c.isalnum() else "_" for c in source.lower())
+        return os.path.join(self.fixture_dir, folder, f"{self.key(source, url, params)}.json")
+
+    def load(self, source: str, url: str, params: Any) -> Any:
+        path = self.path(source, url, params)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["body"]
+        except FileNotFoundError:
+            raise FixtureNotFoundError(source, url, path) from None
+
+    def save(self, source: str, url: str, params: Any, body: Any) -> str:
+        path = self.path(source, url, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "source": source,
+            "url": url,
+            "params": self.public_params(params),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "body": body,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+
+class CachedResponse:
+    """A decoded response body plus the validators needed to revalidate it."""
+
+    def __init__(self, body: Any, etag: Optional[str], last_modified: Optional[str]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Process-wide cache of decoded bodies keyed like fixtures (source, URL, public params).
+    Bodies are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+# Latencies kept per source for percentiles; older samples drop out first
+REQUEST_LOG_SAMPLES = 10000
+
+
+class _SourceRequests:
+    def __init__(self, max_samples: int):
+        self.requests = 0
+        self.pages = 0
+        self.retries = 0
+        self.failed = 0
+        self.latencies: Deque[float] = deque(maxlen=max_samples)
+        self.observed = 0
+
+
+class RequestLog:
+    """
+    Process-wide request counters and recent latencies per source.
+
+    Counters only grow: mark() snapshots them and summary(source, since=mark) reports the
+    difference, so each run gets its own numbers (runs of one source that overlap in the
+    same process are merged). requests counts network attempts (retries included);
+    pages counts bodies handed back, including 304 revalidations, cache hits and replays;
+    failed counts get_json calls that raised.
+    """
+
+    def __init__(self, max_samples: int = REQUEST_LOG_SAMPLES):
+        self.max_samples = max_samples
+        self._sources: Dict[str, _SourceRequests] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, source: str) -> _SourceRequests:
+        state = self._sources.get(source)
+        if state is None:
+            state = self._sources[source] = _SourceRequests(self.max_samples)
+        return state
+
+    def request(self, source: str, seconds: float) -> None:
+        with self._lock:
+            state = self._state(source)
+            state.requests += 1
+            state.latencies.append(seconds)
+            state.observed += 1
+
+    def page(self, source: str) -> None:
+        with self._lock:
+            self._state(source).pages += 1
+
+    def retry(self, source: str) -> None:
+        with self._lock:
+            self._state(source).retries += 1
+
+    def failure(self, source: str) -> None:
+        with self._lock:
+            self._state(source).failed += 1
+
+    def mark(self, source: str) -> Dict[str, int]:
+        with self._lock:
+            state = self._state(source)
+            return {"requests": state.requests, "pages": state.pages, "retries": state.retries,
+                    "failed": state.failed, "observed": state.observed}
+
+    def summary(self, source: str, since: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Counts and latency percentiles (milliseconds) since a mark (default: process start).
+
+        Returns:
+            {requests, pages, retries, failed_requests, p50_ms, p90_ms, p99_ms, max_ms};
+            the latency fields are None when no request was sent.
+        """
+        since = since or {}
+        with self._lock:
+            state = self._state(source)
+            new_samples = min(state.observed - since.get("observed", 0), len(state.latencies))
+            latencies: List[float] = sorted(list(state.latencies)[len(state.latencies) - new_samples:])
+            summary: Dict[str, Any] = {
+                "requests": state.requests - since.get("requests", 0),
+                "pages": state.pages - since.get("pages", 0),
+                "retries": state.retries - since.get("retries", 0),
+                "failed_requests": state.failed - since.get("failed", 0),
+            }
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            # Nearest rank
+            return round(latencies[max(0, math.ceil(q * len(latencies)) - 1)] * 1000, 1)
+
+        summary.update(p50_ms=percentile(0.5), p90_ms=percentile(0.9), p99_ms=percentile(0.99),
+                       max_ms=round(latencies[-1] * 1000, 1) if latencies else None)
+        return summary
+
+
+request_log = RequestLog()
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+
+class HttpSession:
+    """
+    Pooled async HTTP client with per-source rate limiting, retries and
+    bounded concurrency.
+
+    Use as an async context manager (or via open_session()); semaphores are
+    created lazily per source so they bind to the session's event loop.
+    mode / fixture_dir default to INGESTION_HTTP_MODE / INGESTION_FIXTURE_DIR.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, SourcePolicy]] = None,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        mode: Optional[str] = None,
+        fixture_dir: Optional[str] = None,
+    ):
+        self.mode = (mode or os.getenv("INGESTION_HTTP_MODE") or "live").lower()
+        if self.mode not in HTTP_MODES:
+            raise ValueError(f"INGESTION_HTTP_MODE must be one of {HTTP_MODES}, got {self.mode!r}")
+        self.fixtures = FixtureStore(
+            fixture_dir or os.getenv("INGESTION_FIXTURE_DIR") or DEFAULT_FIXTURE_DIR
+        )
+        self.policies = {**SOURCE_POLICIES, **(policies or {})}
+        self._timeout = timeout
+        self._limits = limits
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "HttpSession":
+        self._client = httpx.AsyncClient(
+            timeout=self._timeout,
+            limits=self._limits,
+            follow_redirects=True,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def policy(self, source: str) -> SourcePolicy:
+        return self.policies.get(source, DEFAULT_POLICY)
+
+    def _semaphore(self, source: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(source)
+        if semaphore is None:
+            limit = self.policy(source).concurrency
+            semaphore = self._semaphores[source] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def get_json(
+        self,
+        source: str,
+        url: str,
+        params: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        GET url and decode the JSON body.
+
+        Args:
+            source: Source label (e.g. "Adzuna"); selects the SourcePolicy.
+            url: Endpoint URL.
+            params: Query parameters (dict or list of tuples for repeated keys).
+            headers: Optional request headers.
+            cache_ttl: Seconds a cached body is served without a request; after that it
+                       is revalidated with a conditional GET. None (default) never caches.
+
+        Returns:
+            Decoded JSON body.
+
+        Raises:
+            FixtureNotFoundError: Replay mode and the request was never recorded.
+            CircuitOpenError: The source has failed repeatedly and is cooling down.
+            httpx.HTTPStatusError: Non-2xx response (after retries for 429 / 5xx).
+            httpx.RequestError: Connection / timeout failures (after retries).
+        """
+        if self._client is None:
+            raise RuntimeError("HttpSession is not open; use 'async with HttpSession()'.")
+        try:
+            body = await self._get_json(source, url, params, headers, cache_ttl)
+        except Exception:
+            request_log.failure(source)
+            raise
+        request_log.page(source)
+        return body
+
+    async def _get_json(
+        self,
+        source: str,
+        url: str,
+        params: Any,
+        headers: Optional[Dict[str, str]],
+        cache_ttl: Optional[float],
+    ) -> Any:
+        if self.mode == "replay":
+            return self.fixtures.load(source, url, params)
+        cache_key, cached = None, None
+        if cache_ttl is not None:
+            cache_key = self.fixtures.key(source, url, params)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                if cached.age < cache_ttl:
+                    return cached.body
+                headers = {**(headers or {}), **cached.conditional_headers()}
+        policy = self.policy(source)
+        state = source_state(source, policy)
+
+        # Once per call: retries belong to the same call, and a half-open trial
+        # must get exactly one outcome whichever way the call ends
+        trial = state.breaker.check(source)
+        recorded = False
+        try:
+            attempt = 0
+            while True:
+                await state.bucket.acquire()
+                try:
+                    async with self._semaphore(source):
+                        sent = time.perf_counter()
+                        try:
+                            response = await self._client.get(url, params=params, headers=headers)
+                        finally:
+                            request_log.request(source, time.perf_counter() - sent)
+                except httpx.TransportError as error:
+                    if attempt >= policy.max_retries:
+                        recorded = True
+                        state.breaker.record_failure()
+                        raise
+                    delay = backoff_delay(policy, attempt)
+                    print(f"⚠️ {source} request failed ({error!r}); retry {attempt + 1} in {delay:.1f}s")
+                else:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        # The source answered; a client error (4xx) is not an outage
+                        recorded = True
+                        state.breaker.record_success()
+                        if cached is not None and response.status_code == 304:
+                            cached.fetched_at = time.monotonic()
+                            return cached.body
+                        response.raise_for_status()
+                        data = response.json()
+                        if self.mode == "record":
+                            self.fixtures.save(source, url, params, data)
+                        if cache_key is not None:
+                            response_cache.put(cache_key, CachedResponse(
+                                data, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                            ))
+                        return data
+                    if attempt >= policy.max_retries:
+                        recorded = True
+                        state.breaker.record_failure()
+                        response.raise_for_status()
+                    delay = retry_after_seconds(response)
+                    if delay is None:
+                        delay = backoff_delay(policy, attempt)
+                    delay = min(delay, policy.backoff_max)
+                    print(f"⚠️ {source} returned {response.status_code}; retry {attempt + 1} in {delay:.1f}s")
+                attempt += 1
+                request_log.retry(source)
+                await asyncio.sleep(delay)
+        finally:
+            # Cancelled or failed without an answer: the trial did not show a recovery
+            if trial and not recorded:
+                state.breaker.record_failure()
+
+
+@asynccontextmanager
+async def open_session(session: Optional[HttpSession] = None):
+    """Yield the given session, or open (and close) a new one for this block."""
+    if session is not None:
+        yield session
+        return
+    async with HttpSession() as new_session:
+        yield new_session
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from sync code.
+
+    Works both from plain scripts and from threads that already run an event loop
+    (e.g. a FastAPI handler): in the latter case the coroutine runs on a fresh
+    loop in a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+async def iter_completed(
+    keys: Iterable[K],
+    fetch: Callable[[K], Awaitable[T]],
+) -> AsyncIterator[Tuple[K, Any]]:
+    """
+    Run fetch(key) for every key concurrently and yield (key, result) as each one
+    finishes; a failed fetch yields its exception instead of raising.
+    """
+    async def _settle(key):
+        try:
+            return key, await fetch(key)
+        except Exception as error:
+            return key, error
+
+    for next_done in asyncio.as_completed([_settle(key) for key in keys]):
+        yield await next_done
+
+
+class _StreamError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_STREAM_DONE = object()
+DEFAULT_STREAM_BUFFER = 1000
+
+
+def stream_sync(agen: AsyncIterator[T], maxsize: int = DEFAULT_STREAM_BUFFER) -> Iterator[T]:
+    """
+    Iterate an async generator from sync code while it keeps running.
+
+    The generator runs on its own event loop in a background thread and hands
+    items over through a bounded queue: the consumer (e.g. batched Mongo inserts)
+    starts on the first item, and when it falls behind by maxsize items the
+    producer pauses (backpressure). Errors are re-raised in the consumer; closing
+    the iterator early stops the producer.
+    """
+    items: "queue.Queue[Any]" = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    async def _put(item) -> bool:
+        # Poll instead of a blocking put so in-flight requests keep progressing
+        while not stop.is_set():
+            try:
+                items.put_nowait(item)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.01)
+        return False
+
+    async def _pump():
+        try:
+            async for item in agen:
+                if not await _put(item):
+                    break
+        except Exception as error:
+            await _put(_StreamError(error))
+            return
+        finally:
+            await agen.aclose()
+        await _put(_STREAM_DONE)
+
+    producer = threading.Thread(target=lambda: asyncio.run(_pump()), daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def run_with_session(fn: Callable[[HttpSession], Awaitable[T]]) -> T:
+    """Open a session, await fn(session), close the session; from sync code."""
+    async def _runner():
+        async with HttpSession() as session:
+            return await fn(session)
+
+    return run_sync(_runner())
+
+
+def get_json(
+    source: str,
+    url: str,
+    params: Any = None,
+    headers: Optional[Dict[str, str]] = None,
+    cache_ttl: Optional[float] = None,
+) -> Any:
+    """One-shot sync GET through the shared layer (same errors as HttpSession.get_json)."""
+    return run_with_session(
+        lambda session: session.get_json(source, url, params=params, headers=headers,
+                                         cache_ttl=cache_ttl)
+    )
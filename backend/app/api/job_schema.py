@@ -9,49 +9,112 @@ Schema:
   description: str
   location: str
   remote_type: str ("remote" | "hybrid" | "onsite" | "not provided")
-  skills_required: list[str]
+  skills_required: list[str] (source tags plus skills found in title / description, see skills.py)
   posted_date: datetime (UTC) or None
   source_url: str
   source_platform: str (same as source — e.g. "Adzuna", "SerpAPI")
   salary_range: { min: number | None, max: number | None, currency: str }
   source: str (source identifier; source_platform = source)
-  ingested_at: datetime (set by ingestion)
+  ingested_at: datetime (set by ingestion; first time the posting was written)
+  content_hash: str (set by upsert ingestion; see content_hash())
+  updated_at: datetime (set by upsert ingestion; last time the content changed)
 """
 
 import csv
+import gzip
+import hashlib
+import json
 import os
 import re
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    from backend.app.api.skills import merge_skills, skill_extraction_enabled
+except ImportError:
+    from skills import merge_skills, skill_extraction_enabled
 
-def _parse_date(value: Any) -> Optional[datetime]:
-    """Parse various date formats to UTC datetime. Returns None if unparseable."""
+
+# strptime fallbacks for strings datetime.fromisoformat() rejects (tried in this order)
+DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+)
+# Numbers in this range are Unix timestamps (2001-09 .. 5138); larger ones are milliseconds
+EPOCH_MIN = 1_000_000_000
+EPOCH_MS_MIN = 1_000_000_000_000
+
+# (source, field) -> date strategy that last parsed a value for it ("iso", "epoch" or a strptime
+# format). Every posting from one source uses the same format, so after the first record that
+# strategy is tried first and the others are skipped.
+_date_strategies: Dict[Tuple[str, str], str] = {}
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _parse_with(strategy: str, s: str) -> Optional[datetime]:
+    """Parse s with one strategy; None if it does not apply."""
+    try:
+        if strategy == "epoch":
+            if not s.isdigit():
+                return None
+            seconds = int(s)
+            if seconds < EPOCH_MIN:
+                return None
+            if seconds >= EPOCH_MS_MIN:
+                seconds /= 1000
+            return datetime.fromtimestamp(seconds, timezone.utc)
+        if strategy == "iso":
+            # fromisoformat() only accepts a trailing "Z" from Python 3.11
+            return _utc(datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith("Z") else s))
+        return _utc(datetime.strptime(s.replace("Z", "+00:00"), strategy))
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+_STRATEGIES = ("iso", "epoch") + DATE_FORMATS
+
+
+def _parse_date(value: Any, source: Optional[str] = None, field: str = "date") -> Optional[datetime]:
+    """
+    Parse various date formats to UTC datetime. Returns None if unparseable.
+
+    Handles datetimes, Unix timestamps (seconds or milliseconds, as numbers or digit strings),
+    ISO-8601 via datetime.fromisoformat, then DATE_FORMATS. With a source, the strategy that
+    worked for (source, field) is remembered and tried first next time.
+    """
     if value is None or value == "" or value == "N/A":
         return None
     if isinstance(value, datetime):
-        return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return _utc(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(int(value))
     s = str(value).strip()
     if not s:
         return None
-    # ISO format
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%d/%m/%Y",
-    ):
-        try:
-            dt = datetime.strptime(s.replace("Z", "+00:00"), fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
-        except (ValueError, TypeError):
+
+    key = (source, field) if source else None
+    cached = _date_strategies.get(key) if key else None
+    if cached is not None:
+        dt = _parse_with(cached, s)
+        if dt is not None:
+            return dt
+    for strategy in _STRATEGIES:
+        if strategy == cached:
             continue
+        dt = _parse_with(strategy, s)
+        if dt is not None:
+            if key:
+                _date_strategies[key] = strategy
+            return dt
     return None
 
 
@@ -110,6 +173,73 @@ def _to_number(value: Any) -> Optional[float]:
         return None
 
 
+# Hourly pay x 2080 (40 h x 52 weeks) = annual salary
+HOURS_PER_YEAR = 2080
+# Extracted annual salaries outside this range are taken to be something else (revenue, bonuses, ...)
+ANNUAL_SALARY_RANGE = (10_000.0, 1_000_000.0)
+HOURLY_RATE_RANGE = (7.0, 500.0)
+
+_CURRENCY = r"(?:(?:USD\s?)?\$\s?|USD\s?)"
+_RANGE = r"(?:\s?(?:-|–|—|to)\s?|\sand\s)"
+_NUMBER_TAIL = r"(?:\d{0,2}(?:,\d{3})+(?:\.\d+)?|\d*(?:\.\d+)?)"
+# A bare amount (or range) only counts with a unit or period after it ("70-110k USD", "28/hr"),
+# so "401k" and "5-10 years" are rejected inside the regex engine
+_UNIT_AHEAD = (
+    r"(?=[\d.,]*(?:\s?k)?(?:" + _RANGE + r"[\d.,]+(?:\s?k)?)?\s?"
+    r"(?:USD|dollars|/\s?(?:hour|hr|year|yr)|(?:per|an|a)\s(?:hour|year|annum)|hourly|annually)\b)"
+)
+# One pass over the text for every salary shape: "$70k-$110k", "$70,000 to $110,000",
+# "between $80k and $100k", "70-110k USD", "$25/hr", "USD $30 - USD $35 per hour",
+# "USD 120,000 annually". The pattern starts with a digit so the regex engine skips ahead to
+# the next digit in C; the currency in front of it is checked with fixed-width lookbehinds.
+_SALARY_PATTERN = re.compile(
+    r"(?P<low>\d(?:(?<=\$\d)|(?<=\$ \d)|(?<=USD\d)|(?<=USD \d)|(?<![\w.,]\d)" + _UNIT_AHEAD + r")"
+    + _NUMBER_TAIL + r")(?:\s?(?P<low_k>k\b))?"
+    + r"(?:" + _RANGE + _CURRENCY + r"?(?P<high>\d" + _NUMBER_TAIL + r")(?:\s?(?P<high_k>k\b))?)?"
+    + r"(?:\s?(?P<unit>USD|dollars)\b)?"
+    + r"(?:\s?(?:/|per|an|a)\s?(?P<period>hour|hr|year|yr|annum)\b|\s?(?P<adverb>hourly|annually)\b)?",
+    re.IGNORECASE,
+)
+
+
+def _salary_from_match(match: "re.Match") -> Tuple[Optional[float], Optional[float]]:
+    period = (match.group("period") or match.group("adverb") or "").lower()
+    low = float(match.group("low").replace(",", ""))
+    if match.group("low_k"):
+        low *= 1000
+    if match.group("high"):
+        high = float(match.group("high").replace(",", ""))
+        if match.group("high_k"):
+            high *= 1000
+            # "$70-110k": the suffix covers both ends
+            if not match.group("low_k") and low < 1000:
+                low *= 1000
+    else:
+        high = low
+    if period in ("hour", "hr", "hourly"):
+        if not (HOURLY_RATE_RANGE[0] <= low <= high <= HOURLY_RATE_RANGE[1]):
+            return None, None
+        low, high = low * HOURS_PER_YEAR, high * HOURS_PER_YEAR
+    if not (ANNUAL_SALARY_RANGE[0] <= low <= high <= ANNUAL_SALARY_RANGE[1]):
+        return None, None
+    return low, high
+
+
+def extract_salary(text: Any) -> Tuple[Optional[float], Optional[float]]:
+    """
+    First annual salary (min, max) stated in free text, hourly rates converted at HOURS_PER_YEAR.
+    Handles ranges, single amounts (min = max), thousands separators and k suffixes.
+    Returns (None, None) when the text states no plausible salary.
+    """
+    if not text:
+        return None, None
+    for match in _SALARY_PATTERN.finditer(str(text)):
+        low, high = _salary_from_match(match)
+        if low is not None:
+            return low, high
+    return None, None
+
+
 def to_canonical_document(normalized: Dict[str, Any], source: str) -> Dict[str, Any]:
     """
     Map normalizer output (Company, Position, Location, Tags, etc.) to the canonical DB schema.
@@ -158,11 +288,16 @@ def to_canonical_document(normalized: Dict[str, Any], source: str) -> Dict[str,
         or normalized.get("JobCategory")
         or []
     )
+    if skill_extraction_enabled():
+        # Fill in (and canonicalize) skills from the posting text; see skills.py
+        skills_required = merge_skills(skills_required, f"{title}\n{description}")
     posted_date = _parse_date(
         normalized.get("Date")
         or normalized.get("posted_date")
         or normalized.get("publication_date")
-        or normalized.get("created")
+        or normalized.get("created"),
+        source=source,
+        field="posted_date",
     )
     source_url = (
         normalized.get("URL")
@@ -172,6 +307,9 @@ def to_canonical_document(normalized: Dict[str, Any], source: str) -> Dict[str,
     )
     min_sal = _to_number(normalized.get("Salary_Min") or normalized.get("salary_min"))
     max_sal = _to_number(normalized.get("Salary_Max") or normalized.get("salary_max"))
+    if min_sal is None and max_sal is None:
+        # Most sources have no salary fields; many descriptions still state one
+        min_sal, max_sal = extract_salary(description)
     # Schema: salary_range { min, max, currency } — currency always USD
     salary_range = {
         "min": min_sal,
@@ -195,6 +333,33 @@ def to_canonical_document(normalized: Dict[str, Any], source: str) -> Dict[str,
     }
 
 
+# Fields whose change means the posting changed (ids, audit fields and the hash itself excluded)
+CONTENT_HASH_FIELDS = (
+    "title",
+    "company",
+    "description",
+    "location",
+    "remote_type",
+    "skills_required",
+    "posted_date",
+    "source_url",
+    "source_platform",
+    "salary_range",
+)
+
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """
+    Stable hash of a canonical document's content (CONTENT_HASH_FIELDS).
+
+    Independent of key order and of ingested_at, so re-fetching an unchanged posting
+    gives the same hash and upsert ingestion can skip it.
+    """
+    payload = {field: doc.get(field) for field in CONTENT_HASH_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
 # Canonical CSV column order (same schema as DB, flattened for CSV)
 CANONICAL_CSV_FIELDS = [
     "external_id",
@@ -213,11 +378,19 @@ CANONICAL_CSV_FIELDS = [
 ]
 
 
-def _canonical_doc_to_csv_row(doc: Dict[str, Any]) -> Dict[str, Any]:
-    """Flatten a canonical document for one CSV row."""
+# Export file formats; parquet uses pyarrow, imported only when a Parquet file is read or written
+EXPORT_FORMATS = ("csv", "csv.gz", "parquet")
+EXPORT_EXTENSIONS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+# Rows per Parquet row group (and per in-memory batch while writing)
+PARQUET_ROW_GROUP_SIZE = 10_000
+# Typed Parquet columns; everything else in CANONICAL_CSV_FIELDS is a string
+_PARQUET_FLOAT_FIELDS = ("salary_min", "salary_max")
+
+
+def _canonical_doc_to_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a canonical document to CANONICAL_CSV_FIELDS, keeping posted_date / salaries typed."""
     sr = doc.get("salary_range") or {}
     posted = doc.get("posted_date")
-    posted_str = posted.isoformat() if isinstance(posted, datetime) else (str(posted) if posted else "")
     skills = doc.get("skills_required") or []
     skills_str = "; ".join(str(s) for s in skills) if isinstance(skills, list) else str(skills)
     return {
@@ -228,22 +401,138 @@ def _canonical_doc_to_csv_row(doc: Dict[str, Any]) -> Dict[str, Any]:
         "location": doc.get("location", ""),
         "remote_type": doc.get("remote_type", ""),
         "skills_required": skills_str,
-        "posted_date": posted_str,
+        "posted_date": posted if isinstance(posted, datetime) else None,
         "source_url": doc.get("source_url", ""),
         "source_platform": doc.get("source_platform", ""),
-        "salary_min": sr.get("min") if sr.get("min") is not None else "",
-        "salary_max": sr.get("max") if sr.get("max") is not None else "",
+        "salary_min": sr.get("min"),
+        "salary_max": sr.get("max"),
         "salary_currency": sr.get("currency", "USD"),
     }
 
 
+def _canonical_doc_to_csv_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a canonical document for one CSV row."""
+    row = _canonical_doc_to_record(doc)
+    posted = doc.get("posted_date")
+    row["posted_date"] = posted.isoformat() if isinstance(posted, datetime) else (str(posted) if posted else "")
+    for field in _PARQUET_FLOAT_FIELDS:
+        if row[field] is None:
+            row[field] = ""
+    return row
+
+
+def write_csv_rows(docs: Iterable[Dict[str, Any]], filepath: str, compress: bool = False) -> int:
+    """
+    Stream canonical documents to a CSV file (gzip-compressed when compress), one row at
+    a time. Returns the number of rows written.
+    """
+    opener = gzip.open if compress else open
+    count = 0
+    with opener(filepath, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CANONICAL_CSV_FIELDS)
+        for doc in docs:
+            row = _canonical_doc_to_csv_row(doc)
+            writer.writerow([row[field] for field in CANONICAL_CSV_FIELDS])
+            count += 1
+    return count
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install -r requirements.txt") from None
+    return pyarrow, pyarrow.parquet
+
+
+def _parquet_schema(pa):
+    types = {
+        "posted_date": pa.timestamp("us", tz="UTC"),
+        **{field: pa.float64() for field in _PARQUET_FLOAT_FIELDS},
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in CANONICAL_CSV_FIELDS])
+
+
+def write_parquet_rows(
+    docs: Iterable[Dict[str, Any]],
+    filepath: str,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+) -> int:
+    """
+    Stream canonical documents to a Parquet file, one row group per row_group_size
+    documents (at most that many rows are held in memory). Columns are
+    CANONICAL_CSV_FIELDS; posted_date is a UTC timestamp and salaries are floats.
+    Returns the number of rows written.
+    """
+    pa, pq = _import_pyarrow()
+    schema = _parquet_schema(pa)
+    docs = iter(docs)
+    count = 0
+    with pq.ParquetWriter(filepath, schema) as writer:
+        while True:
+            batch = [_canonical_doc_to_record(doc) for doc in islice(docs, row_group_size)]
+            if not batch:
+                return count
+            columns = {field: [record[field] for record in batch] for field in CANONICAL_CSV_FIELDS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(batch)
+
+
+def iter_export_rows(filepath: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read an export back as flat row dicts, streaming (.csv, .csv.gz or .parquet).
+    CSV values are strings; Parquet keeps posted_date as datetime and salaries as floats.
+    """
+    if filepath.endswith(".parquet"):
+        _, pq = _import_pyarrow()
+        for batch in pq.ParquetFile(filepath).iter_batches(batch_size=PARQUET_ROW_GROUP_SIZE):
+            yield from batch.to_pylist()
+        return
+    opener = gzip.open if filepath.endswith(".gz") else open
+    with opener(filepath, "rt", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def canonical_record_to_document(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Inverse of the export flattening: one row from iter_export_rows -> canonical document
+    (skills_required split on ";", posted_date parsed, salary columns back into salary_range).
+    """
+    source = row.get("source_platform") or ""
+    external_id = row.get("external_id") or f"{source}_{uuid.uuid4().hex}"
+    location = row.get("location") or "Remote"
+    posted = row.get("posted_date")
+    if not isinstance(posted, datetime):
+        posted = _parse_date(posted, source=source, field="posted_date")
+    return {
+        "external_id": str(external_id),
+        "title": str(row.get("title") or ""),
+        "company": str(row.get("company") or ""),
+        "description": str(row.get("description") or ""),
+        "location": str(location),
+        "remote_type": row.get("remote_type") or _infer_remote_type(location),
+        "skills_required": _tags_to_skills(row.get("skills_required")),
+        "posted_date": posted,
+        "source_url": str(row.get("source_url") or ""),
+        "source_platform": source,
+        "salary_range": {
+            "min": _to_number(row.get("salary_min")),
+            "max": _to_number(row.get("salary_max")),
+            "currency": row.get("salary_currency") or "USD",
+        },
+    }
+
+
 def export_canonical_to_csv(
-    jobs: List[Dict[str, Any]],
+    jobs: Iterable[Dict[str, Any]],
     source: str,
     normalizer: Callable[[Dict[str, Any]], Dict[str, Any]],
     csv_dir: str,
     filename: Optional[str] = None,
     file_prefix: Optional[str] = None,
+    output_format: Optional[str] = None,
 ) -> str:
     """
     Export jobs to CSV using the canonical schema (same as MongoDB).
@@ -251,30 +540,38 @@ def export_canonical_to_csv(
     Each job is normalized with the given normalizer, then mapped to the canonical
     document shape; rows are flattened for CSV (skills_required as semicolon-separated,
     posted_date as ISO string, salary_range as salary_min, salary_max, salary_currency).
+    Jobs are streamed straight to the file, one row at a time, so a generator of any
+    size can be exported.
 
     Args:
-        jobs: Raw job records from the API.
+        jobs: Raw job records from the API (list or any iterable).
         source: Source label (e.g. "Adzuna", "SerpAPI"); becomes source_platform.
         normalizer: Function that takes one raw job dict and returns a normalized dict.
         csv_dir: Directory path to write the CSV file into.
         filename: Optional full filename (e.g. "adzuna_20260210.csv"). If None, generated.
         file_prefix: Optional prefix for auto filename (e.g. "adzuna_top_jobs"); default source.
+        output_format: "csv", "csv.gz" (gzip) or "parquet" (columnar, via pyarrow);
+                       defaults to the EXPORT_FORMAT env var, else "csv".
 
     Returns:
-        Absolute path to the created CSV file, or "" if no jobs.
+        Absolute path to the created file, or "" if no jobs.
     """
-    if not jobs:
+    output_format = (output_format or os.getenv("EXPORT_FORMAT") or "csv").lower()
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"output_format must be one of {EXPORT_FORMATS}, got {output_format!r}")
+    jobs = iter(jobs)
+    first = next(jobs, None)
+    if first is None:
         return ""
     os.makedirs(csv_dir, exist_ok=True)
     prefix = (file_prefix or source).replace(" ", "_").lower()
     if not filename:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H_%M_%S")
-        filename = f"{prefix}_{timestamp}.csv"
+        filename = f"{prefix}_{timestamp}{EXPORT_EXTENSIONS[output_format]}"
     filepath = os.path.join(csv_dir, filename)
-    canonical_docs = [to_canonical_document(normalizer(job), source) for job in jobs]
-    rows = [_canonical_doc_to_csv_row(doc) for doc in canonical_docs]
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CANONICAL_CSV_FIELDS)
-        writer.writeheader()
-        writer.writerows(rows)
+    canonical_docs = (to_canonical_document(normalizer(job), source) for job in chain([first], jobs))
+    if output_format == "parquet":
+        write_parquet_rows(canonical_docs, filepath)
+    else:
+        write_csv_rows(canonical_docs, filepath, compress=output_format == "csv.gz")
     return os.path.abspath(filepath)
@@ -1,17 +1,86 @@
 """
 Jobicy: fetch all jobs for a list of job titles.
 
-Core utility (non-test) that loops over job_titles, calls the Jobicy API per title,
-aggregates results and dedupes by job id. No default job list; callers pass job_titles
-(e.g. from top_jobs.TOP_JOBS).
+Core utility (non-test) that fans out over job_titles through the shared async HTTP
+layer (http_client), aggregates results and dedupes by job id. No default job list;
+callers pass job_titles (e.g. from top_jobs.TOP_JOBS).
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional
 
 try:
-    from backend.app.api.jobicy.test_jobicy_api import test_jobicy_api
+    from backend.app.api.jobicy.test_jobicy_api import fetch_jobicy_page
+    from backend.app.api.http_client import (
+        HttpSession, iter_completed, open_session, run_sync, stream_sync,
+    )
+    from backend.app.api.checkpoints import Checkpoint
 except ImportError:
-    from test_jobicy_api import test_jobicy_api
+    from test_jobicy_api import fetch_jobicy_page
+    import os
+    import sys
+    _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if _api_dir not in sys.path:
+        sys.path.insert(0, _api_dir)
+    from http_client import HttpSession, iter_completed, open_session, run_sync, stream_sync
+    from checkpoints import Checkpoint
+
+
+def _advance_checkpoint(
+    checkpoint: Checkpoint, jobs: List[Dict[str, Any]], count_per_tag: int
+) -> List[Dict[str, Any]]:
+    """
+    Unseen postings of one tag's response; the checkpoint advances past them. Jobicy
+    has no paging, so a full response that reaches no earlier posting keeps the date
+    mark (older unseen postings may sit past count_per_tag).
+    """
+    fresh = checkpoint.filter_new(jobs)
+    checkpoint.advance(fresh, complete=len(fresh) < len(jobs) or len(jobs) < count_per_tag)
+    return fresh
+
+
+async def fetch_all_top_jobs_async(
+    job_titles: List[str],
+    industry: Optional[str] = None,
+    geo: Optional[str] = None,
+    count_per_tag: int = 100,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_all_top_jobs: one concurrent request per tag,
+    paced by the session's Jobicy rate limit and concurrency bound.
+    """
+    checkpoints = checkpoints or {}
+    async with open_session(session) as http:
+        responses = await asyncio.gather(
+            *(
+                fetch_jobicy_page(http, tag=tag, industry=industry, geo=geo, count=count_per_tag)
+                for tag in job_titles
+            ),
+            return_exceptions=True,
+        )
+
+    all_jobs: List[Dict[str, Any]] = []
+    seen_ids: set = set()
+
+    # Merge in request order so the output matches the sequential loop
+    for tag, data in zip(job_titles, responses):
+        if isinstance(data, BaseException):
+            # Retries / circuit breaking already happened in the HTTP layer
+            print(f"⚠️ Skipping Jobicy '{tag}': {data}")
+            continue
+        jobs = data.get("jobs", [])
+        checkpoint = checkpoints.get(tag)
+        if checkpoint is not None:
+            jobs = _advance_checkpoint(checkpoint, jobs, count_per_tag)
+        for job in jobs:
+            job_id = job.get("id")
+            if job_id is not None and job_id not in seen_ids:
+                seen_ids.add(job_id)
+                all_jobs.append(job)
+
+    return all_jobs
 
 
 def fetch_all_top_jobs(
@@ -19,6 +88,7 @@ def fetch_all_top_jobs(
     industry: Optional[str] = None,
     geo: Optional[str] = None,
     count_per_tag: int = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch jobs from Jobicy for each title in job_titles and dedupe by job id.
@@ -28,23 +98,72 @@ def fetch_all_top_jobs(
         industry: Optional job category filter (e.g. "engineering", "marketing").
         geo: Optional geographic filter (e.g. "usa", "canada", "emea").
         count_per_tag: Number of listings per tag (default 100, range 1-100).
+        checkpoints: Optional tag -> Checkpoint; only postings newer than each tag's
+                     checkpoint are returned (and the checkpoint advanced).
 
     Returns:
         Combined, deduplicated list of raw Jobicy job dicts.
     """
-    all_jobs: List[Dict[str, Any]] = []
+    return run_sync(fetch_all_top_jobs_async(
+        job_titles,
+        industry=industry,
+        geo=geo,
+        count_per_tag=count_per_tag,
+        checkpoints=checkpoints,
+    ))
+
+
+async def iter_all_top_jobs_async(
+    job_titles: List[str],
+    industry: Optional[str] = None,
+    geo: Optional[str] = None,
+    count_per_tag: int = 100,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming version of fetch_all_top_jobs_async: yields deduplicated jobs tag by tag
+    as each request finishes (completion order, not tag order).
+    """
+    checkpoints = checkpoints or {}
     seen_ids: set = set()
+    async with open_session(session) as http:
+        tags = iter_completed(
+            job_titles,
+            lambda tag: fetch_jobicy_page(
+                http, tag=tag, industry=industry, geo=geo, count=count_per_tag
+            ),
+        )
+        async for tag, data in tags:
+            if isinstance(data, BaseException):
+                print(f"⚠️ Skipping Jobicy '{tag}': {data}")
+                continue
+            jobs = data.get("jobs", [])
+            checkpoint = checkpoints.get(tag)
+            if checkpoint is not None:
+                jobs = _advance_checkpoint(checkpoint, jobs, count_per_tag)
+            for job in jobs:
+                job_id = job.get("id")
+                if job_id is not None and job_id not in seen_ids:
+                    seen_ids.add(job_id)
+                    yield job
 
-    for tag in job_titles:
-        try:
-            data = test_jobicy_api(tag=tag, industry=industry, geo=geo, count=count_per_tag)
-        except Exception:
-            continue
-        jobs = data.get("jobs", [])
-        for job in jobs:
-            job_id = job.get("id")
-            if job_id is not None and job_id not in seen_ids:
-                seen_ids.add(job_id)
-                all_jobs.append(job)
 
-    return all_jobs
+def iter_all_top_jobs(
+    job_titles: List[str],
+    industry: Optional[str] = None,
+    geo: Optional[str] = None,
+    count_per_tag: int = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Same jobs as fetch_all_top_jobs, streamed while the fetch is still running
+    (see http_client.stream_sync); feed it to run_ingestion for batched inserts.
+    """
+    return stream_sync(iter_all_top_jobs_async(
+        job_titles,
+        industry=industry,
+        geo=geo,
+        count_per_tag=count_per_tag,
+        checkpoints=checkpoints,
+    ))
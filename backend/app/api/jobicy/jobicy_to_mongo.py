@@ -12,16 +12,16 @@ Run from backend: python app/api/jobicy/jobicy_to_mongo.py
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.top_jobs import TOP_JOBS
@@ -33,9 +33,9 @@ except ImportError:
     from top_jobs import TOP_JOBS
 
 try:
-    from backend.app.api.jobicy.jobicy_fetch_top_jobs import fetch_all_top_jobs
+    from backend.app.api.jobicy.jobicy_fetch_top_jobs import iter_all_top_jobs
 except ImportError:
-    from jobicy_fetch_top_jobs import fetch_all_top_jobs
+    from jobicy_fetch_top_jobs import iter_all_top_jobs
 
 try:
     from backend.app.api.jobicy.test_jobicy_api import normalize_jobicy_job
@@ -43,11 +43,32 @@ except ImportError:
     from test_jobicy_api import normalize_jobicy_job
 
 
+SOURCE = "Jobicy"
+
+
+def fetch_jobs(
+    job_titles: Optional[List[str]] = None,
+    industry: Optional[str] = None,
+    geo: Optional[str] = None,
+    count_per_tag: Optional[int] = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream raw Jobicy jobs for each title in TOP_JOBS (or given list), deduped."""
+    return iter_all_top_jobs(
+        job_titles=job_titles or TOP_JOBS,
+        industry=industry,
+        geo=geo,
+        count_per_tag=count_per_tag or 100,
+        checkpoints=checkpoints,
+    )
+
+
 def run(
     job_titles: Optional[List[str]] = None,
     industry: Optional[str] = None,
     geo: Optional[str] = None,
     count_per_tag: Optional[int] = 100,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from Jobicy for each title in TOP_JOBS (or given list), dedupe, and insert into MongoDB.
     Documents are normalized then mapped to the canonical schema (job_schema) by insert_jobs_into_mongo.
@@ -55,20 +76,23 @@ def run(
     titles = job_titles or TOP_JOBS
     print("Jobicy → MongoDB (Top Jobs)")
     print("=" * 50)
-    all_jobs = fetch_all_top_jobs(
-        job_titles=titles,
-        industry=industry,
-        geo=geo,
-        count_per_tag=count_per_tag or 100,
-    )
-    print(f"Retrieved {len(all_jobs)} unique job postings from Jobicy.")
-    count_inserted = run_ingestion(
-        source="Jobicy",
+    # Per-title checkpoints: only postings newer than the last successful run
+    checkpoints = load_checkpoints(SOURCE, titles) if incremental else None
+    # Streams jobs while titles are still being fetched; inserted in batches
+    count = run_ingestion(
+        source=SOURCE,
         normalizer=normalize_jobicy_job,
-        fetch_jobs=lambda: all_jobs,
+        fetch_jobs=lambda: fetch_jobs(
+            job_titles=titles,
+            industry=industry,
+            geo=geo,
+            count_per_tag=count_per_tag or 100,
+            checkpoints=checkpoints,
+        ),
+        checkpoints=checkpoints.values() if checkpoints is not None else None,
     )
-    print(f"Inserted {count_inserted} documents into MongoDB.")
-    return count_inserted
+    print(f"Inserted {count} documents into MongoDB.")
+    return count
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ Auth: None
 Coverage: Remote jobs aggregated from multiple sources
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -19,6 +19,7 @@ from typing import Dict, Any, List, Optional
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
     from backend.app.api.top_jobs import TOP_JOBS
+    from backend.app.api.http_client import HttpSession, run_with_session
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -26,6 +27,7 @@ except ImportError:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
     from top_jobs import TOP_JOBS
+    from http_client import HttpSession, run_with_session
 
 
 def test_jobicy_api(tag: Optional[str] = None,
@@ -44,6 +46,21 @@ def test_jobicy_api(tag: Optional[str] = None,
     Returns:
         Dictionary containing job postings from Jobicy API (all jobs are remote)
     """
+    return run_with_session(
+        lambda session: fetch_jobicy_page(
+            session, tag=tag, industry=industry, geo=geo, count=count
+        )
+    )
+
+
+async def fetch_jobicy_page(session: HttpSession,
+                            tag: Optional[str] = None,
+                            industry: Optional[str] = None,
+                            geo: Optional[str] = None,
+                            count: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Async Jobicy call through the shared HttpSession (same arguments and result as test_jobicy_api).
+    """
     try:
         url = 'https://jobicy.com/api/v2/remote-jobs'
         params = {}
@@ -73,7 +90,7 @@ def test_jobicy_api(tag: Optional[str] = None,
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': 'gzip, deflate',
             'Referer': 'https://jobicy.com/',
             'Origin': 'https://jobicy.com',
             'Connection': 'keep-alive',
@@ -82,15 +99,14 @@ def test_jobicy_api(tag: Optional[str] = None,
             'Sec-Fetch-Site': 'same-origin'
         }
         
-        response = requests.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = await session.get_json("Jobicy", url, params=params, headers=headers)
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Jobicy API: {error}')
-        if hasattr(error, 'response') and error.response is not None:
-            print(f'Response: {error.response.text}')
+        response = getattr(error, 'response', None)
+        if response is not None:
+            print(f'Response: {response.text}')
         raise
 
 
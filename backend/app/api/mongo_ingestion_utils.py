@@ -5,25 +5,64 @@ All values must come from .env (no hardcoded defaults):
 - MONGODB_CONNECT_STRING (required)
 - PROD_DB (required) — database name
 - MONGO_JOBS_COLLECTION (required) — collection name
+- MONGO_CHECKPOINTS_COLLECTION (optional) — checkpoint collection, default "ingestion_checkpoints"
+- MONGO_QUERY_STATS_COLLECTION (optional) — query planner stats, default "ingestion_query_stats"
+- MONGO_SIGNATURES_COLLECTION (optional) — near-duplicate LSH index, default "job_signatures"
+- INGESTION_DEDUPE (optional) — "false" to skip near-duplicate clustering (cluster_id)
+- INGESTION_WRITE_MODE (optional) — "insert" (default) or "upsert", read per write (get_write_mode)
+- MONGO_INSERT_BATCH_SIZE (optional) — documents per bulk write, default 500
+- MONGO_WRITE_CONCERN (optional) — write concern "w" for job writes ("majority" or a number >= 1),
+  default the connection string's / server's
+- MONGO_WRITE_JOURNAL (optional) — "true" to wait for the journal on job writes
+- MONGO_WRITE_TIMEOUT_MS (optional) — wtimeout for job writes
+- INGESTION_PIPELINE_WRITES (optional) — "false" to write batches one after another instead of
+  building the next batch while the previous write is in flight
 
 Documents are written in canonical Job Posting schema (see job_schema.py):
 external_id, title, company, description, location, remote_type, skills_required,
-posted_date, source_url, source_platform, salary_range, source, ingested_at.
+posted_date, source_url, source_platform, salary_range, source, ingested_at
+(+ content_hash, updated_at in upsert mode; cluster_id when near-duplicate clustering is on).
 """
 
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Callable, Optional
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Set
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from pymongo.write_concern import WriteConcern
 
 _client: Optional[MongoClient] = None
 
 try:
-    from backend.app.api.job_schema import to_canonical_document
+    from backend.app.api.job_schema import content_hash, to_canonical_document
+    from backend.app.api.checkpoints import CheckpointStore
+    from backend.app.api.query_planner import QueryStatsStore
+    from backend.app.api.near_duplicates import NearDuplicateIndex
 except ImportError:
-    from job_schema import to_canonical_document
+    from job_schema import content_hash, to_canonical_document
+    from checkpoints import CheckpointStore
+    from query_planner import QueryStatsStore
+    from near_duplicates import NearDuplicateIndex
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Documents per insert_many unless MONGO_INSERT_BATCH_SIZE is set; bounds memory and
+# lets writes start while fetching continues
+DEFAULT_INSERT_BATCH_SIZE = 500
+
+# "insert": append only. "upsert": write new or changed documents, skip unchanged ones.
+WRITE_MODES = ("insert", "upsert")
+
+try:
+    from backend.db.monitoring import command_listeners
+except ImportError:
+    # Standalone script runs (backend package not importable): no command monitoring
+    def command_listeners():
+        return []
 
 
 def _ensure_env_loaded():
@@ -59,22 +98,25 @@ def _get_mongo_client() -> MongoClient:
         raise ValueError(
             "MONGODB_CONNECT_STRING is not set. Add it to your .env file."
         )
-    _client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+    _client = MongoClient(uri, serverSelectionTimeoutMS=5000,
+                          event_listeners=command_listeners())
     return _client
 
 
-def get_mongo_collection() -> Collection:
+def get_mongo_collection(db_name: Optional[str] = None,
+                         collection_name: Optional[str] = None) -> Collection:
     """
     Return the jobs collection (sync). Uses a shared client via _get_mongo_client().
-    All three env vars must be set: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION.
+    All three env vars must be set: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION;
+    db_name / collection_name override the last two (e.g. to load a staging database).
     """
     _ensure_env_loaded()
-    db_name = os.getenv("PROD_DB")
+    db_name = db_name or os.getenv("PROD_DB")
     if not db_name:
         raise ValueError(
             "PROD_DB is not set. Add the database name to your .env file."
         )
-    collection_name = os.getenv("MONGO_JOBS_COLLECTION")
+    collection_name = collection_name or os.getenv("MONGO_JOBS_COLLECTION")
     if not collection_name:
         raise ValueError(
             "MONGO_JOBS_COLLECTION is not set. Add the collection name to your .env file."
@@ -84,40 +126,326 @@ def get_mongo_collection() -> Collection:
     return db[collection_name]
 
 
+def get_checkpoint_store() -> CheckpointStore:
+    """Checkpoint store in the same database as the jobs collection (see checkpoints.py)."""
+    jobs = get_mongo_collection()
+    name = os.getenv("MONGO_CHECKPOINTS_COLLECTION", "ingestion_checkpoints")
+    return CheckpointStore(jobs.database[name])
+
+
+def get_query_stats_store() -> QueryStatsStore:
+    """Query planner stats in the same database as the jobs collection (see query_planner.py)."""
+    jobs = get_mongo_collection()
+    name = os.getenv("MONGO_QUERY_STATS_COLLECTION", "ingestion_query_stats")
+    return QueryStatsStore(jobs.database[name])
+
+
+def get_near_duplicate_index(jobs: Optional[Collection] = None,
+                             force: bool = False) -> Optional[NearDuplicateIndex]:
+    """
+    Near-duplicate LSH index in the same database as the jobs collection (see
+    near_duplicates.py); None when INGESTION_DEDUPE is "false" (unless force).
+    """
+    if not force and os.getenv("INGESTION_DEDUPE", "true").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    jobs = jobs if jobs is not None else get_mongo_collection()
+    name = os.getenv("MONGO_SIGNATURES_COLLECTION", "job_signatures")
+    return NearDuplicateIndex.from_env(jobs.database[name])
+
+
+def get_write_concern() -> Optional[WriteConcern]:
+    """
+    Write concern for job writes from MONGO_WRITE_CONCERN / MONGO_WRITE_JOURNAL /
+    MONGO_WRITE_TIMEOUT_MS; None (keep the collection's) when none of them is set.
+    Unacknowledged writes (w=0) are refused: they report no inserted or duplicate counts.
+    """
+    w = os.getenv("MONGO_WRITE_CONCERN", "").strip()
+    journal = os.getenv("MONGO_WRITE_JOURNAL", "").strip().lower()
+    timeout = os.getenv("MONGO_WRITE_TIMEOUT_MS", "").strip()
+    if not (w or journal or timeout):
+        return None
+    if w.isdigit():
+        w = int(w)
+        if w == 0:
+            raise ValueError("MONGO_WRITE_CONCERN=0 is not supported: unacknowledged writes report no counts.")
+    return WriteConcern(
+        w=w if w != "" else None,
+        wtimeout=int(timeout) if timeout else None,
+        j=journal in ("1", "true", "yes", "on") if journal else None,
+    )
+
+
+def get_insert_batch_size() -> int:
+    """Documents per bulk write: MONGO_INSERT_BATCH_SIZE (read now, after .env is loaded) or 500."""
+    _ensure_env_loaded()
+    return int(os.getenv("MONGO_INSERT_BATCH_SIZE", "").strip() or DEFAULT_INSERT_BATCH_SIZE)
+
+
+def get_write_mode(mode: Optional[str] = None) -> str:
+    """mode if given, else INGESTION_WRITE_MODE (read now, after .env is loaded), else "insert"."""
+    if mode:
+        return mode
+    _ensure_env_loaded()
+    return os.getenv("INGESTION_WRITE_MODE", "").strip().lower() or "insert"
+
+
+def pipelined_writes_enabled() -> bool:
+    return os.getenv("INGESTION_PIPELINE_WRITES", "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+def iter_canonical_documents(
+    jobs: Iterable[Dict[str, Any]],
+    source: str,
+    normalizer: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily map raw jobs to canonical documents: raw job -> normalizer(job) ->
+    to_canonical_document(..., source) -> add ingested_at. One document at a time.
+    """
+    now = datetime.now(timezone.utc)
+    for job in jobs:
+        doc = to_canonical_document(normalizer(job), source)
+        doc["ingested_at"] = now  # optional audit field; rest matches Job Posting schema
+        yield doc
+
+
+def new_write_report() -> Dict[str, Any]:
+    """
+    Counters filled by write_documents(report=...); changed_ids lists inserted + updated
+    external_ids, near_duplicates how many of them joined an existing cluster, and
+    duplicate_keys how many of the unchanged were rejected by the unique external_id index.
+    """
+    return {"inserted": 0, "updated": 0, "unchanged": 0, "duplicate_keys": 0, "near_duplicates": 0,
+            "changed_ids": []}
+
+
+def _only_duplicate_key_errors(error: BulkWriteError) -> bool:
+    # A write concern error (e.g. wtimeout) is never expected, even when every write error is a duplicate
+    if error.details.get("writeConcernErrors"):
+        return False
+    write_errors = error.details.get("writeErrors", [])
+    return all(e.get("code") == DUPLICATE_KEY_ERROR for e in write_errors)
+
+
+def _insert_batch(collection: Collection, docs: List[Dict[str, Any]], report: Dict[str, Any],
+                  clusters: Optional[NearDuplicateIndex] = None) -> int:
+    # Append only. ordered=False so duplicate key (or other per-doc) errors don't abort the whole batch.
+    # cluster_id is set before the insert; signatures are stored only for documents it kept.
+    signatures = clusters.cluster(docs) if clusters is not None else {}
+    failed: Set[int] = set()
+    try:
+        result = collection.insert_many(docs, ordered=False)
+        inserted = len(result.inserted_ids)
+    except BulkWriteError as error:
+        # Postings already in the collection are expected on re-runs; anything else is a real failure
+        if not _only_duplicate_key_errors(error):
+            raise
+        inserted = error.details.get("nInserted", 0)
+        failed = {e.get("index") for e in error.details.get("writeErrors", [])}
+        report["duplicate_keys"] += len(failed)
+    report["changed_ids"].extend(
+        doc["external_id"] for i, doc in enumerate(docs) if i not in failed
+    )
+    if signatures:
+        report["near_duplicates"] += clusters.store(
+            record for i, record in signatures.items() if i not in failed
+        )
+    report["inserted"] += inserted
+    report["unchanged"] += len(docs) - inserted
+    return inserted
+
+
+def _upsert_batch(collection: Collection, docs: List[Dict[str, Any]], report: Dict[str, Any],
+                  clusters: Optional[NearDuplicateIndex] = None) -> int:
+    """
+    Upsert only new or changed documents, keyed on external_id.
+
+    One find() fetches the stored content_hash of every external_id in the batch;
+    documents whose hash matches are skipped without a write. ingested_at is kept
+    from the first insert ($setOnInsert); updated_at marks the last content change.
+    Only the documents being written are clustered (cluster_id is not part of the hash),
+    and only those the write kept store their signature.
+    """
+    # Last occurrence wins if the same posting appears twice in one batch
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for doc in docs:
+        doc["content_hash"] = content_hash(doc)
+        by_id[doc["external_id"]] = doc
+    report["unchanged"] += len(docs) - len(by_id)
+
+    stored = {
+        existing["external_id"]: existing.get("content_hash")
+        for existing in collection.find(
+            {"external_id": {"$in": list(by_id)}},
+            {"_id": 0, "external_id": 1, "content_hash": 1},
+        )
+    }
+
+    changed = []
+    for external_id, doc in by_id.items():
+        if stored.get(external_id) == doc["content_hash"]:
+            report["unchanged"] += 1
+            continue
+        changed.append(doc)
+    signatures = clusters.cluster(changed) if clusters is not None and changed else {}
+
+    ops = []
+    changed_ids = []
+    for doc in changed:
+        external_id = doc["external_id"]
+        written_at = doc.pop("ingested_at", None) or datetime.now(timezone.utc)
+        ops.append(UpdateOne(
+            {"external_id": external_id},
+            {
+                "$set": {**doc, "updated_at": written_at},
+                "$setOnInsert": {"ingested_at": written_at},
+            },
+            upsert=True,
+        ))
+        changed_ids.append(external_id)
+    if not ops:
+        return 0
+
+    failed: Set[int] = set()
+    try:
+        result = collection.bulk_write(ops, ordered=False)
+        inserted, updated = result.upserted_count, result.modified_count
+    except BulkWriteError as error:
+        # Two writers upserting the same new posting: the loser hits the unique index
+        if not _only_duplicate_key_errors(error):
+            raise
+        inserted = error.details.get("nUpserted", 0)
+        updated = error.details.get("nModified", 0)
+        failed = {e.get("index") for e in error.details.get("writeErrors", [])}
+        report["unchanged"] += len(failed)
+        report["duplicate_keys"] += len(failed)
+    if signatures:
+        report["near_duplicates"] += clusters.store(
+            record for i, record in signatures.items() if i not in failed
+        )
+    report["inserted"] += inserted
+    report["updated"] += updated
+    report["changed_ids"].extend(
+        external_id for i, external_id in enumerate(changed_ids) if i not in failed
+    )
+    return inserted + updated
+
+
+def write_documents(
+    docs: Iterable[Dict[str, Any]],
+    collection: Collection,
+    batch_size: Optional[int] = None,
+    mode: Optional[str] = None,
+    report: Optional[Dict[str, Any]] = None,
+    clusters: Optional[NearDuplicateIndex] = None,
+    write_concern: Optional[WriteConcern] = None,
+    pipeline: Optional[bool] = None,
+) -> int:
+    """
+    Write documents in fixed-size batches as they arrive from the iterable.
+
+    When pipelined, each batch is written on a helper thread while the next one is
+    built from the iterable (normalizing, or still fetching when docs is a stream),
+    so Mongo round trips overlap the rest of the run. Batches are still written one
+    at a time and in order, so at most two batches are held in memory and each
+    batch's near-duplicate lookup sees every earlier batch.
+
+    Args:
+        docs: Canonical documents (e.g. from iter_canonical_documents).
+        collection: Target collection.
+        batch_size: Documents per insert_many / bulk_write call; default
+                    get_insert_batch_size().
+        mode: "insert" (append only) or "upsert" (new or changed only, see _upsert_batch);
+              default INGESTION_WRITE_MODE, else "insert" (see get_write_mode).
+        report: Optional dict (see new_write_report) updated with inserted / updated /
+                unchanged counts and changed_ids.
+        clusters: Optional near-duplicate index (see get_near_duplicate_index); documents
+                  being written get a cluster_id.
+        write_concern: Write concern for the job writes; default get_write_concern().
+        pipeline: Overlap each write with building the next batch; default
+                  INGESTION_PIPELINE_WRITES (on).
+
+    Returns:
+        Number of documents written (inserted + updated).
+    """
+    mode = get_write_mode(mode)
+    if mode not in WRITE_MODES:
+        raise ValueError(f"mode must be one of {WRITE_MODES}, got {mode!r}")
+    write_batch = _upsert_batch if mode == "upsert" else _insert_batch
+    if report is None:
+        report = new_write_report()
+    write_concern = write_concern or get_write_concern()
+    if write_concern is not None:
+        collection = collection.with_options(write_concern=write_concern)
+    if pipeline is None:
+        pipeline = pipelined_writes_enabled()
+    batch_size = batch_size or get_insert_batch_size()
+    docs = iter(docs)
+    batches = iter(lambda: list(islice(docs, batch_size)), [])
+    if not pipeline:
+        return sum(write_batch(collection, batch, report, clusters) for batch in batches)
+
+    written = 0
+    # One writer thread: only this batch's write is in flight, and only it touches report
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="mongo-write") as writer:
+        in_flight: Optional[Future] = None
+        for batch in batches:
+            if in_flight is not None:
+                written += in_flight.result()
+            in_flight = writer.submit(write_batch, collection, batch, report, clusters)
+        if in_flight is not None:
+            written += in_flight.result()
+    return written
+
+
 def insert_jobs_into_mongo(
-    jobs: List[Dict[str, Any]],
+    jobs: Iterable[Dict[str, Any]],
     collection: Collection,
     source: str,
     normalizer: Callable[[Dict[str, Any]], Dict[str, Any]],
+    batch_size: Optional[int] = None,
+    mode: Optional[str] = None,
+    report: Optional[Dict[str, Any]] = None,
+    clusters: Optional[NearDuplicateIndex] = None,
+    write_concern: Optional[WriteConcern] = None,
 ) -> int:
     """
-    Normalize job records, map to canonical schema, and append to MongoDB (insert only).
+    Normalize job records, map to canonical schema, and write to MongoDB.
 
-    Pipeline: raw job -> normalizer(job) -> to_canonical_document(..., source) -> add ingested_at.
+    Pipeline: raw job -> normalizer(job) -> to_canonical_document(..., source) -> add ingested_at,
+    streamed into batches of batch_size (see iter_canonical_documents / write_documents).
     Written document schema: _id (Mongo), external_id, title, company, description, location,
     remote_type, skills_required, posted_date, source_url, source_platform, salary_range { min, max, currency }, ingested_at.
 
     Args:
-        jobs: Raw job records from the API.
+        jobs: Raw job records from the API (list or any iterable, e.g. a streaming fetch).
         collection: MongoDB collection to insert into.
         source: Source label (e.g. "Adzuna", "SerpAPI"); becomes source_platform.
         normalizer: Function that takes one raw job dict and returns a normalized dict
                     (e.g. Company, Position, Location, Tags, URL, Salary_Min, Date, ID).
+        batch_size: Documents per write call; default MONGO_INSERT_BATCH_SIZE, else 500.
+        mode: "insert" (append only) or "upsert": documents are keyed on external_id
+              and compared by job_schema.content_hash, so only new or changed postings
+              are written (and get content_hash / updated_at). Default INGESTION_WRITE_MODE,
+              else "insert".
+        report: Optional dict filled with inserted / updated / unchanged counts and
+                changed_ids (external_ids written), e.g. for targeted re-embedding.
+        clusters: Optional near-duplicate index; written documents get a cluster_id
+                  (see near_duplicates.py).
+        write_concern: Write concern for the job writes; default from MONGO_WRITE_CONCERN /
+                       MONGO_WRITE_JOURNAL / MONGO_WRITE_TIMEOUT_MS (see get_write_concern).
 
     Returns:
-        Number of documents inserted.
+        Number of documents written (inserted, plus updated in upsert mode). Duplicate
+        external_ids rejected by the unique index are counted in report["duplicate_keys"]
+        (and "unchanged") instead of raising.
     """
-    if not jobs:
-        return 0
-
-    now = datetime.now(timezone.utc)
-    docs = []
-    for job in jobs:
-        normalized = normalizer(job)
-        doc = to_canonical_document(normalized, source)
-        doc["ingested_at"] = now  # optional audit field; rest matches Job Posting schema
-        docs.append(doc)
-
-    # Append only. ordered=False so duplicate key (or other per-doc) errors don't abort the whole batch.
-    result = collection.insert_many(docs, ordered=False)
-    return len(result.inserted_ids)
+    return write_documents(
+        iter_canonical_documents(jobs, source, normalizer),
+        collection,
+        batch_size=batch_size,
+        mode=mode,
+        report=report,
+        clusters=clusters,
+        write_concern=write_concern,
+    )
@@ -14,13 +14,13 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.muse.test_muse_api import test_muse_api, normalize_muse_job
@@ -28,33 +28,70 @@ except ImportError:
     from test_muse_api import test_muse_api, normalize_muse_job
 
 
+SOURCE = "The Muse"
+
+
+def checkpoint_query(keywords: Optional[str] = None) -> str:
+    """Checkpoint query key for a fetch configuration."""
+    return keywords or "all"
+
+
+def fetch_jobs(
+    page: int = 1,
+    keywords: Optional[str] = None,
+    locations: Optional[str] = "United States",
+    categories: Optional[List[str]] = None,
+    descending: Optional[str] = "descending",
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch raw jobs from The Muse; with a checkpoint, only postings newer than the last run."""
+    data = test_muse_api(
+        page=page,
+        keywords=keywords,
+        locations=locations,
+        categories=categories,
+        descending=descending,
+    )
+    jobs = data.get("results", [])
+    if checkpoint is not None:
+        fresh = checkpoint.filter_new(jobs)
+        # A page of unseen postings with more pages behind it: keep the date mark
+        last_page = page >= (data.get("page_count") or 0)
+        checkpoint.advance(fresh, complete=len(fresh) < len(jobs) or last_page)
+        jobs = fresh
+    return jobs
+
+
 def run(
     page: int = 1,
     keywords: Optional[str] = None,
     locations: Optional[str] = "United States",
     categories: Optional[List[str]] = None,
     descending: Optional[str] = "descending",
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from The Muse and insert into MongoDB. Returns count inserted."""
     print("The Muse → MongoDB")
     print("=" * 50)
 
-    def fetch_jobs():
-        data = test_muse_api(
-            page=page,
-            keywords=keywords,
-            locations=locations,
-            categories=categories,
-            descending=descending,
-        )
-        return data.get("results", [])
-
-    jobs = fetch_jobs()
+    # Only postings newer than the last successful run for this query
+    query = checkpoint_query(keywords)
+    checkpoint = load_checkpoints(SOURCE, [query])[query] if incremental else None
+
+    jobs = fetch_jobs(
+        page=page,
+        keywords=keywords,
+        locations=locations,
+        categories=categories,
+        descending=descending,
+        checkpoint=checkpoint,
+    )
     print(f"Retrieved {len(jobs)} job postings from The Muse.")
     count = run_ingestion(
-        source="The Muse",
+        source=SOURCE,
         normalizer=normalize_muse_job,
         fetch_jobs=lambda: jobs,
+        checkpoints=[checkpoint] if checkpoint is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
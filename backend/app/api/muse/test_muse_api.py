@@ -8,7 +8,7 @@ Auth: API key required (X-Muse-Api-Key header)
 Coverage: Tech and professional job postings from various companies
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -27,12 +27,14 @@ MUSE_API_KEY = os.getenv("MUSE_API_KEY")
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import get_json
 
 
 def test_muse_api(page: int = 1,
@@ -135,10 +137,7 @@ def test_muse_api(page: int = 1,
             params.append(('level', level))
         
         # Make the request - use params as list of tuples to allow multiple category params
-        response = requests.get(url, params=params, headers=headers)
-        
-        response.raise_for_status()
-        data = response.json()
+        data = get_json("The Muse", url, params=params, headers=headers)
         
         # Post-process to filter by job title if keywords provided
         # Handle both 'results' array and direct array response
@@ -165,10 +164,11 @@ def test_muse_api(page: int = 1,
         
         # Return all results if no keyword filter
         return data if isinstance(data, dict) else {'results': jobs_list}
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling The Muse API: {error}')
-        if hasattr(error, 'response') and error.response is not None:
-            print(f'Response: {error.response.text}')
+        response = getattr(error, 'response', None)
+        if response is not None:
+            print(f'Response: {response.text}')
         raise
 
 
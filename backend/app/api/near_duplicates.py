@@ -0,0 +1,274 @@
+"""
+Cross-source near-duplicate detection (MinHash + LSH).
+
+The same posting often arrives from several sources (Adzuna, SerpAPI, Jobicy, ...)
+under different external_ids, with slightly different titles, company spellings
+and description formatting. Before a batch is written, every new or changed
+document is shingled (word 3-grams of title + company + description), reduced to
+a MinHash signature, and looked up in a persistent LSH index: signatures are cut
+into bands and any stored job sharing a band bucket is a candidate. A candidate
+whose estimated Jaccard similarity reaches the threshold puts the document into
+its cluster; otherwise the document starts a cluster of its own.
+
+Each job document gets cluster_id, the external_id of the cluster's first member
+(its representative), so the ML matcher can index one posting per cluster.
+
+Stored in the ingestion database (collection MONGO_SIGNATURES_COLLECTION,
+default "job_signatures"), one document per job, with a multikey index on bands:
+  _id: external_id, source_platform, bands, signature, cluster_id, updated_at
+
+Env:
+- INGESTION_DEDUPE (optional) — "false" to skip clustering, default on
+- NEAR_DUPLICATE_THRESHOLD (optional) — estimated Jaccard similarity that counts as a duplicate, default 0.7
+
+Backfill cluster_id on jobs written before this existed (run from project root):
+  python -m backend.app.api.near_duplicates
+"""
+
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from pymongo import ReplaceOne
+from pymongo.collection import Collection
+
+NUM_PERM = 128
+# 16 bands x 8 rows: pairs around 0.7 Jaccard collide in at least one band about half the
+# time, pairs at 0.85+ almost always; below 0.5 they rarely become candidates at all
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+# Long descriptions add little beyond this and dominate hashing time
+DESCRIPTION_CHARS = 4000
+DEFAULT_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def shingles(doc: Dict[str, Any], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Word size-grams of a canonical document's title, company and description."""
+    text = " ".join(
+        str(doc.get(field) or "")
+        for field in ("title", "company")
+    ) + " " + str(doc.get("description") or "")[:DESCRIPTION_CHARS]
+    words = _NON_WORD.sub(" ", text.lower()).split()
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash32(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """
+    MinHash signatures from NUM_PERM universal hash functions (a * x + b) mod p.
+    The seed is fixed so signatures stored by earlier runs stay comparable.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, num_bands: int = NUM_BANDS, seed: int = 1):
+        if num_perm % num_bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of num_bands ({num_bands})")
+        rng = np.random.RandomState(seed)
+        # a, b and the 32-bit shingle hashes are all < 2**32, so a * x + b fits in uint64
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows = num_perm // num_bands
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter((_hash32(s) for s in shingle_set), dtype=np.uint64,
+                             count=len(shingle_set))
+        permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0)
+
+    def bands(self, signature: np.ndarray) -> List[str]:
+        """LSH bucket keys, "band:hash", one per band."""
+        return [
+            f"{band}:{self._band_hash(signature[band * self.rows:(band + 1) * self.rows])}"
+            for band in range(self.num_bands)
+        ]
+
+    @staticmethod
+    def _band_hash(rows: np.ndarray) -> str:
+        return hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()
+
+
+def estimated_jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    return float(np.mean(left == right))
+
+
+class NearDuplicateIndex:
+    """
+    Persistent LSH index over job signatures (sync, like CheckpointStore).
+
+    Args:
+        collection: Signature collection (see module docstring).
+        threshold: Estimated Jaccard similarity at or above which two postings are one cluster.
+        hasher: MinHasher; the default must not change between runs.
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        threshold: float = DEFAULT_THRESHOLD,
+        hasher: Optional[MinHasher] = None,
+    ):
+        self.collection = collection
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self._indexed = False
+
+    @classmethod
+    def from_env(cls, collection: Collection) -> "NearDuplicateIndex":
+        threshold = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", str(DEFAULT_THRESHOLD)))
+        return cls(collection, threshold=threshold)
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.collection.create_index("bands", name="idx_signature_bands")
+            self._indexed = True
+
+    def assign(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Set cluster_id on each document (in place) and store their signatures.
+
+        Returns:
+            Number of documents that joined an existing cluster.
+        """
+        return self.store(self.cluster(docs).values())
+
+    def cluster(self, docs: List[Dict[str, Any]]) -> Dict[int, Tuple[Dict[str, Any], bool]]:
+        """
+        Set cluster_id on each document (in place) without storing anything yet, so
+        a writer can store() only the signatures of the documents it actually wrote.
+
+        A job already in the index keeps its cluster. Documents earlier in the same
+        batch count as candidates, so duplicates arriving together are clustered too.
+
+        Returns:
+            {position in docs: (signature record, joined an existing cluster)}
+        """
+        self._ensure_index()
+        prepared: List[Tuple[int, Dict[str, Any], np.ndarray, List[str]]] = []
+        for position, doc in enumerate(docs):
+            if not doc.get("external_id"):
+                continue
+            signature = self.hasher.signature(shingles(doc))
+            prepared.append((position, doc, signature, self.hasher.bands(signature)))
+        if not prepared:
+            return {}
+
+        # One round trip for every stored job sharing a bucket with the batch
+        all_bands = list({band for _, _, _, bands in prepared for band in bands})
+        members: Dict[str, Tuple[np.ndarray, str]] = {}
+        buckets: Dict[str, Set[str]] = {}
+        for stored in self.collection.find({"bands": {"$in": all_bands}},
+                                           {"bands": 1, "signature": 1, "cluster_id": 1}):
+            members[stored["_id"]] = (np.frombuffer(stored["signature"], dtype=np.uint64),
+                                      stored["cluster_id"])
+            for band in stored["bands"]:
+                buckets.setdefault(band, set()).add(stored["_id"])
+        known = {
+            stored["_id"]: stored["cluster_id"]
+            for stored in self.collection.find(
+                {"_id": {"$in": [doc["external_id"] for _, doc, _, _ in prepared]}},
+                {"cluster_id": 1},
+            )
+        }
+
+        now = datetime.now(timezone.utc)
+        records: Dict[int, Tuple[Dict[str, Any], bool]] = {}
+        for position, doc, signature, bands in prepared:
+            external_id = doc["external_id"]
+            cluster_id = known.get(external_id)
+            joined = False
+            if cluster_id is None:
+                best, best_similarity = None, self.threshold
+                candidates = set().union(*(buckets.get(band, ()) for band in bands))
+                candidates.discard(external_id)
+                for candidate in candidates:
+                    similarity = estimated_jaccard(signature, members[candidate][0])
+                    if similarity >= best_similarity:
+                        best, best_similarity = candidate, similarity
+                if best is not None:
+                    cluster_id = members[best][1]
+                    joined = True
+                else:
+                    cluster_id = external_id
+            doc["cluster_id"] = cluster_id
+            members[external_id] = (signature, cluster_id)
+            for band in bands:
+                buckets.setdefault(band, set()).add(external_id)
+            records[position] = ({
+                "_id": external_id,
+                "source_platform": doc.get("source_platform"),
+                "bands": bands,
+                "signature": signature.tobytes(),
+                "cluster_id": cluster_id,
+                "updated_at": now,
+            }, joined)
+        return records
+
+    def store(self, records: Iterable[Tuple[Dict[str, Any], bool]]) -> int:
+        """
+        Store signature records from cluster().
+
+        Returns:
+            Number of them that joined an existing cluster.
+        """
+        ops = []
+        joined = 0
+        for record, record_joined in records:
+            ops.append(ReplaceOne({"_id": record["_id"]}, record, upsert=True))
+            joined += record_joined
+        if ops:
+            self.collection.bulk_write(ops, ordered=False)
+        return joined
+
+
+def backfill_clusters(jobs: Collection, index: NearDuplicateIndex,
+                      batch_size: int = 500) -> Dict[str, int]:
+    """Assign cluster_id to stored jobs that have none, oldest first."""
+    counts = {"assigned": 0, "joined": 0}
+    cursor = jobs.find(
+        {"cluster_id": {"$exists": False}},
+        {"external_id": 1, "title": 1, "company": 1, "description": 1, "source_platform": 1},
+    ).sort("ingested_at", 1)
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        counts["joined"] += index.assign(batch)
+        for doc in batch:
+            if "cluster_id" in doc:
+                jobs.update_one({"_id": doc["_id"]}, {"$set": {"cluster_id": doc["cluster_id"]}})
+                counts["assigned"] += 1
+        batch.clear()
+
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return counts
+
+
+if __name__ == "__main__":
+    try:
+        from backend.app.api.mongo_ingestion_utils import get_mongo_collection, get_near_duplicate_index
+    except ImportError:
+        from mongo_ingestion_utils import get_mongo_collection, get_near_duplicate_index
+
+    jobs_collection = get_mongo_collection()
+    result = backfill_clusters(jobs_collection, get_near_duplicate_index(jobs_collection, force=True))
+    print(f"✅ Assigned cluster_id to {result['assigned']} job(s); "
+          f"{result['joined']} joined an existing cluster.")
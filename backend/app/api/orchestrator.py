@@ -0,0 +1,381 @@
+"""
+Parallel multi-source ingestion: every *_to_mongo source in one run.
+
+run_all() fetches all registered sources at once (one worker thread per source;
+each source keeps its own request limits from http_client.SOURCE_POLICIES), drops
+postings that more than one source returned, then writes each source's remaining
+documents in parallel. Wall-clock time tracks the slowest single source instead
+of the sum of all of them.
+
+Deduping needs every source's postings before any source is written, but only their
+fingerprints have to stay in memory: each fetch streams its canonical documents into a
+temporary file (SpooledDocuments) and counts their fingerprints, and each write streams
+the file back in batches, skipping the postings another source owns. Memory is the
+fingerprint -> owner map plus a couple of write batches per source; the price is
+temporary disk space for one run's postings and a pickle round trip per posting.
+
+Exact cross-source duplicates are matched on a normalized title | company | location
+fingerprint. The source listed first in SOURCES keeps a shared posting, so reruns
+resolve duplicates the same way and upsert mode never moves a posting between sources.
+Fuzzier duplicates are written but share a cluster_id (see near_duplicates.py).
+
+Each source's report carries its run metrics (postings kept after dedupe, write counts,
+docs/s, HTTP latency percentiles; see run_metrics.py).
+
+Env: same as the *_to_mongo scripts, plus INGESTION_MAX_SOURCES (optional) to cap
+how many sources fetch at the same time (default: all of them).
+
+Run from project root: python -m backend.app.api.orchestrator
+"""
+
+import os
+import pickle
+import re
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from backend.app.api.adzuna import adzuna_top_jobs_to_mongo as adzuna
+from backend.app.api.adzuna.test_adzuna_api import normalize_adzuna_job
+from backend.app.api.arbeitnow import arbeitnow_to_mongo as arbeitnow
+from backend.app.api.arbeitnow.test_arbeitnow_api import normalize_arbeitnow_job
+from backend.app.api.data_ingestor import Checkpoint, load_checkpoints
+from backend.app.api.http_client import request_log
+from backend.app.api.jobicy import jobicy_to_mongo as jobicy
+from backend.app.api.jobicy.test_jobicy_api import normalize_jobicy_job
+from backend.app.api.mongo_ingestion_utils import (
+    get_checkpoint_store,
+    get_mongo_collection,
+    get_near_duplicate_index,
+    get_write_mode,
+    iter_canonical_documents,
+    new_write_report,
+    write_documents,
+)
+from backend.app.api.muse import muse_to_mongo as muse
+from backend.app.api.muse.test_muse_api import normalize_muse_job
+from backend.app.api.remoteok import remoteok_to_mongo as remoteok
+from backend.app.api.remoteok.test_remoteok_api import normalize_job_data as normalize_remoteok_job
+from backend.app.api.remotive import remotive_to_mongo as remotive
+from backend.app.api.remotive.test_remotive_api import normalize_remotive_job
+from backend.app.api.run_metrics import finish_source_report, new_source_report, run_totals
+from backend.app.api.serpapi import serpapi_to_mongo as serpapi
+from backend.app.api.serpapi.test_serp_api import normalize_serpapi_job
+from backend.app.api.top_jobs import TOP_JOBS
+from backend.app.api.usajobs import usajobs_to_mongo as usajobs
+from backend.app.api.usajobs.test_usajobs_api import normalize_usajobs_job
+
+FetchFn = Callable[[Optional[Dict[str, Checkpoint]]], Iterable[Dict[str, Any]]]
+ProgressFn = Callable[[str, str, Dict[str, Any]], None]
+
+
+class IngestionSource:
+    """
+    One registered source.
+
+    Args:
+        name: Source label (becomes source_platform; also the checkpoint / policy key).
+        normalizer: Raw job dict -> normalized dict for job_schema.to_canonical_document.
+        queries: Checkpoint queries this source fetches.
+        fetch: Callable taking {query: Checkpoint} (or None for a full fetch) and
+               returning (or streaming) raw job dicts.
+    """
+
+    def __init__(self, name: str, normalizer: Callable, queries: List[str], fetch: FetchFn):
+        self.name = name
+        self.normalizer = normalizer
+        self.queries = queries
+        self.fetch = fetch
+
+
+def _top_jobs_source(module, normalizer) -> IngestionSource:
+    """Source fanned out over TOP_JOBS with one checkpoint per title."""
+    return IngestionSource(
+        module.SOURCE,
+        normalizer,
+        list(TOP_JOBS),
+        lambda checkpoints: module.fetch_jobs(checkpoints=checkpoints),
+    )
+
+
+def _single_query_source(module, normalizer) -> IngestionSource:
+    """Source fetched with one call using its script defaults."""
+    query = module.checkpoint_query()
+    return IngestionSource(
+        module.SOURCE,
+        normalizer,
+        [query],
+        lambda checkpoints: module.fetch_jobs(
+            checkpoint=checkpoints.get(query) if checkpoints is not None else None
+        ),
+    )
+
+
+# Priority order: when sources return the same posting, the earlier one keeps it
+SOURCES: List[IngestionSource] = [
+    _top_jobs_source(adzuna, normalize_adzuna_job),
+    _single_query_source(arbeitnow, normalize_arbeitnow_job),
+    _single_query_source(remotive, normalize_remotive_job),
+    _top_jobs_source(jobicy, normalize_jobicy_job),
+    _top_jobs_source(serpapi, normalize_serpapi_job),
+    _top_jobs_source(remoteok, normalize_remoteok_job),
+    _single_query_source(usajobs, normalize_usajobs_job),
+    _single_query_source(muse, normalize_muse_job),
+]
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def job_fingerprint(doc: Dict[str, Any]) -> Optional[str]:
+    """
+    Source-independent key for a canonical document: normalized title | company | location.
+    None when title or company is missing (too little to call two postings the same).
+    """
+    parts = [
+        _NON_WORD.sub(" ", str(doc.get(field) or "").lower()).strip()
+        for field in ("title", "company", "location")
+    ]
+    if not parts[0] or not parts[1]:
+        return None
+    return "|".join(parts)
+
+
+def fingerprint_owners(
+    fingerprints_by_source: Dict[str, Iterable[str]],
+    priority: List[str],
+) -> Dict[str, str]:
+    """Map each fingerprint to the first source in priority that returned it."""
+    owner: Dict[str, str] = {}
+    for name in priority:
+        for fingerprint in fingerprints_by_source.get(name, ()):
+            owner.setdefault(fingerprint, name)
+    return owner
+
+
+def drop_cross_source_duplicates(
+    docs_by_source: Dict[str, List[Dict[str, Any]]],
+    priority: List[str],
+) -> Dict[str, int]:
+    """
+    Remove, in place, documents whose fingerprint an earlier source in priority already has.
+    Repeats within one source are left alone (upsert keys them on external_id).
+    Returns the number of documents dropped per source.
+    """
+    owner = fingerprint_owners(
+        {name: filter(None, map(job_fingerprint, docs)) for name, docs in docs_by_source.items()},
+        priority,
+    )
+    dropped: Dict[str, int] = {}
+    for name in priority:
+        docs = docs_by_source.get(name, [])
+        kept = [doc for doc in docs if owner.get(job_fingerprint(doc), name) == name]
+        dropped[name] = len(docs) - len(kept)
+        docs_by_source[name] = kept
+    return dropped
+
+
+class SpooledDocuments:
+    """
+    One source's canonical documents, pickled to a temporary file as they are fetched,
+    with the count of each fingerprint kept in memory for the cross-source dedupe.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.fingerprints: Counter = Counter()
+        self._file = tempfile.TemporaryFile(prefix=f"ingest-{name}-")
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        pickle.dump(doc, self._file, pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+        fingerprint = job_fingerprint(doc)
+        if fingerprint is not None:
+            self.fingerprints[fingerprint] += 1
+
+    def duplicates(self, owner: Dict[str, str]) -> int:
+        """Documents whose fingerprint another source owns."""
+        return sum(n for fingerprint, n in self.fingerprints.items() if owner[fingerprint] != self.name)
+
+    def kept(self, owner: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """Stream the documents back, skipping those whose fingerprint another source owns."""
+        self._file.seek(0)
+        for _ in range(self.count):
+            doc = pickle.load(self._file)
+            if owner.get(job_fingerprint(doc), self.name) == self.name:
+                yield doc
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _fetch_source(source: IngestionSource, incremental: bool):
+    """Fetch and canonicalize one source into a SpooledDocuments; returns (spool, checkpoints)."""
+    checkpoints = load_checkpoints(source.name, source.queries) if incremental else None
+    spool = SpooledDocuments(source.name)
+    try:
+        for doc in iter_canonical_documents(source.fetch(checkpoints), source.name, source.normalizer):
+            spool.add(doc)
+    except BaseException:
+        spool.close()
+        raise
+    return spool, checkpoints
+
+
+def _write_source(
+    name: str,
+    docs: Iterable[Dict[str, Any]],
+    checkpoints: Optional[Dict[str, Checkpoint]],
+    mode: str,
+) -> Dict[str, Any]:
+    """Write one source's documents (any iterable, streamed in batches), then commit its
+    checkpoints; returns the write report."""
+    report = new_write_report()
+    if docs:
+        collection = get_mongo_collection()
+        write_documents(docs, collection, mode=mode, report=report,
+                        clusters=get_near_duplicate_index(collection))
+    if checkpoints is not None:
+        get_checkpoint_store().save(checkpoints.values())
+    return report
+
+
+@contextmanager
+def _closing_spools(spools: Dict[str, SpooledDocuments]):
+    """Close (and delete) every spooled source file when the run ends, however it ends."""
+    try:
+        yield spools
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+
+def run_all(
+    sources: Optional[List[str]] = None,
+    incremental: bool = True,
+    mode: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    progress: Optional[ProgressFn] = None,
+) -> Dict[str, Any]:
+    """
+    Ingest every registered source (or the named subset) concurrently.
+
+    A source that fails to fetch or write is reported with its error and keeps its old
+    checkpoints; the other sources are still written.
+
+    Args:
+        sources: Source names to run (see SOURCES); default all.
+        incremental: Use and advance per-query checkpoints (see checkpoints.py).
+        mode: "upsert" or "insert"; defaults to INGESTION_WRITE_MODE, else "insert".
+        max_workers: Sources fetched / written at the same time; defaults to
+                     INGESTION_MAX_SOURCES, else one worker per source.
+        progress: Optional callback(source, phase, source_report) called from worker
+                  threads as each source is "fetched", "written" or "failed".
+
+    Returns:
+        {"sources": {name: source report (see run_metrics.new_source_report)},
+        "totals": {...} (see run_metrics.run_totals), "wall_seconds": float,
+        "changed_ids": external_ids inserted or updated, for incremental re-indexing}
+    """
+    selected = SOURCES
+    if sources:
+        known = {source.name: source for source in SOURCES}
+        unknown = [name for name in sources if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown source(s) {unknown}; expected some of {list(known)}")
+        selected = [source for source in SOURCES if source.name in sources]
+    mode = get_write_mode(mode)
+    max_workers = max_workers or int(os.getenv("INGESTION_MAX_SOURCES", "0")) or len(selected)
+
+    started = time.monotonic()
+    reports = {source.name: new_source_report() for source in selected}
+    http_marks = {source.name: request_log.mark(source.name) for source in selected}
+    spools: Dict[str, SpooledDocuments] = {}
+    checkpoints_by_source: Dict[str, Optional[Dict[str, Checkpoint]]] = {}
+    changed_ids: List[str] = []
+
+    def timed(fn, *args):
+        t0 = time.monotonic()
+        return fn(*args), round(time.monotonic() - t0, 3)
+
+    def notify(name, phase):
+        if progress is not None:
+            progress(name, phase, dict(reports[name]))
+
+    # The pool is shut down (writes finished) before the spools are closed
+    with _closing_spools(spools), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(timed, _fetch_source, source, incremental): source.name
+                   for source in selected}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                (spool, checkpoints), seconds = future.result()
+            except Exception as e:
+                print(f"⚠️ {name} fetch failed: {e}")
+                reports[name]["error"] = f"fetch failed: {e}"
+                notify(name, "failed")
+                continue
+            spools[name] = spool
+            checkpoints_by_source[name] = checkpoints
+            reports[name]["fetched"] = spool.count
+            reports[name]["fetch_seconds"] = seconds
+            print(f"{name}: fetched {spool.count} postings in {seconds:.1f}s.")
+            notify(name, "fetched")
+
+        priority = [source.name for source in selected if source.name in spools]
+        owner = fingerprint_owners(
+            {name: spool.fingerprints for name, spool in spools.items()}, priority
+        )
+        writes = {}
+        for name in priority:
+            reports[name]["duplicates"] = spools[name].duplicates(owner)
+            kept = spools[name].count > reports[name]["duplicates"]
+            writes[name] = spools[name].kept(owner) if kept else []
+
+        futures = {
+            pool.submit(timed, _write_source, name, writes[name],
+                        checkpoints_by_source[name], mode): name
+            for name in priority
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                report, seconds = future.result()
+            except Exception as e:
+                print(f"⚠️ {name} write failed: {e}")
+                reports[name]["error"] = f"write failed: {e}"
+                notify(name, "failed")
+                continue
+            reports[name].update(
+                inserted=report["inserted"],
+                updated=report["updated"],
+                unchanged=report["unchanged"],
+                duplicate_keys=report["duplicate_keys"],
+                near_duplicates=report["near_duplicates"],
+                write_seconds=seconds,
+            )
+            changed_ids.extend(report["changed_ids"])
+            notify(name, "written")
+
+    for name, report in reports.items():
+        finish_source_report(report, name, http_marks[name])
+    totals = run_totals(reports)
+    wall_seconds = round(time.monotonic() - started, 3)
+    print(f"All sources: {totals['inserted']} inserted, {totals['updated']} updated, "
+          f"{totals['unchanged']} unchanged, {totals['duplicates']} cross-source duplicates "
+          f"in {wall_seconds:.1f}s.")
+    return {"sources": reports, "totals": totals, "wall_seconds": wall_seconds,
+            "changed_ids": changed_ids}
+
+
+if __name__ == "__main__":
+    result = run_all()
+    for name, report in result["sources"].items():
+        status = report["error"] or "ok"
+        http = report["http"]
+        print(f"  {name:<10} fetched={report['fetched']:<5} dup={report['duplicates']:<4} "
+              f"fetch={report['fetch_seconds']:.1f}s write={report['write_seconds']:.1f}s "
+              f"pages={http['pages']:<4} p90={http['p90_ms']}ms docs/s={report['docs_per_second']}  {status}")
@@ -0,0 +1,290 @@
+"""
+Query planner for TOP_JOBS fan-out: skip searches that past runs show are redundant.
+
+TOP_JOBS holds many near-synonyms ("Truck Driver", "CDL Driver", "Heavy Truck
+Driver", ...) and each one is a separate request per source, billed per query on
+SerpAPI, while much of what they return is the same postings. Every planned run
+records the raw ids each query returned; the next plan walks the queries (largest
+result sets first) and merges a query into the already-selected ones when at
+least min_coverage of its last results came back from them. A merged query is
+skipped, and its postings still arrive through the query that covers them.
+
+Coverage is re-learned: a query merged max_skips runs in a row runs again, and
+queries with no history (or fewer than min_results results) always run.
+
+Stored in the ingestion database (collection MONGO_QUERY_STATS_COLLECTION,
+default "ingestion_query_stats"), one document per (source, query):
+  _id: "{source}|{query}", source, query, result_ids, result_count, runs,
+  skipped_runs, merged_into, calls_saved, updated_at
+
+Env:
+- QUERY_PLANNER_SOURCES (optional) — sources that plan their queries, default "SerpAPI"; "" turns it off
+- QUERY_PLANNER_MIN_COVERAGE (optional) — fraction of a query's results that must be covered, default 0.9
+- QUERY_PLANNER_MAX_SKIPS (optional) — consecutive merged runs before a query runs again, default 3
+
+Run from project root (prints the plan for TOP_JOBS without fetching):
+  python -m backend.app.api.query_planner SerpAPI
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pymongo.collection import Collection
+
+try:
+    from backend.app.api.checkpoints import job_marker
+except ImportError:
+    from checkpoints import job_marker
+
+# Raw ids kept per query; enough to estimate overlap between titles
+QUERY_RESULT_WINDOW = 300
+
+DEFAULT_PLANNER_SOURCES = "SerpAPI"
+DEFAULT_MIN_COVERAGE = 0.9
+DEFAULT_MAX_SKIPS = 3
+# Queries that returned fewer results than this are never merged (too little evidence)
+DEFAULT_MIN_RESULTS = 5
+
+
+def planner_enabled(source: str) -> bool:
+    """True when source is listed in QUERY_PLANNER_SOURCES."""
+    names = os.getenv("QUERY_PLANNER_SOURCES", DEFAULT_PLANNER_SOURCES)
+    return source in {name.strip() for name in names.split(",")}
+
+
+class QueryStats:
+    """What one (source, query) returned the last time it ran."""
+
+    def __init__(
+        self,
+        source: str,
+        query: str,
+        result_ids: Optional[List[str]] = None,
+        runs: int = 0,
+        skipped_runs: int = 0,
+    ):
+        self.source = source
+        self.query = query
+        self.result_ids = list(result_ids or [])
+        self.ids: Set[str] = set(self.result_ids)
+        self.runs = runs
+        self.skipped_runs = skipped_runs
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}|{self.query}"
+
+
+class QueryPlan:
+    """
+    Queries to run this time, and the ones merged into them.
+
+    Args:
+        source: Source label.
+        queries: Every requested query, in the caller's order.
+        run: Queries to fetch (caller's order).
+        merged: Skipped query -> selected query that covers most of its results.
+        coverage: Skipped query -> fraction of its last results the selected queries returned.
+        calls_per_query: Requests one query costs (used for calls_saved).
+    """
+
+    def __init__(
+        self,
+        source: str,
+        queries: List[str],
+        run: List[str],
+        merged: Dict[str, str],
+        coverage: Dict[str, float],
+        calls_per_query: int = 1,
+    ):
+        self.source = source
+        self.queries = queries
+        self.run = run
+        self.merged = merged
+        self.coverage = coverage
+        self.calls_per_query = calls_per_query
+
+    @property
+    def calls_saved(self) -> int:
+        return len(self.merged) * self.calls_per_query
+
+    def summary(self) -> str:
+        return (f"{self.source} query plan: {len(self.run)} of {len(self.queries)} queries, "
+                f"{len(self.merged)} merged ({self.calls_saved} API call(s) saved).")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "queries": len(self.queries),
+            "run": self.run,
+            "merged": {
+                query: {"into": into, "coverage": round(self.coverage[query], 3)}
+                for query, into in self.merged.items()
+            },
+            "calls_saved": self.calls_saved,
+        }
+
+
+class QueryPlanner:
+    """
+    Greedy set cover over the result ids recorded for each query.
+
+    Args:
+        min_coverage: Merge a query when at least this fraction of its last results
+                      came back from queries already selected.
+        max_skips: Consecutive merged runs after which a query runs again to refresh its stats.
+        min_results: Queries with fewer recorded results always run.
+        calls_per_query: Requests one query costs (reported as calls saved).
+    """
+
+    def __init__(
+        self,
+        min_coverage: float = DEFAULT_MIN_COVERAGE,
+        max_skips: int = DEFAULT_MAX_SKIPS,
+        min_results: int = DEFAULT_MIN_RESULTS,
+        calls_per_query: int = 1,
+    ):
+        self.min_coverage = min_coverage
+        self.max_skips = max_skips
+        self.min_results = min_results
+        self.calls_per_query = calls_per_query
+
+    @classmethod
+    def from_env(cls, calls_per_query: int = 1) -> "QueryPlanner":
+        return cls(
+            min_coverage=float(os.getenv("QUERY_PLANNER_MIN_COVERAGE", str(DEFAULT_MIN_COVERAGE))),
+            max_skips=int(os.getenv("QUERY_PLANNER_MAX_SKIPS", str(DEFAULT_MAX_SKIPS))),
+            calls_per_query=calls_per_query,
+        )
+
+    def _must_run(self, stats: Optional[QueryStats]) -> bool:
+        return (
+            stats is None
+            or len(stats.ids) < self.min_results
+            or stats.skipped_runs >= self.max_skips
+        )
+
+    def plan(self, source: str, queries: Iterable[str], stats: Dict[str, QueryStats]) -> QueryPlan:
+        """
+        Decide which queries to run. Queries that must run are selected first, then the
+        rest from the largest recorded result set down, so broad titles absorb narrow ones.
+        """
+        queries = list(dict.fromkeys(queries))
+        forced = [query for query in queries if self._must_run(stats.get(query))]
+        optional = sorted(
+            (query for query in queries if query not in forced),
+            key=lambda query: -len(stats[query].ids),
+        )
+
+        selected: List[str] = []
+        covered: Set[str] = set()
+        merged: Dict[str, str] = {}
+        coverage: Dict[str, float] = {}
+        for query in forced:
+            selected.append(query)
+            if stats.get(query) is not None:
+                covered |= stats[query].ids
+        for query in optional:
+            ids = stats[query].ids
+            share = len(ids & covered) / len(ids)
+            if share >= self.min_coverage:
+                into = max(
+                    (other for other in selected if stats.get(other) is not None),
+                    key=lambda other: len(ids & stats[other].ids),
+                )
+                merged[query] = into
+                coverage[query] = share
+                continue
+            selected.append(query)
+            covered |= ids
+
+        run = [query for query in queries if query not in merged]
+        return QueryPlan(source, queries, run, merged, coverage, self.calls_per_query)
+
+
+class QueryStatsStore:
+    """Loads and records QueryStats in a Mongo collection (sync, like CheckpointStore)."""
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+
+    def load(self, source: str, queries: Iterable[str]) -> Dict[str, QueryStats]:
+        """Recorded stats for the queries of a source that have run before."""
+        keys = [f"{source}|{query}" for query in queries]
+        return {
+            doc["query"]: QueryStats(
+                source, doc["query"], doc.get("result_ids"),
+                doc.get("runs", 0), doc.get("skipped_runs", 0),
+            )
+            for doc in self.collection.find({"_id": {"$in": keys}})
+        }
+
+    def record(self, plan: QueryPlan, results: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        Save what each query that ran returned (raw jobs, before checkpoint filtering) and
+        count the merged ones. Queries that failed this run are left untouched.
+        Returns how many documents were written.
+        """
+        now = datetime.now(timezone.utc)
+        written = 0
+        for query in plan.run:
+            if query not in results:
+                continue
+            ids = []
+            for job in results[query]:
+                raw_id, _ = job_marker(plan.source, job)
+                if raw_id is not None:
+                    ids.append(raw_id)
+            ids = list(dict.fromkeys(ids))
+            self.collection.update_one(
+                {"_id": f"{plan.source}|{query}"},
+                {
+                    "$set": {
+                        "source": plan.source,
+                        "query": query,
+                        "result_ids": ids[:QUERY_RESULT_WINDOW],
+                        "result_count": len(ids),
+                        "skipped_runs": 0,
+                        "merged_into": None,
+                        "updated_at": now,
+                    },
+                    "$inc": {"runs": 1},
+                },
+                upsert=True,
+            )
+            written += 1
+        for query, into in plan.merged.items():
+            self.collection.update_one(
+                {"_id": f"{plan.source}|{query}"},
+                {
+                    "$set": {"merged_into": into, "updated_at": now},
+                    "$inc": {"skipped_runs": 1, "calls_saved": plan.calls_per_query},
+                },
+            )
+            written += 1
+        return written
+
+    def calls_saved(self, source: str) -> int:
+        """API calls the planner has saved for a source so far."""
+        return sum(doc.get("calls_saved", 0)
+                   for doc in self.collection.find({"source": source}, {"calls_saved": 1}))
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    try:
+        from backend.app.api.mongo_ingestion_utils import get_query_stats_store
+        from backend.app.api.top_jobs import TOP_JOBS
+    except ImportError:
+        from mongo_ingestion_utils import get_query_stats_store
+        from top_jobs import TOP_JOBS
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "SerpAPI"
+    store = get_query_stats_store()
+    plan = QueryPlanner.from_env().plan(source, TOP_JOBS, store.load(source, TOP_JOBS))
+    print(plan.summary())
+    print(json.dumps(plan.to_dict()["merged"], indent=2))
+    print(f"Saved so far: {store.calls_saved(source)} {source} API call(s).")
@@ -1,10 +1,13 @@
 """
 RemoteOK API → MongoDB ingestion.
 
-Fetches job postings from the RemoteOK API, normalizes them,
-and appends to a MongoDB collection. Uses shared data_ingestor and mongo_ingestion_utils.
+Downloads the RemoteOK feed once (it is a single full dump with no query
+parameters), routes every posting to each title in TOP_JOBS (top_jobs.py) its
+position matches in one pass, normalizes them, and appends to a MongoDB collection.
+Uses shared data_ingestor and mongo_ingestion_utils.
 
-Env: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION (optional).
+Env: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION (optional),
+REMOTEOK_FEED_TTL (optional, seconds the downloaded feed is reused, default 300).
 Data source label: "RemoteOK".
 
 Run from backend: python app/api/remoteok/remoteok_to_mongo.py
@@ -14,46 +17,99 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
-    from backend.app.api.remoteok.test_remoteok_api import test_remoteok_api, normalize_job_data
+    from backend.app.api.top_jobs import TOP_JOBS
 except ImportError:
-    from test_remoteok_api import test_remoteok_api, normalize_job_data
+    import sys
+    _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if _api_dir not in sys.path:
+        sys.path.insert(0, _api_dir)
+    from top_jobs import TOP_JOBS
+
+try:
+    from backend.app.api.remoteok.test_remoteok_api import (
+        fetch_remoteok_feed,
+        normalize_job_data,
+        route_remoteok_jobs,
+    )
+except ImportError:
+    from test_remoteok_api import fetch_remoteok_feed, normalize_job_data, route_remoteok_jobs
+
+
+SOURCE = "RemoteOK"
+
+
+def fetch_jobs(
+    job_titles: Optional[List[str]] = None,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    require_salary: bool = True,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Raw RemoteOK jobs for each title in TOP_JOBS (or given list) from one feed download,
+    deduped by id. With checkpoints, each title keeps only postings newer than its last run.
+    """
+    titles = job_titles or TOP_JOBS
+    routed = route_remoteok_jobs(
+        fetch_remoteok_feed(),
+        titles,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        require_salary=require_salary,
+    )
+    jobs: List[Dict[str, Any]] = []
+    seen = set()
+    for title in titles:
+        title_jobs = routed.get(title, [])
+        checkpoint = checkpoints.get(title) if checkpoints is not None else None
+        if checkpoint is not None:
+            title_jobs = checkpoint.filter_new(title_jobs)
+            checkpoint.advance(title_jobs)
+        for job in title_jobs:
+            if job.get('id') not in seen:
+                seen.add(job.get('id'))
+                jobs.append(job)
+    return jobs
 
 
 def run(
-    keywords: Optional[str] = "Software Engineer",
+    job_titles: Optional[List[str]] = None,
     salary_min: Optional[int] = None,
     salary_max: Optional[int] = None,
-    limit: Optional[int] = None,
     require_salary: bool = True,
+    incremental: bool = True,
 ) -> int:
-    """Fetch jobs from RemoteOK and insert into MongoDB. Returns count inserted."""
-    print("RemoteOK → MongoDB")
+    """Fetch jobs from RemoteOK for each title in TOP_JOBS (or given list) and insert into MongoDB.
+    Returns count inserted."""
+    titles = job_titles or TOP_JOBS
+    print("RemoteOK → MongoDB (Top Jobs)")
     print("=" * 50)
 
-    def fetch_jobs():
-        return test_remoteok_api(
-            keywords=keywords,
-            salary_min=salary_min,
-            salary_max=salary_max,
-            limit=limit,
-            require_salary=require_salary,
-        )
+    # Per-title checkpoints: only postings newer than the last successful run
+    checkpoints = load_checkpoints(SOURCE, titles) if incremental else None
 
-    jobs = fetch_jobs()
+    jobs = fetch_jobs(
+        job_titles=titles,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        require_salary=require_salary,
+        checkpoints=checkpoints,
+    )
     print(f"Retrieved {len(jobs)} job postings from RemoteOK.")
     count = run_ingestion(
-        source="RemoteOK",
+        source=SOURCE,
         normalizer=normalize_job_data,
         fetch_jobs=lambda: jobs,
+        checkpoints=checkpoints.values() if checkpoints is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
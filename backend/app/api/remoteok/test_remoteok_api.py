@@ -10,21 +10,29 @@ Coverage: Tech focused roles sourced from many ATS systems
 """
 
 import os
-import requests
+import httpx
 import json
 import csv
 import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 try:
-    from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.job_schema import export_canonical_to_csv, extract_salary
+    from backend.app.api.http_client import get_json
+    from backend.app.api.text_match import KeywordMatcher
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
-    from job_schema import export_canonical_to_csv
+    from job_schema import export_canonical_to_csv, extract_salary
+    from http_client import get_json
+    from text_match import KeywordMatcher
+
+REMOTEOK_API_URL = 'https://remoteok.com/api'
+# The feed is one multi-megabyte dump; reuse it (then revalidate with a conditional GET) for this long
+REMOTEOK_FEED_TTL = float(os.getenv('REMOTEOK_FEED_TTL', '300'))
 
 
 def extract_salary_from_job(job: Dict[str, Any]) -> tuple[Optional[int], Optional[int]]:
@@ -41,24 +49,11 @@ def extract_salary_from_job(job: Dict[str, Any]) -> tuple[Optional[int], Optiona
     if 'salary_min' in job and 'salary_max' in job:
         return (job.get('salary_min'), job.get('salary_max'))
     
-    # Try to extract from description
-    description = job.get('description', '')
-    salary_patterns = [
-        r'\$(\d+)k?\s*-\s*\$(\d+)k?',  # $70k-$110k or $70-$110
-        r'\$(\d{1,3}(?:,\d{3})*)\s*-\s*\$(\d{1,3}(?:,\d{3})*)',  # $70,000-$110,000
-        r'(\d+)k?\s*-\s*(\d+)k?\s*(?:USD|dollars|per year|annually)',  # 70k-110k USD
-    ]
-    for pattern in salary_patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
-        if match:
-            min_val = match.group(1).replace(',', '')
-            max_val = match.group(2).replace(',', '')
-            # Handle 'k' suffix
-            salary_min = int(min_val) * 1000 if 'k' in match.group(0).lower() else int(min_val)
-            salary_max = int(max_val) * 1000 if 'k' in match.group(0).lower() else int(max_val)
-            return (salary_min, salary_max)
-    
-    return (None, None)
+    # Try to extract from description (shared extractor, see job_schema.extract_salary)
+    salary_min, salary_max = extract_salary(job.get('description', ''))
+    if salary_min is None:
+        return (None, None)
+    return (int(salary_min), int(salary_max))
 
 
 def is_valid_location(location: str) -> bool:
@@ -94,6 +89,88 @@ def is_valid_location(location: str) -> bool:
     return False
 
 
+def fetch_remoteok_feed(cache_ttl: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Download (or reuse) the full Remote OK dump.
+
+    The parsed body is cached for cache_ttl seconds (default REMOTEOK_FEED_TTL), then
+    revalidated with If-None-Match / If-Modified-Since, so several searches in one run
+    share a single download. The returned dicts are shared; do not modify them.
+
+    Returns:
+        Job postings (metadata entries without a 'position' are dropped)
+    """
+    data = get_json("RemoteOK", REMOTEOK_API_URL,
+                    cache_ttl=REMOTEOK_FEED_TTL if cache_ttl is None else cache_ttl)
+    return [job for job in data if isinstance(job, dict) and 'position' in job]
+
+
+def passes_filters(job: Dict[str, Any],
+                   salary_min: Optional[int] = None,
+                   salary_max: Optional[int] = None,
+                   require_salary: bool = True) -> bool:
+    """
+    Location (US, LIKE US, or Remote) and salary filters for one posting.
+
+    require_salary excludes jobs without salary info; the range filter applies only
+    when both salary_min and salary_max are set.
+    """
+    if not is_valid_location(job.get('location') or ''):
+        return False
+    if require_salary:
+        job_salary_min, job_salary_max = extract_salary_from_job(job)
+        if job_salary_min is None or job_salary_max is None:
+            return False
+        if salary_min is not None and salary_max is not None:
+            if job_salary_max < salary_min or job_salary_min > salary_max:
+                return False
+    return True
+
+
+def iter_matching_jobs(feed: Iterable[Dict[str, Any]],
+                       matcher: KeywordMatcher,
+                       salary_min: Optional[int] = None,
+                       salary_max: Optional[int] = None,
+                       require_salary: bool = True) -> Iterator[Tuple[Dict[str, Any], Set[str]]]:
+    """
+    Single pass over the feed: yield (job, matched keywords) for every posting whose
+    position mentions at least one keyword and that passes passes_filters.
+    """
+    for job in feed:
+        matched = matcher.matches(job.get('position') or '')
+        if matched and passes_filters(job, salary_min, salary_max, require_salary):
+            yield job, matched
+
+
+def route_remoteok_jobs(feed: Iterable[Dict[str, Any]],
+                        keywords: Iterable[str],
+                        salary_min: Optional[int] = None,
+                        salary_max: Optional[int] = None,
+                        require_salary: bool = True,
+                        limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Route every posting in the feed to all keywords its position matches (whole words,
+    case-insensitive), in one pass with a precompiled multi-keyword matcher.
+
+    Args:
+        feed: Postings from fetch_remoteok_feed()
+        keywords: Job titles / search terms
+        salary_min, salary_max, require_salary: As in test_remoteok_api
+        limit: Optional cap on postings per keyword
+
+    Returns:
+        Dict of keyword -> matching postings (a posting can appear under several keywords)
+    """
+    keywords = list(keywords)
+    routed: Dict[str, List[Dict[str, Any]]] = {keyword: [] for keyword in keywords}
+    matcher = KeywordMatcher(keywords, whole_words=True)
+    for job, matched in iter_matching_jobs(feed, matcher, salary_min, salary_max, require_salary):
+        for keyword in matched:
+            if not limit or len(routed[keyword]) < limit:
+                routed[keyword].append(job)
+    return routed
+
+
 def test_remoteok_api(keywords: Optional[str] = None,
                       salary_min: Optional[int] = None,
                       salary_max: Optional[int] = None,
@@ -113,43 +190,14 @@ def test_remoteok_api(keywords: Optional[str] = None,
         List of job postings from Remote OK API (filtered by location and salary)
     """
     try:
-        response = requests.get('https://remoteok.com/api')
-        response.raise_for_status()
-        data = response.json()
+        feed = fetch_remoteok_feed()
         
-        # Filter by keywords, location, and optional salary range
+        # Keywords in position (plain substring match, as before); location and optional salary range
         search_term = (keywords or "Software Engineer").lower()
-        min_salary = salary_min
-        max_salary = salary_max
+        matcher = KeywordMatcher([search_term, 'software engineer'])
         
         filtered_jobs = []
-        for job in data:
-            # Skip invalid entries (Remote OK sometimes includes metadata)
-            if not isinstance(job, dict) or 'position' not in job:
-                continue
-            
-            # Filter by keywords in position or tags
-            position = job.get('position', '').lower()
-            tags = ' '.join(job.get('tags', [])).lower()
-            
-            if search_term not in position and 'software engineer' not in position:
-                continue
-            
-            # Filter by location (US, LIKE US, or Remote)
-            location = job.get('location', '')
-            if not is_valid_location(location):
-                continue
-            
-            # Filter by salary: require_salary excludes jobs without salary info; range filter only when both min/max set
-            if require_salary:
-                job_salary_min, job_salary_max = extract_salary_from_job(job)
-                if job_salary_min is None or job_salary_max is None:
-                    continue
-                
-                if min_salary is not None and max_salary is not None:
-                    if job_salary_max < min_salary or job_salary_min > max_salary:
-                        continue
-            
+        for job, _ in iter_matching_jobs(feed, matcher, salary_min, salary_max, require_salary):
             filtered_jobs.append(job)
             
             # Apply limit if specified
@@ -157,7 +205,7 @@ def test_remoteok_api(keywords: Optional[str] = None,
                 break
         
         return filtered_jobs
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Remote OK API: {error}')
         raise
 
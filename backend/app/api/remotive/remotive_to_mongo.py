@@ -14,13 +14,13 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.remotive.test_remotive_api import test_remotive_api, normalize_remotive_job
@@ -28,25 +28,58 @@ except ImportError:
     from test_remotive_api import test_remotive_api, normalize_remotive_job
 
 
+SOURCE = "Remotive"
+
+
+def checkpoint_query(
+    category: Optional[str] = "software-dev",
+    search: Optional[str] = "Software Engineer",
+) -> str:
+    """Checkpoint query key for a fetch configuration."""
+    return search or category or "all"
+
+
+def fetch_jobs(
+    category: Optional[str] = "software-dev",
+    search: Optional[str] = "Software Engineer",
+    limit: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch raw Remotive jobs; with a checkpoint, only postings newer than the last run."""
+    data = test_remotive_api(category=category, search=search, limit=limit)
+    jobs = data.get("jobs", [])
+    if checkpoint is not None:
+        jobs = checkpoint.filter_new(jobs)
+        checkpoint.advance(jobs)
+    return jobs
+
+
 def run(
     category: Optional[str] = "software-dev",
     search: Optional[str] = "Software Engineer",
     limit: Optional[int] = None,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from Remotive and insert into MongoDB. Returns count inserted."""
     print("Remotive → MongoDB")
     print("=" * 50)
 
-    def fetch_jobs():
-        data = test_remotive_api(category=category, search=search, limit=limit)
-        return data.get("jobs", [])
+    # Only postings newer than the last successful run for this query
+    query = checkpoint_query(category, search)
+    checkpoint = load_checkpoints(SOURCE, [query])[query] if incremental else None
 
-    jobs = fetch_jobs()
+    jobs = fetch_jobs(
+        category=category,
+        search=search,
+        limit=limit,
+        checkpoint=checkpoint,
+    )
     print(f"Retrieved {len(jobs)} job postings from Remotive.")
     count = run_ingestion(
-        source="Remotive",
+        source=SOURCE,
         normalizer=normalize_remotive_job,
         fetch_jobs=lambda: jobs,
+        checkpoints=[checkpoint] if checkpoint is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
@@ -8,7 +8,7 @@ Auth: None
 Coverage: Remote jobs aggregated from multiple ATS job boards
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -18,12 +18,14 @@ from typing import Dict, Any, List, Optional
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import get_json
 
 
 def test_remotive_api(category: Optional[str] = None, 
@@ -49,9 +51,7 @@ def test_remotive_api(category: Optional[str] = None,
         if limit:
             params['limit'] = limit
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json("Remotive", url, params=params)
         
         # Post-process to filter by job title
         if 'jobs' in data:
@@ -67,7 +67,7 @@ def test_remotive_api(category: Optional[str] = None,
             data['jobs'] = filtered_jobs
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Remotive API: {error}')
         raise
 
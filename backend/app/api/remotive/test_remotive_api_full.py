@@ -10,7 +10,7 @@ Auth: None
 Coverage: Remote jobs aggregated from multiple ATS job boards
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -20,12 +20,14 @@ from typing import Dict, Any, List, Optional
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import get_json
 
 
 def fetch_all_remotive_jobs(category: Optional[str] = None, 
@@ -58,15 +60,13 @@ def fetch_all_remotive_jobs(category: Optional[str] = None,
         if params:
             print(f"Filters: {params}")
         
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json("Remotive", url, params=params)
         
         total_jobs = len(data.get('jobs', []))
         print(f"✓ Successfully retrieved {total_jobs} total active job postings")
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling Remotive API: {error}')
         raise
 
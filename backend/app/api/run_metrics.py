@@ -0,0 +1,117 @@
+"""
+Per-source ingestion run metrics and their ingestion_runs record.
+
+Every source in a run gets one report (new_source_report):
+- fetched: postings the source returned; duplicates: dropped as cross-source duplicates;
+  kept: fetched - duplicates (what was handed to the writer)
+- inserted / updated / unchanged, duplicate_keys (unchanged because the unique index
+  rejected them) and near_duplicates, from the write report
+- fetch_seconds / write_seconds and docs_per_second (kept postings per second of the two)
+- http: requests, pages, retries, failed_requests and latency percentiles from
+  http_client.request_log, for this run only
+- error: why the source failed, or None
+
+orchestrator.run_all() returns these reports. Job-manager runs are stored in ingestion_runs
+(result.sources) and exported on GET /metrics (backend/services/ingestion_metrics.py);
+standalone *_to_mongo script runs record themselves with record_run() (trigger "script").
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    from backend.app.api.http_client import request_log
+    from backend.app.api.mongo_ingestion_utils import get_mongo_collection
+except ImportError:
+    from http_client import request_log
+    from mongo_ingestion_utils import get_mongo_collection
+
+# Same collection the ingestion job manager writes (PROD_DB.ingestion_runs)
+INGESTION_RUNS_COLLECTION = "ingestion_runs"
+
+# Summed into a run's totals
+TOTAL_KEYS = ("fetched", "duplicates", "kept", "inserted", "updated", "unchanged",
+              "duplicate_keys", "near_duplicates")
+
+
+def new_source_report() -> Dict[str, Any]:
+    return {
+        "fetched": 0,
+        "duplicates": 0,
+        "kept": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "duplicate_keys": 0,
+        "near_duplicates": 0,
+        "fetch_seconds": 0.0,
+        "write_seconds": 0.0,
+        "docs_per_second": None,
+        "http": None,
+        "error": None,
+    }
+
+
+def finish_source_report(report: Dict[str, Any], source: str,
+                         http_mark: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Fill kept, docs_per_second and http (request_log since http_mark) in place."""
+    report["kept"] = report["fetched"] - report["duplicates"]
+    seconds = report["fetch_seconds"] + report["write_seconds"]
+    report["docs_per_second"] = round(report["kept"] / seconds, 1) if seconds else None
+    report["http"] = request_log.summary(source, http_mark)
+    return report
+
+
+def run_totals(reports: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts summed over sources, plus pages, failed_requests and failed_sources."""
+    totals = {key: sum(report[key] for report in reports.values()) for key in TOTAL_KEYS}
+    http = [report["http"] for report in reports.values() if report["http"]]
+    totals["pages"] = sum(summary["pages"] for summary in http)
+    totals["failed_requests"] = sum(summary["failed_requests"] for summary in http)
+    totals["failed_sources"] = sum(1 for report in reports.values() if report["error"])
+    return totals
+
+
+def record_run(
+    reports: Dict[str, Dict[str, Any]],
+    started_at: datetime,
+    trigger: str = "script",
+    wall_seconds: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Store a run outside the job manager in ingestion_runs, in the same shape
+    (status, succeeded_sources, result.sources / totals), so it shows up in
+    GET /ingestion/runs and counts as the sources' last successful run.
+
+    Returns:
+        The run id, or None if it could not be recorded (the run itself is not affected).
+    """
+    sources: List[str] = list(reports)
+    succeeded = [name for name, report in reports.items() if not report["error"]]
+    finished_at = datetime.now(timezone.utc)
+    if wall_seconds is None:
+        wall_seconds = round((finished_at - started_at).total_seconds(), 3)
+    if not succeeded:
+        status = "failed"
+    else:
+        status = "succeeded" if len(succeeded) == len(sources) else "partial"
+    run_id = uuid.uuid4().hex
+    try:
+        runs = get_mongo_collection().database[INGESTION_RUNS_COLLECTION]
+        runs.insert_one({
+            "_id": run_id,
+            "sources": sources,
+            "trigger": trigger,
+            "status": status,
+            "succeeded_sources": succeeded,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "duration_seconds": wall_seconds,
+            "result": {"sources": reports, "totals": run_totals(reports), "wall_seconds": wall_seconds},
+            "error": None,
+        })
+    except Exception as e:
+        print(f"⚠️ Could not record ingestion run: {e}")
+        return None
+    return run_id
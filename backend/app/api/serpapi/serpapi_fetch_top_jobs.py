@@ -1,44 +1,67 @@
 """
 SerpAPI (Google Jobs): fetch all jobs for a list of job titles.
 
-Core utility (non-test) that loops over job_titles, calls the SerpAPI Google Jobs API per query,
-aggregates results and dedupes by a stable id. No default job list; callers pass job_titles
-(e.g. from top_jobs.TOP_JOBS).
+Core utility (non-test) that fans out over job_titles through the shared async HTTP
+layer (http_client), aggregates results and dedupes by a stable id. No default job list;
+callers pass job_titles (e.g. from top_jobs.TOP_JOBS).
 """
 
-from typing import List, Dict, Any
+import asyncio
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Any, Optional
 
 try:
-    from backend.app.api.serpapi.test_serp_api import test_serpapi_google_jobs
+    from backend.app.api.serpapi.test_serp_api import fetch_serpapi_page
+    from backend.app.api.http_client import (
+        HttpSession, iter_completed, open_session, run_sync, stream_sync,
+    )
+    from backend.app.api.checkpoints import Checkpoint
 except ImportError:
-    from test_serp_api import test_serpapi_google_jobs
+    from test_serp_api import fetch_serpapi_page
+    from http_client import HttpSession, iter_completed, open_session, run_sync, stream_sync
+    from checkpoints import Checkpoint
 
+# Called with (query, raw jobs) for every query that returned, before checkpoint filtering
+QueryResultFn = Callable[[str, List[Dict[str, Any]]], None]
 
-def fetch_all_top_jobs(
+
+async def fetch_all_top_jobs_async(
     job_titles: List[str],
     location: str = "United States",
     num: int = 100,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+    on_query: Optional[QueryResultFn] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch jobs from SerpAPI Google Jobs for each title in job_titles and dedupe by stable id.
-
-    Args:
-        job_titles: List of job title/query strings (no default; from top_jobs.TOP_JOBS).
-        location: Location string for the search (default "United States").
-        num: Number of results per query (default 100).
-
-    Returns:
-        Combined, deduplicated list of raw SerpAPI job dicts.
+    Async version of fetch_all_top_jobs: one concurrent query per title,
+    paced by the session's SerpAPI rate limit and concurrency bound.
     """
+    checkpoints = checkpoints or {}
+    async with open_session(session) as http:
+        responses = await asyncio.gather(
+            *(
+                fetch_serpapi_page(http, query=query, location=location, num=num)
+                for query in job_titles
+            ),
+            return_exceptions=True,
+        )
+
     all_jobs: List[Dict[str, Any]] = []
     seen_ids: set = set()
 
-    for query in job_titles:
-        try:
-            result = test_serpapi_google_jobs(query=query, location=location, num=num)
-        except Exception:
+    # Merge in request order so the output matches the sequential loop
+    for query, result in zip(job_titles, responses):
+        if isinstance(result, BaseException):
+            # Retries / circuit breaking already happened in the HTTP layer
+            print(f"⚠️ Skipping SerpAPI '{query}': {result}")
             continue
         jobs = result.get("jobs_results", [])
+        if on_query is not None:
+            on_query(query, jobs)
+        checkpoint = checkpoints.get(query)
+        if checkpoint is not None:
+            jobs = checkpoint.filter_new(jobs)
+            checkpoint.advance(jobs)
         for job in jobs:
             job_id = job.get("job_id") or (
                 (job.get("title") or "") + "|" + (job.get("company_name") or "")
@@ -48,3 +71,85 @@ def fetch_all_top_jobs(
                 all_jobs.append(job)
 
     return all_jobs
+
+
+def fetch_all_top_jobs(
+    job_titles: List[str],
+    location: str = "United States",
+    num: int = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+    on_query: Optional[QueryResultFn] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch jobs from SerpAPI Google Jobs for each title in job_titles and dedupe by stable id.
+
+    Args:
+        job_titles: List of job title/query strings (no default; from top_jobs.TOP_JOBS).
+        location: Location string for the search (default "United States").
+        num: Number of results per query (default 100).
+        checkpoints: Optional query -> Checkpoint; postings already ingested for a
+                     query (by job_id) are dropped and the checkpoint advanced.
+        on_query: Optional callback(query, raw jobs) per successful query, e.g. to
+                  record results for the query planner (query_planner.py).
+
+    Returns:
+        Combined, deduplicated list of raw SerpAPI job dicts.
+    """
+    return run_sync(fetch_all_top_jobs_async(
+        job_titles, location=location, num=num, checkpoints=checkpoints, on_query=on_query,
+    ))
+
+
+async def iter_all_top_jobs_async(
+    job_titles: List[str],
+    location: str = "United States",
+    num: int = 100,
+    session: Optional[HttpSession] = None,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+    on_query: Optional[QueryResultFn] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming version of fetch_all_top_jobs_async: yields deduplicated jobs query by
+    query as each request finishes (completion order, not query order).
+    """
+    checkpoints = checkpoints or {}
+    seen_ids: set = set()
+    async with open_session(session) as http:
+        queries = iter_completed(
+            job_titles,
+            lambda query: fetch_serpapi_page(http, query=query, location=location, num=num),
+        )
+        async for query, result in queries:
+            if isinstance(result, BaseException):
+                print(f"⚠️ Skipping SerpAPI '{query}': {result}")
+                continue
+            jobs = result.get("jobs_results", [])
+            if on_query is not None:
+                on_query(query, jobs)
+            checkpoint = checkpoints.get(query)
+            if checkpoint is not None:
+                jobs = checkpoint.filter_new(jobs)
+                checkpoint.advance(jobs)
+            for job in jobs:
+                job_id = job.get("job_id") or (
+                    (job.get("title") or "") + "|" + (job.get("company_name") or "")
+                )
+                if job_id not in seen_ids:
+                    seen_ids.add(job_id)
+                    yield job
+
+
+def iter_all_top_jobs(
+    job_titles: List[str],
+    location: str = "United States",
+    num: int = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+    on_query: Optional[QueryResultFn] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Same jobs as fetch_all_top_jobs, streamed while the fetch is still running
+    (see http_client.stream_sync); feed it to run_ingestion for batched inserts.
+    """
+    return stream_sync(iter_all_top_jobs_async(
+        job_titles, location=location, num=num, checkpoints=checkpoints, on_query=on_query,
+    ))
@@ -4,7 +4,8 @@ SerpAPI (Google Jobs) → MongoDB ingestion.
 Fetches job postings from SerpAPI Google Jobs for the same TOP_JOBS list as Adzuna,
 normalizes them, and appends to a MongoDB collection. Uses shared data_ingestor and mongo_ingestion_utils.
 
-Env: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION (optional), SERPAPI_API_KEY.
+Env: MONGODB_CONNECT_STRING, PROD_DB, MONGO_JOBS_COLLECTION (optional), SERPAPI_API_KEY,
+QUERY_PLANNER_* (optional, see query_planner.py).
 Data source label: "SerpAPI".
 
 Run from backend dir (use venv Python so dotenv/packages are available):
@@ -14,21 +15,25 @@ Run from project root:  python backend\\app\\api\\serpapi\\serpapi_to_mongo.py
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import (
+        Checkpoint, load_checkpoints, plan_queries, record_query_results, run_ingestion,
+    )
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import (
+        Checkpoint, load_checkpoints, plan_queries, record_query_results, run_ingestion,
+    )
 
 try:
-    from backend.app.api.serpapi.serpapi_fetch_top_jobs import fetch_all_top_jobs
+    from backend.app.api.serpapi.serpapi_fetch_top_jobs import iter_all_top_jobs
 except ImportError:
-    from serpapi_fetch_top_jobs import fetch_all_top_jobs
+    from serpapi_fetch_top_jobs import iter_all_top_jobs
 
 try:
     from backend.app.api.serpapi.test_serp_api import normalize_serpapi_job
@@ -45,21 +50,52 @@ except ImportError:
     from top_jobs import TOP_JOBS
 
 
+SOURCE = "SerpAPI"
+
+
+def fetch_jobs(
+    job_titles: Optional[List[str]] = None,
+    location: str = "United States",
+    num: int = 100,
+    checkpoints: Optional[Dict[str, Checkpoint]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw SerpAPI jobs for each title in TOP_JOBS (or given list), deduped.
+    Titles whose recent results other titles already return are skipped (each one is a
+    billed search; see query_planner.py), and this run's results are recorded.
+    """
+    plan = plan_queries(SOURCE, job_titles or TOP_JOBS)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    yield from iter_all_top_jobs(
+        job_titles=plan.run,
+        location=location,
+        num=num,
+        checkpoints=checkpoints,
+        on_query=results.__setitem__,
+    )
+    record_query_results(plan, results)
+
+
 def run(
     job_titles: Optional[List[str]] = None,
     location: str = "United States",
     num: int = 100,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from SerpAPI for each title in TOP_JOBS (or given list), dedupe, and insert into MongoDB."""
     titles = job_titles or TOP_JOBS
     print("SerpAPI (Google Jobs) → MongoDB (Top Jobs)")
     print("=" * 50)
-    all_jobs = fetch_all_top_jobs(job_titles=titles, location=location, num=num)
-    print(f"Retrieved {len(all_jobs)} unique job postings from SerpAPI.")
+    # Per-title checkpoints: only postings newer than the last successful run
+    checkpoints = load_checkpoints(SOURCE, titles) if incremental else None
+    # Streams jobs while titles are still being fetched; inserted in batches
     count = run_ingestion(
-        source="SerpAPI",
+        source=SOURCE,
         normalizer=normalize_serpapi_job,
-        fetch_jobs=lambda: all_jobs,
+        fetch_jobs=lambda: fetch_jobs(
+            job_titles=titles, location=location, num=num, checkpoints=checkpoints,
+        ),
+        checkpoints=checkpoints.values() if checkpoints is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
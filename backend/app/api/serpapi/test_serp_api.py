@@ -7,51 +7,15 @@ Type: Job search API (aggregates Google Jobs results)
 Auth: API key required
 Coverage: Google Jobs search results from various sources
 
-Note: Requires the google-search-results package
-Install with: pip install google-search-results
+Requests go straight to the search.json endpoint through the shared async HTTP
+layer (http_client); no SerpAPI client package is needed.
 """
 
-import os
-import sys
-
-# This file lives under a folder named 'serpapi', which shadows the pip package.
-# Prefer site-packages so "from serpapi import GoogleSearch" gets the real package.
-_this_dir = os.path.dirname(os.path.abspath(__file__))
-_parent_dir = os.path.dirname(_this_dir)
-_n = lambda p: os.path.normcase(os.path.abspath(p))
-_removed = []
-for path in (_parent_dir, _this_dir):
-    path_n = _n(path)
-    for i, p in enumerate(sys.path):
-        if _n(p) == path_n:
-            sys.path.pop(i)
-            _removed.append(path)
-            break
-# Ensure site-packages is searched before any remaining path that could shadow
-_site_packages = getattr(sys, "path", [])
-_site_packages = [p for p in sys.path if "site-packages" in _n(p)]
-if _site_packages:
-    for p in _site_packages:
-        if p in sys.path:
-            sys.path.remove(p)
-    for p in reversed(_site_packages):
-        sys.path.insert(0, p)
-try:
-    from serpapi import GoogleSearch
-except ImportError:
-    for p in reversed(_removed):
-        sys.path.insert(0, p)
-    print("Error: serpapi library not found.")
-    print("Install in this environment with:")
-    print("  .\\venv\\Scripts\\python.exe -m pip install google-search-results")
-    raise
-for p in reversed(_removed):
-    sys.path.insert(0, p)
-
 import json
 import csv
 import os
 import re
+import sys
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
@@ -67,15 +31,16 @@ SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
     from backend.app.api.top_jobs import TOP_JOBS
-    from backend.app.api.serpapi.serpapi_fetch_top_jobs import fetch_all_top_jobs
+    from backend.app.api.http_client import HttpSession, run_with_session
 except ImportError:
-    import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
     from top_jobs import TOP_JOBS
-    from serpapi_fetch_top_jobs import fetch_all_top_jobs
+    from http_client import HttpSession, run_with_session
+
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
 
 
 def test_serpapi_google_jobs(query: str = "Software Engineer",
@@ -100,6 +65,28 @@ def test_serpapi_google_jobs(query: str = "Software Engineer",
     Raises:
         ValueError: If api_key is not provided
     """
+    return run_with_session(
+        lambda session: fetch_serpapi_page(
+            session,
+            query=query,
+            location=location,
+            api_key=api_key,
+            num=num,
+            next_page_token=next_page_token,
+        )
+    )
+
+
+async def fetch_serpapi_page(session: HttpSession,
+                             query: str = "Software Engineer",
+                             location: str = "United States",
+                             api_key: Optional[str] = None,
+                             num: int = 100,
+                             next_page_token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async SerpAPI call through the shared HttpSession (same arguments and result as
+    test_serpapi_google_jobs).
+    """
     try:
         # Use provided API key or default
         api_key_value = api_key or SERPAPI_API_KEY
@@ -128,8 +115,7 @@ def test_serpapi_google_jobs(query: str = "Software Engineer",
             params["next_page_token"] = next_page_token
         
         # Perform the search
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = await session.get_json("SerpAPI", SERPAPI_SEARCH_URL, params=params)
         
         # Debug: Check what we got back
         if "error" in results:
@@ -295,6 +281,12 @@ def export_to_csv(jobs: List[Dict[str, Any]], filename: Optional[str] = None) ->
 
 
 if __name__ == "__main__":
+    # Imported here: serpapi_fetch_top_jobs imports this module
+    try:
+        from backend.app.api.serpapi.serpapi_fetch_top_jobs import fetch_all_top_jobs
+    except ImportError:
+        from serpapi_fetch_top_jobs import fetch_all_top_jobs
+
     # Same flow as serpapi_to_mongo: TOP_JOBS, fetch_all_top_jobs, then export to CSV
     try:
         print("SerpAPI Google Jobs - TOP_JOBS (same as serpapi_to_mongo)")
@@ -0,0 +1,253 @@
+"""
+Dictionary-driven skill extraction for job postings.
+
+Most sources send no structured skills, or only categories (USAJobs JobCategory,
+Muse categories, Adzuna tags), so skills_required is often empty and skill-gap
+matching has nothing to compare. At ingestion, to_canonical_document scans the
+title and description of every posting for the curated SKILL_VOCABULARY and adds
+what it finds to skills_required, under the vocabulary's canonical names.
+
+All aliases are compiled once per process into one Aho-Corasick automaton
+(text_match.KeywordMatcher, whole words, case-insensitive), so a description is
+scanned in a single pass however large the vocabulary grows.
+
+Env:
+- INGESTION_SKILL_EXTRACTION (optional) — "false" to keep only the skills the source sends
+
+Benchmark (fixture or snapshot data):
+  python -m backend.benchmarks.bench_skills
+"""
+
+import os
+from typing import Dict, List, Optional
+
+try:
+    from backend.app.api.text_match import KeywordMatcher, normalize_keyword
+except ImportError:
+    from text_match import KeywordMatcher, normalize_keyword
+
+# Canonical skill name -> aliases found in postings (the canonical name always matches).
+# Keep names and aliases unambiguous as whole words: no "go", "r", "c", "swift" or "spring",
+# which are ordinary words or letters in most postings.
+SKILL_VOCABULARY: Dict[str, List[str]] = {
+    # Software
+    "Python": [],
+    "Java": [],
+    "JavaScript": ["javascript", "ecmascript"],
+    "TypeScript": [],
+    "C++": ["cpp"],
+    "C#": ["c sharp"],
+    ".NET": ["dotnet", "asp.net"],
+    "Golang": [],
+    "Rust": [],
+    "Ruby": ["ruby on rails"],
+    "PHP": [],
+    "Kotlin": [],
+    "Scala": [],
+    "SQL": ["t-sql", "pl/sql"],
+    "PostgreSQL": ["postgres"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "NoSQL": [],
+    "React": ["react.js", "reactjs"],
+    "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Node.js": ["nodejs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring framework"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "REST APIs": ["rest api", "restful", "rest apis"],
+    "GraphQL": [],
+    "Microservices": ["microservice"],
+    "Git": ["github", "gitlab"],
+    "Linux": ["unix"],
+    "Bash": ["shell scripting"],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "CI/CD": ["continuous integration", "jenkins", "github actions"],
+    "DevOps": [],
+    "Agile": ["scrum", "kanban"],
+    "Unit Testing": ["unit tests", "test automation", "pytest", "junit"],
+    "Networking": ["tcp/ip", "dns", "network administration"],
+    # Data and AI
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["neural networks"],
+    "Artificial Intelligence": ["ai"],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "LLMs": ["llm", "large language models", "generative ai", "genai"],
+    "PyTorch": [],
+    "TensorFlow": ["keras"],
+    "scikit-learn": ["sklearn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Kafka": ["apache kafka"],
+    "Airflow": ["apache airflow"],
+    "ETL": ["data pipelines", "data pipeline"],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": [],
+    "Statistics": ["statistical analysis", "statistical modeling"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel", "spreadsheets"],
+    "Snowflake": [],
+    "Databricks": [],
+    "Operations Research": ["linear programming", "mathematical optimization"],
+    "Simulation": [],
+    # Security
+    "Cybersecurity": ["cyber security", "information security", "infosec"],
+    "SIEM": ["splunk"],
+    "Incident Response": [],
+    "Penetration Testing": ["pen testing", "pentesting"],
+    "Vulnerability Management": ["vulnerability assessment"],
+    "Firewalls": ["firewall"],
+    "NIST": [],
+    "Security+": ["comptia security+"],
+    "CISSP": [],
+    "Security Clearance": ["secret clearance", "top secret", "ts/sci"],
+    # Healthcare
+    "Patient Care": [],
+    "BLS": ["basic life support"],
+    "ACLS": [],
+    "CPR": [],
+    "First Aid": [],
+    "EMR": ["ehr", "electronic medical records", "electronic health records", "epic ehr"],
+    "Medication Administration": [],
+    "Vital Signs": [],
+    "Phlebotomy": [],
+    "Wound Care": [],
+    "Registered Nurse License": ["rn license", "rn licensure"],
+    "HIPAA": [],
+    "Home Health": ["home care"],
+    "Rehabilitation": ["rehab"],
+    # Transportation and logistics
+    "CDL Class A": ["class a cdl", "cdl-a", "cdl a"],
+    "CDL Class B": ["class b cdl", "cdl-b", "cdl b"],
+    "CDL": ["commercial driver's license", "commercial drivers license"],
+    "DOT Regulations": ["dot compliance", "fmcsa"],
+    "Hazmat": ["hazmat endorsement"],
+    "Forklift": ["forklift certification"],
+    "Clean Driving Record": ["clean driving record", "clean mvr"],
+    "Route Planning": [],
+    "Logistics": [],
+    "Supply Chain": ["supply chain management"],
+    "Inventory Management": ["inventory control"],
+    "Warehouse Operations": ["warehousing"],
+    "Procurement": ["purchasing"],
+    "ERP": ["sap", "oracle erp"],
+    # Trades and field service
+    "Electrical Wiring": ["wiring"],
+    "National Electrical Code": ["nec"],
+    "Journeyman License": ["journeyman electrician", "journeyman license"],
+    "HVAC": [],
+    "PLC": ["plcs", "programmable logic controllers"],
+    "Blueprint Reading": ["blueprints", "schematics"],
+    "Troubleshooting": [],
+    "Preventive Maintenance": ["preventative maintenance"],
+    "OSHA": ["osha 10", "osha 30"],
+    "Welding": [],
+    "Solar Installation": ["photovoltaic", "pv systems", "solar panels"],
+    "Wind Turbines": ["wind turbine"],
+    "Tower Climbing": ["climbing certification"],
+    "AutoCAD": ["cad"],
+    # Business, sales and service
+    "Sales": [],
+    "B2B Sales": ["b2b"],
+    "Account Management": [],
+    "Lead Generation": ["prospecting", "cold calling"],
+    "Negotiation": [],
+    "CRM": [],
+    "Salesforce": [],
+    "HubSpot": [],
+    "Customer Service": ["customer support", "client service"],
+    "Call Center": ["contact center"],
+    "Project Management": ["pmp"],
+    "Budgeting": ["budget management"],
+    "Financial Analysis": ["financial modeling", "fp&a"],
+    "Forecasting": [],
+    "Accounting": ["gaap"],
+    "Risk Management": [],
+    "Compliance": ["regulatory compliance"],
+    "Insurance Licensing": ["insurance license", "property and casualty", "p&c license"],
+    "Microsoft Office": ["ms office", "microsoft 365", "office 365"],
+    "Scheduling": [],
+    "Leadership": ["team leadership", "people management"],
+    "Communication": ["communication skills"],
+    "Bilingual": ["bilingual spanish"],
+    # Education
+    "Teaching Certificate": ["teaching license", "teacher certification", "teaching credential"],
+    "Lesson Planning": ["lesson plans"],
+    "Classroom Management": [],
+    "Curriculum Development": ["curriculum design"],
+    "Special Education": ["iep", "ieps"],
+}
+
+_matcher: Optional[KeywordMatcher] = None
+_canonical: Dict[str, str] = {}
+
+
+def skill_extraction_enabled() -> bool:
+    """True unless INGESTION_SKILL_EXTRACTION is "false"."""
+    return os.getenv("INGESTION_SKILL_EXTRACTION", "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_skill_matcher() -> KeywordMatcher:
+    """The process-wide automaton over every SKILL_VOCABULARY alias (built on first use)."""
+    global _matcher
+    if _matcher is None:
+        canonical = {}
+        for name, aliases in SKILL_VOCABULARY.items():
+            for alias in [name, *aliases]:
+                canonical.setdefault(normalize_keyword(alias), name)
+        _canonical.update(canonical)
+        _matcher = KeywordMatcher(canonical, whole_words=True)
+    return _matcher
+
+
+def canonical_skill(skill: str) -> Optional[str]:
+    """Vocabulary name for a skill or alias ("k8s" -> "Kubernetes"), None if unknown."""
+    get_skill_matcher()
+    return _canonical.get(normalize_keyword(skill))
+
+
+def extract_skills(text: str) -> List[str]:
+    """
+    Canonical names of the vocabulary skills mentioned in text, in order of first mention.
+    Overlapping matches resolve to the longest ("Class A CDL" is CDL Class A, not also CDL).
+    """
+    matches = sorted(get_skill_matcher().finditer(text or ""), key=lambda m: (m[0], m[0] - m[1]))
+    found: List[str] = []
+    covered = 0
+    for start, end, pattern in matches:
+        if start < covered:
+            continue
+        covered = end
+        name = _canonical[pattern]
+        if name not in found:
+            found.append(name)
+    return found
+
+
+def merge_skills(skills: List[str], text: str) -> List[str]:
+    """
+    Source skills (known ones renamed to their canonical name) followed by the skills
+    extracted from text that are not already listed. Case-insensitive dedupe.
+    """
+    merged: List[str] = []
+    seen = set()
+    for skill in [*(canonical_skill(s) or s for s in skills), *extract_skills(text)]:
+        key = skill.lower()
+        if key not in seen:
+            seen.add(key)
+            merged.append(skill)
+    return merged
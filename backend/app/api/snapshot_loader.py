@@ -0,0 +1,227 @@
+"""
+Bulk offline loader: captured CSV / JSON snapshots -> MongoDB.
+
+Parses every snapshot file under the given paths (default: backend/app/api/*/csv/
+and backend/app/ml/data/) in parallel worker processes, maps each posting to the
+canonical schema, and bulk-loads the documents into a target database with
+unordered batched writes (write_documents) while the remaining files are still
+being parsed. No network calls; use it to seed staging and benchmark databases
+with realistic data.
+
+Recognized files:
+- normalizer-output CSVs (Company, Position, ..., ID) written by the test_* scripts;
+  the source comes from the folder (adzuna/csv/...) or the file name prefix (adzuna_top25_...)
+- canonical exports (external_id, ..., source_platform) as .csv, .csv.gz or .parquet
+- JSON lists of raw API jobs (e.g. serpapi/csv/*.json), mapped with the source's normalizer
+Anything else (e.g. user exports in ml/data) is skipped.
+
+Env: MONGODB_CONNECT_STRING, plus PROD_DB / MONGO_JOBS_COLLECTION unless --db / --collection
+are given. Near-duplicate clustering follows INGESTION_DEDUPE (see near_duplicates.py).
+
+Run from project root:
+  python -m backend.app.api.snapshot_loader
+  python -m backend.app.api.snapshot_loader backend/app/api/adzuna/csv --db aijobhunt_staging --workers 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from backend.app.api.job_schema import canonical_record_to_document, iter_export_rows, to_canonical_document
+    from backend.app.api.mongo_ingestion_utils import (
+        WRITE_MODES,
+        get_mongo_collection,
+        get_near_duplicate_index,
+        get_write_mode,
+        new_write_report,
+        write_documents,
+    )
+except ImportError:
+    from job_schema import canonical_record_to_document, iter_export_rows, to_canonical_document
+    from mongo_ingestion_utils import (
+        WRITE_MODES,
+        get_mongo_collection,
+        get_near_duplicate_index,
+        get_write_mode,
+        new_write_report,
+        write_documents,
+    )
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_PATHS = sorted(glob.glob(os.path.join(API_DIR, "*", "csv"))) + [
+    os.path.join(API_DIR, "..", "ml", "data"),
+]
+SNAPSHOT_EXTENSIONS = (".csv", ".csv.gz", ".parquet", ".json")
+
+# Folder or file name prefix -> source label used by the ingestion scripts
+SNAPSHOT_SOURCES: Dict[str, str] = {
+    "adzuna": "Adzuna",
+    "arbeitnow": "Arbeitnow",
+    "jobicy": "Jobicy",
+    "muse": "The Muse",
+    "remoteok": "RemoteOK",
+    "remotive": "Remotive",
+    "serpapi": "SerpAPI",
+    "usajobs": "USAJobs",
+}
+
+# Keys under which API responses hold their job list
+_JOB_LIST_KEYS = ("jobs_results", "results", "jobs", "data")
+
+
+def find_snapshot_files(paths: Iterable[str]) -> List[str]:
+    """Snapshot files under paths (files are taken as given, directories are walked)."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(os.path.abspath(path))
+            continue
+        for root, _, names in os.walk(path):
+            files.extend(
+                os.path.abspath(os.path.join(root, name))
+                for name in names if name.endswith(SNAPSHOT_EXTENSIONS)
+            )
+    return sorted(set(files))
+
+
+def snapshot_source(path: str) -> Optional[str]:
+    """Source label for a snapshot: from its folder (<source>/csv/) or its file name prefix."""
+    parent = os.path.basename(os.path.dirname(path))
+    if parent == "csv":
+        folder = os.path.basename(os.path.dirname(os.path.dirname(path)))
+        if folder in SNAPSHOT_SOURCES:
+            return SNAPSHOT_SOURCES[folder]
+    prefix = os.path.basename(path).split("_", 1)[0].lower()
+    return SNAPSHOT_SOURCES.get(prefix)
+
+
+def _normalizers() -> Dict[str, Any]:
+    # Imported lazily (in the worker) so the loader does not pull in every API client up front
+    try:
+        from backend.app.api.orchestrator import SOURCES
+    except ImportError:
+        from orchestrator import SOURCES
+    return {source.name: source.normalizer for source in SOURCES}
+
+
+def _raw_jobs(body: Any) -> List[Dict[str, Any]]:
+    if isinstance(body, dict):
+        body = next((body[key] for key in _JOB_LIST_KEYS if isinstance(body.get(key), list)), [])
+    if not isinstance(body, list):
+        return []
+    return [job for job in body if isinstance(job, dict)]
+
+
+def parse_snapshot(path: str) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
+    """
+    Map one snapshot file to canonical documents (runs in a worker process).
+
+    Returns:
+        (path, documents, skip reason or None)
+    """
+    source = snapshot_source(path)
+    if path.endswith(".json"):
+        if source is None:
+            return path, [], "unknown source"
+        with open(path, encoding="utf-8") as fd:
+            jobs = _raw_jobs(json.load(fd))
+        normalize = _normalizers()[source]
+        return path, [to_canonical_document(normalize(job), source) for job in jobs], None
+
+    rows = iter_export_rows(path)
+    first = next(rows, None)
+    if first is None:
+        return path, [], "empty"
+    if "external_id" in first and "source_platform" in first:
+        return path, [canonical_record_to_document(row) for row in [first, *rows]], None
+    if "Position" in first and "Company" in first:
+        if source is None:
+            return path, [], "unknown source"
+        return path, [to_canonical_document(row, source) for row in [first, *rows]], None
+    return path, [], "not a job snapshot"
+
+
+def load_snapshots(
+    paths: Optional[Iterable[str]] = None,
+    db_name: Optional[str] = None,
+    collection_name: Optional[str] = None,
+    workers: Optional[int] = None,
+    mode: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    dedupe: bool = True,
+) -> Dict[str, Any]:
+    """
+    Parse snapshot files in parallel and write their documents as each file finishes.
+
+    Args:
+        paths: Files or directories to load (default DEFAULT_SNAPSHOT_PATHS).
+        db_name / collection_name: Target; default PROD_DB / MONGO_JOBS_COLLECTION.
+        workers: Parser processes (default one per CPU).
+        mode: "insert" or "upsert" (default INGESTION_WRITE_MODE, else "insert").
+        batch_size: Documents per unordered bulk write (default MONGO_INSERT_BATCH_SIZE, else 500).
+        dedupe: Assign near-duplicate cluster_id (still off when INGESTION_DEDUPE is false).
+
+    Returns:
+        write report (see new_write_report, without changed_ids) plus files, skipped,
+        parsed and seconds.
+    """
+    mode = get_write_mode(mode)
+    files = find_snapshot_files(paths or DEFAULT_SNAPSHOT_PATHS)
+    collection = get_mongo_collection(db_name, collection_name)
+    # Fresh staging databases have no indexes yet; duplicates across snapshots must still collapse
+    collection.create_index("external_id", unique=True, name="uniq_external_job")
+    clusters = get_near_duplicate_index(collection) if dedupe else None
+
+    report = new_write_report()
+    report.update({"files": 0, "skipped": {}, "parsed": 0})
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parse_snapshot, path): path for path in files}
+        for future in as_completed(futures):
+            path = os.path.relpath(futures[future])
+            try:
+                _, docs, skipped = future.result()
+            except Exception as e:
+                report["skipped"][path] = str(e)
+                print(f"⚠️ Could not parse {path}: {e}")
+                continue
+            if skipped:
+                report["skipped"][path] = skipped
+                print(f"⏭️ Skipped {path} ({skipped})")
+                continue
+            now = datetime.now(timezone.utc)
+            for doc in docs:
+                doc["ingested_at"] = now
+            written = write_documents(docs, collection, batch_size, mode, report, clusters)
+            report["files"] += 1
+            report["parsed"] += len(docs)
+            print(f"✅ {path}: {len(docs)} job(s), {written} written")
+    report.pop("changed_ids")
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load captured job snapshots into MongoDB.")
+    parser.add_argument("paths", nargs="*", help="Snapshot files or directories (default: api/*/csv and ml/data)")
+    parser.add_argument("--db", help="Target database (default PROD_DB)")
+    parser.add_argument("--collection", help="Target collection (default MONGO_JOBS_COLLECTION)")
+    parser.add_argument("--workers", type=int, help="Parser processes (default one per CPU)")
+    parser.add_argument("--mode", choices=WRITE_MODES, help="Write mode (default INGESTION_WRITE_MODE, else insert)")
+    parser.add_argument("--batch-size", type=int,
+                        help="Documents per bulk write (default MONGO_INSERT_BATCH_SIZE, else 500)")
+    parser.add_argument("--no-dedupe", action="store_true", help="Skip near-duplicate clustering")
+    args = parser.parse_args()
+
+    result = load_snapshots(args.paths, args.db, args.collection, args.workers,
+                            args.mode, args.batch_size, dedupe=not args.no_dedupe)
+    rate = result["parsed"] / result["seconds"] if result["seconds"] else 0
+    print(f"✅ Loaded {result['files']} file(s), {result['parsed']} job(s) in {result['seconds']}s "
+          f"({rate:.0f} jobs/s): {result['inserted']} inserted, {result['updated']} updated, "
+          f"{result['unchanged']} unchanged, {len(result['skipped'])} file(s) skipped.")
@@ -0,0 +1,114 @@
+"""
+Multi-keyword text matching (Aho-Corasick).
+
+KeywordMatcher compiles a list of keywords once into an automaton, then finds
+every keyword occurring in a text in a single left-to-right pass, however many
+keywords there are. Used to route RemoteOK postings to the TOP_JOBS titles they
+mention without one substring scan per title.
+
+Matching is case-insensitive. With whole_words=True a match must not be part of a
+longer word ("OR Analyst" does not match "Senior Analyst").
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase and collapse whitespace; keywords are compared in this form."""
+    return " ".join(str(keyword).lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    Args:
+        keywords: Keywords to find; duplicates (after normalize_keyword) share one pattern.
+        whole_words: Only report matches bounded by non-word characters or the text edges.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = False):
+        self.whole_words = whole_words
+        self.patterns: List[str] = []
+        # pattern index -> original keywords that normalize to it
+        self._originals: List[List[str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        index: Dict[str, int] = {}
+        for keyword in keywords:
+            pattern = normalize_keyword(keyword)
+            if not pattern:
+                continue
+            if pattern in index:
+                self._originals[index[pattern]].append(keyword)
+                continue
+            index[pattern] = len(self.patterns)
+            self.patterns.append(pattern)
+            self._originals.append([keyword])
+            self._insert(pattern, index[pattern])
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        node = 0
+        for ch in pattern:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        self._out[node].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                # Depth-1 nodes find themselves under the root; their failure link is the root
+                self._fail[child] = target if target != child else 0
+                # Inherit the outputs of the longest proper suffix that is also a pattern
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every match in text, in order of end position."""
+        if not self.patterns or not text:
+            return
+        lowered = text.lower()
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_id in out[node]:
+                pattern = patterns[pattern_id]
+                start = i + 1 - len(pattern)
+                if self.whole_words and (
+                    (start > 0 and _is_word_char(lowered[start - 1]))
+                    or (i + 1 < len(lowered) and _is_word_char(lowered[i + 1]))
+                ):
+                    continue
+                yield start, i + 1, pattern
+
+    def matches(self, text: str) -> Set[str]:
+        """Original keywords (as passed in) found anywhere in text."""
+        found = {pattern for _, _, pattern in self.finditer(text)}
+        index = {pattern: i for i, pattern in enumerate(self.patterns)} if found else {}
+        return {original for pattern in found for original in self._originals[index[pattern]]}
@@ -8,7 +8,7 @@ Auth: API Key required
 Coverage: United States federal government roles
 """
 
-import requests
+import httpx
 import json
 import csv
 import os
@@ -23,12 +23,14 @@ load_dotenv(dotenv_path=env_path)
 
 try:
     from backend.app.api.job_schema import export_canonical_to_csv
+    from backend.app.api.http_client import get_json
 except ImportError:
     import sys
     _api = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api not in sys.path:
         sys.path.insert(0, _api)
     from job_schema import export_canonical_to_csv
+    from http_client import get_json
 
 
 def test_usajobs_api(keywords: Optional[str] = None,
@@ -69,9 +71,7 @@ def test_usajobs_api(keywords: Optional[str] = None,
             'Authorization-Key': api_key
         }
         
-        response = requests.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json("USAJobs", url, params=params, headers=headers)
         
         # Post-process to filter by job title
         if 'SearchResult' in data and 'SearchResultItems' in data['SearchResult']:
@@ -90,7 +90,7 @@ def test_usajobs_api(keywords: Optional[str] = None,
             data['SearchResult']['SearchResultItems'] = filtered_items
         
         return data
-    except requests.exceptions.RequestException as error:
+    except httpx.HTTPError as error:
         print(f'Error calling USAJobs API: {error}')
         raise
 
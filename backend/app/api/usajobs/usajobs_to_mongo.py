@@ -14,13 +14,13 @@ import os
 from typing import List, Dict, Any, Optional
 
 try:
-    from backend.app.api.data_ingestor import run_ingestion
+    from backend.app.api.data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 except ImportError:
     import sys
     _api_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _api_dir not in sys.path:
         sys.path.insert(0, _api_dir)
-    from data_ingestor import run_ingestion
+    from data_ingestor import Checkpoint, load_checkpoints, run_ingestion
 
 try:
     from backend.app.api.usajobs.test_usajobs_api import test_usajobs_api, normalize_usajobs_job
@@ -28,24 +28,52 @@ except ImportError:
     from test_usajobs_api import test_usajobs_api, normalize_usajobs_job
 
 
+SOURCE = "USAJobs"
+
+
+def checkpoint_query(keywords: Optional[str] = "Software Engineer") -> str:
+    """Checkpoint query key for a fetch configuration."""
+    return keywords or "all"
+
+
+def fetch_jobs(
+    keywords: Optional[str] = "Software Engineer",
+    page: Optional[int] = None,
+    checkpoint: Optional[Checkpoint] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch raw USAJobs items; with a checkpoint, only postings newer than the last run."""
+    data = test_usajobs_api(keywords=keywords, page=page)
+    result = data.get("SearchResult", {})
+    items = result.get("SearchResultItems", [])
+    if checkpoint is not None:
+        fresh = checkpoint.filter_new(items)
+        # A page of unseen postings with more pages behind it: keep the date mark
+        last_page = (page or 1) >= int((result.get("UserArea") or {}).get("NumberOfPages") or 0)
+        checkpoint.advance(fresh, complete=len(fresh) < len(items) or last_page)
+        items = fresh
+    return items
+
+
 def run(
     keywords: Optional[str] = "Software Engineer",
     page: Optional[int] = None,
+    incremental: bool = True,
 ) -> int:
     """Fetch jobs from USAJobs and insert into MongoDB. Returns count inserted."""
     print("USAJobs → MongoDB")
     print("=" * 50)
 
-    def fetch_jobs():
-        data = test_usajobs_api(keywords=keywords, page=page)
-        return data.get("SearchResult", {}).get("SearchResultItems", [])
+    # Only postings newer than the last successful run for this query
+    query = checkpoint_query(keywords)
+    checkpoint = load_checkpoints(SOURCE, [query])[query] if incremental else None
 
-    items = fetch_jobs()
+    items = fetch_jobs(keywords=keywords, page=page, checkpoint=checkpoint)
     print(f"Retrieved {len(items)} job postings from USAJobs.")
     count = run_ingestion(
-        source="USAJobs",
+        source=SOURCE,
         normalizer=normalize_usajobs_job,
         fetch_jobs=lambda: items,
+        checkpoints=[checkpoint] if checkpoint is not None else None,
     )
     print(f"Inserted {count} documents into MongoDB.")
     return count
@@ -3,12 +3,16 @@ import pandas
 import spacy
 import re
 import pickle
+import threading
 import numpy as np
+from typing import Iterable, List, Optional
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer, util
 import os
 
+from backend.utils.timing import StageTimer
+
 # --- SETUP NLP ---
 nlp = spacy.load("en_core_web_sm")
 custom_stop_words = [
@@ -130,13 +134,18 @@ class JobMatcher:
     Class to implement the job matching logic using TF-IDF
     """
 
-    def __init__(self):
+    def __init__(self, model_path: Optional[str] = None):
+        """
+        Args:
+            model_path: Path to a model.pkl artifact (default models/model.pkl)
+        """
         # Load the model only when the class is initialized
         self.tfidf: TfidfVectorizer
         self.df: pandas.DataFrame
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, "models", "model.pkl")
+        if model_path is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            model_path = os.path.join(current_dir, "models", "model.pkl")
 
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model artifact not found at {model_path}. Run train.py first.")
@@ -205,53 +214,60 @@ class JobMatcher:
 
         return top_missing_words
 
-    def recommend(self, user_profile:dict, top_n=10):
+    def recommend(self, user_profile:dict, top_n=10,
+                  timer: Optional[StageTimer] = None):
         """
         Class method to implement cosine similarity logic to compare the
         "User Vector" against the "Job Vectors" and output a raw match score
         Args:
             user_profile: dict
             top_n: int
+            timer: optional StageTimer collecting encode/similarity/format
+                   durations
 
         Returns: dict
         """
+        timer = timer or StageTimer()
 
-        # Pre-processing
-        user_text = self.combine_user_fields(user_profile)
+        with timer.stage("encode"):
+            # Pre-processing
+            user_text = self.combine_user_fields(user_profile)
 
-        # Clean the User Input
-        cleaned_text = clean_text(user_text)
+            # Clean the User Input
+            cleaned_text = clean_text(user_text)
 
-        # Convert the User Input to Numbers (Vector)
-        user_vector = self.tfidf.transform([cleaned_text])
+            # Convert the User Input to Numbers (Vector)
+            user_vector = self.tfidf.transform([cleaned_text])
 
-        # Calculate the cosine similarity
-        similarities = cosine_similarity(user_vector, self.tfidf_matrix).flatten()
+        with timer.stage("similarity"):
+            # Calculate the cosine similarity
+            similarities = cosine_similarity(user_vector, self.tfidf_matrix).flatten()
 
-        # Get Top N Matches
-        top_indices = similarities.argsort()[-top_n:][::-1]
+            # Get Top N Matches
+            top_indices = similarities.argsort()[-top_n:][::-1]
 
         # Format Results
         results = []
-        for index in top_indices:
-            score = similarities[index]
+        with timer.stage("format"):
+            for index in top_indices:
+                score = similarities[index]
 
-            # Filter: Only return if there is some relevancy
-            if score < 0.05:
-                continue
+                # Filter: Only return if there is some relevancy
+                if score < 0.05:
+                    continue
 
-            job_row = self.df.iloc[index]
+                job_row = self.df.iloc[index]
 
-            # Find missing skills
-            missing = self.get_missing_skills(user_vector, index)
+                # Find missing skills
+                missing = self.get_missing_skills(user_vector, index)
 
-            results.append({
-                "job_id": str(job_row.get("_id")),
-                "title": job_row.get("title", "Unknown"),
-                "company": job_row.get("company", "Unknown"),
-                "score": round(score, 2),
-                "missing_skills": missing
-            })
+                results.append({
+                    "job_id": str(job_row.get("_id")),
+                    "title": job_row.get("title", "Unknown"),
+                    "company": job_row.get("company", "Unknown"),
+                    "score": round(score, 2),
+                    "missing_skills": missing
+                })
 
         return results
 
@@ -260,25 +276,164 @@ class SemanticJobMatcher:
     Class to implement the job matching logic using TF-IDF
     """
 
-    def __init__(self):
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, model_path: Optional[str] = None, encoder=None):
+        """
+        Args:
+            model_path: Path to a semantic_model.pkl artifact
+                        (default models/semantic_model.pkl)
+            encoder: Object exposing encode(text); defaults to the
+                     all-MiniLM-L6-v2 SentenceTransformer
+        """
+        self.encoder = encoder or SentenceTransformer('all-MiniLM-L6-v2')
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        base_path = os.path.join(current_dir, "models", "semantic_model.pkl")
+        if model_path is None:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            base_path = os.path.join(current_dir, "models", "semantic_model.pkl")
+        else:
+            base_path = model_path
 
         if not os.path.exists(base_path):
             raise FileNotFoundError(f"Model artifact not found at "
                                     f"{base_path}. Run train.py first.")
 
+        self.model_path = base_path
         with open(base_path, "rb") as fd:
             data = pickle.load(fd)            
             # Access by keys instead of unpacking by position
             self.job_embeddings = data.get("embeddings")
-            self.df = data.get("df")
+            self.df = data.get("df").reset_index(drop=True)
             # If you saved job_ids, you can grab them too
-            self.job_ids = data.get("job_ids")
+            self.job_ids = data.get("job_ids") or self.df["_id"].astype(str).tolist()
+
+        # Incremental updates (upsert_jobs / remove_jobs) never modify these in
+        # place: they build new objects and swap them in under the lock, so a
+        # recommend() call keeps the consistent snapshot it started with.
+        # Removed or replaced rows stay as tombstones (alive == False) until compact().
+        self.alive = np.ones(len(self.df), dtype=bool)
+        self._positions = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self._lock = threading.Lock()
+        self.dirty = False
 
         print("✅ Semantic Matcher initialized successfully.")
+
+    @property
+    def tombstones(self) -> int:
+        """Rows kept only until the next compact()"""
+        return int(len(self.alive) - self.alive.sum())
+
+    @staticmethod
+    def job_text(job) -> str:
+        """Text a job is embedded from (the same field train.py encodes)"""
+        return clean_text_for_embeddings(job.get("description"))
+
+    def upsert_jobs(self, jobs: List[dict]) -> int:
+        """
+        Append newly ingested jobs to the index, or replace edited ones
+        (the old row is tombstoned and the new one appended).
+
+        Like train.py, one job per near-duplicate cluster: a job that joined
+        another posting's cluster (cluster_id set to a different external_id)
+        is only re-embedded when it is already indexed.
+
+        Args:
+            jobs: Job documents as stored in Mongo (with _id)
+
+        Returns:
+            Number of jobs embedded
+        """
+        # Last copy wins if a job is listed twice
+        jobs = list({str(job["_id"]): job for job in jobs}.values())
+        jobs = [
+            job for job in jobs
+            if str(job["_id"]) in self._positions
+            or job.get("cluster_id") in (None, job.get("external_id"))
+        ]
+        if not jobs:
+            return 0
+        # Encode outside the lock; recommend() keeps working meanwhile
+        embeddings = np.asarray(self.encoder.encode([self.job_text(job) for job in jobs]))
+        ids = [str(job["_id"]) for job in jobs]
+
+        with self._lock:
+            alive = self.alive.copy()
+            positions = dict(self._positions)
+            for job_id in ids:
+                if job_id in positions:
+                    alive[positions[job_id]] = False
+            start = len(self.df)
+            for offset, job_id in enumerate(ids):
+                positions[job_id] = start + offset
+
+            self.df = pandas.concat([self.df, pandas.DataFrame(jobs)], ignore_index=True)
+            self.job_embeddings = np.vstack([self.job_embeddings, embeddings])
+            self.alive = np.concatenate([alive, np.ones(len(ids), dtype=bool)])
+            self.job_ids = self.job_ids + ids
+            self._positions = positions
+            self.dirty = True
+        return len(ids)
+
+    def remove_jobs(self, job_ids: Iterable[str]) -> int:
+        """
+        Tombstone deleted jobs so they stop being recommended.
+
+        Returns:
+            Number of indexed jobs removed
+        """
+        with self._lock:
+            alive = self.alive.copy()
+            positions = dict(self._positions)
+            removed = 0
+            for job_id in job_ids:
+                position = positions.pop(str(job_id), None)
+                if position is not None:
+                    alive[position] = False
+                    removed += 1
+            if removed:
+                self.alive = alive
+                self._positions = positions
+                self.dirty = True
+        return removed
+
+    def compact(self) -> int:
+        """
+        Drop tombstoned rows from the embeddings and the dataframe.
+
+        Returns:
+            Number of rows reclaimed
+        """
+        with self._lock:
+            reclaimed = self.tombstones
+            if not reclaimed:
+                return 0
+            keep = np.flatnonzero(self.alive)
+            self.df = self.df.iloc[keep].reset_index(drop=True)
+            self.job_embeddings = self.job_embeddings[keep]
+            self.job_ids = [self.job_ids[i] for i in keep]
+            self.alive = np.ones(len(keep), dtype=bool)
+            self._positions = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        return reclaimed
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Write the live rows back as a semantic_model.pkl artifact (atomically),
+        so a restart keeps the incremental updates.
+
+        Returns:
+            Path written
+        """
+        path = path or self.model_path
+        with self._lock:
+            data = {
+                "embeddings": self.job_embeddings[self.alive],
+                "df": self.df[self.alive].reset_index(drop=True),
+                "job_ids": [job_id for job_id, alive in zip(self.job_ids, self.alive) if alive],
+            }
+            self.dirty = False
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fd:
+            pickle.dump(data, fd)
+        os.replace(tmp_path, path)
+        return path
         
     @staticmethod
     def get_missing_skills_basic(user_skills: list, job_skills:
@@ -372,15 +527,19 @@ class SemanticJobMatcher:
         return False
 
 
-    def recommend(self, user_preferences: dict, top_n=5):
+    def recommend(self, user_preferences: dict, top_n=5,
+                  timer: Optional[StageTimer] = None):
         """
 
         Args:
             user_preferences:
             top_n:
+            timer: optional StageTimer collecting filter/encode/similarity/
+                   format durations
 
         Returns:
         """
+        timer = timer or StageTimer()
 
         user_skills = user_preferences.get("skills", [])
         if isinstance(user_skills, str):
@@ -398,58 +557,68 @@ class SemanticJobMatcher:
         user_min = user_preferences.get("salary_min")
         user_max = user_preferences.get("salary_max")
 
-        eligible_indices = [
-            idx for idx, job_row in self.df.iterrows()
-            if self.salary_matches(job_row, user_min, user_max) 
-            and self.location_matches(job_row, preferred_locations)
-        ]
-        
-        if not eligible_indices and preferred_locations:
+        # Consistent snapshot; incremental updates swap in new objects
+        with self._lock:
+            df, job_embeddings, alive = self.df, self.job_embeddings, self.alive
+
+        with timer.stage("filter"):
             eligible_indices = [
-                idx for idx, job_row in self.df.iterrows()
-                if self.salary_matches(job_row, user_min, user_max)
-                and "remote" in str(job_row.get("location", "")).lower()
+                idx for idx, job_row in df.iterrows()
+                if alive[idx]
+                and self.salary_matches(job_row, user_min, user_max) 
+                and self.location_matches(job_row, preferred_locations)
             ]
+            
+            if not eligible_indices and preferred_locations:
+                eligible_indices = [
+                    idx for idx, job_row in df.iterrows()
+                    if alive[idx]
+                    and self.salary_matches(job_row, user_min, user_max)
+                    and "remote" in str(job_row.get("location", "")).lower()
+                ]
         
         if not eligible_indices:
             return []
 
-        filtered_embeddings = self.job_embeddings[eligible_indices]
+        with timer.stage("encode"):
+            user_text = " ".join(target_roles + user_skills)
+            # Clean user text
+            cleaned_user_text = clean_text_for_embeddings(user_text)
+            # Encode user input
+            user_vector = self.encoder.encode(cleaned_user_text)
 
-        user_text = " ".join(target_roles + user_skills)
-        # Clean user text
-        cleaned_user_text = clean_text_for_embeddings(user_text)
-        # Encode user input
-        user_vector = self.encoder.encode(cleaned_user_text)
+        with timer.stage("similarity"):
+            filtered_embeddings = job_embeddings[eligible_indices]
 
-        # Calculate the cosine similarities
-        similarities = util.cos_sim(user_vector, filtered_embeddings)[
-            0].cpu().numpy()
+            # Calculate the cosine similarities
+            similarities = util.cos_sim(user_vector, filtered_embeddings)[
+                0].cpu().numpy()
 
-        # Rank Results
-        top_indices = similarities.argsort()[-top_n:][::-1]
+            # Rank Results
+            top_indices = similarities.argsort()[-top_n:][::-1]
 
         results = []
-        for idx in top_indices:
-            score = float(similarities[idx])
-            if score < 0.20:
-                continue
-
-            original_idx = eligible_indices[idx]
-            job_row = self.df.iloc[original_idx]
-
-            job_skills = job_row.get("skills_required", [])
-            missing = self.get_missing_skills_basic(user_skills, job_skills)
-
-            results.append({
-                "job_id": str(job_row.get("_id")),
-                "title": job_row.get("title", "Unknown"),
-                "company": job_row.get("company", "Unknown"),
-                "location": job_row.get("location", "Remote / Not Listed"),
-                "url": job_row.get("source_url") or "#",
-                "salary_range": job_row.get("salary_range", {"min": None, "max": None}),
-                "score": round(score, 2),
-                "missing_skills": missing
-            })
+        with timer.stage("format"):
+            for idx in top_indices:
+                score = float(similarities[idx])
+                if score < 0.20:
+                    continue
+
+                original_idx = eligible_indices[idx]
+                job_row = df.iloc[original_idx]
+
+                job_skills = job_row.get("skills_required", [])
+                missing = self.get_missing_skills_basic(user_skills, job_skills)
+
+                results.append({
+                    "job_id": str(job_row.get("_id")),
+                    "title": job_row.get("title", "Unknown"),
+                    "company": job_row.get("company", "Unknown"),
+                    "location": job_row.get("location", "Remote / Not Listed"),
+                    "url": job_row.get("source_url") or "#",
+                    "salary_range": job_row.get("salary_range", {"min": None, "max": None}),
+                    "score": round(score, 2),
+                    "missing_skills": missing
+                })
 
         return results
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import Optional
 from pymongo import MongoClient
 import motor.motor_asyncio
 from dotenv import load_dotenv
+from backend.db.monitoring import command_listeners
 
 #Singletons to prevent connection leaks
 _sync_client: Optional[MongoClient] = None
@@ -44,7 +45,8 @@ def get_sync_jobs_collection():
         raise ValueError("MONGODB_CONNECT_STRING or PROD_DB missing from .env")
 
     if _sync_client is None:
-        _sync_client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+        _sync_client = MongoClient(uri, serverSelectionTimeoutMS=5000,
+                                   event_listeners=command_listeners())
 
     return _sync_client[db_name]["jobs"]
 
@@ -64,6 +66,9 @@ def get_async_matches_collection():
         raise ValueError("MONGODB_CONNECT_STRING or PROD_DB missing from .env")
 
     if _async_client is None:
-        _async_client = motor.motor_asyncio.AsyncIOMotorClient(uri, serverSelectionTimeoutMS=5000)
+        _async_client = motor.motor_asyncio.AsyncIOMotorClient(
+            uri, serverSelectionTimeoutMS=5000,
+            event_listeners=command_listeners(),
+        )
 
     return _async_client[db_name]["job_matches"]
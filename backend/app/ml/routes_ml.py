@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import os
+import threading
+
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from backend.services.userstats_service import (
     recalculate_top_missing_skill_for_user
@@ -11,12 +15,25 @@ from backend.services.jobmatches_service import upsert_job_match
 from backend.db.mongo import get_db
 from bson import ObjectId
 from .mongo_ingestion_utils import get_async_matches_collection
+from backend.utils.metrics import REGISTRY
+from backend.utils.timing import StageTimer
 
 router = APIRouter()
 
+RECOMMENDATION_STAGE_SECONDS = REGISTRY.histogram(
+    "recommendation_stage_seconds",
+    "Time spent in each stage of /ml/job-matches.",
+    ["model", "stage"],
+)
+
+# Seconds between compactions of the semantic index (0 turns them off)
+SEMANTIC_INDEX_COMPACT_INTERVAL = float(os.getenv("SEMANTIC_INDEX_COMPACT_INTERVAL", "900"))
+
 # LOAD CACHED MODELS
 tfidf_matcher = None
 semantic_matcher = None
+# Serializes rebuilding and saving the semantic artifact
+_artifact_lock = threading.Lock()
 
 try:
     print("🔄 Loading ML Models...")
@@ -82,11 +99,17 @@ async def get_specific_match(user_id: str, job_id: str):
 
 
 @router.post("/job-matches")
-async def get_recommendations(request: RecommendationRequest):
+async def get_recommendations(request: RecommendationRequest,
+                              response: Response):
     """
     Generates job recommendations based on user preferences.
+
+    Per-stage durations (filter, encode, similarity, format, upsert,
+    recalc_stats) are returned in the Server-Timing header and recorded in
+    the recommendation_stage_seconds histogram.
     Args:
         request: dict
+        response: Response used to attach the Server-Timing header
 
     Returns:
     """
@@ -109,25 +132,33 @@ async def get_recommendations(request: RecommendationRequest):
             raise HTTPException(status_code=503, detail="ML Models not ready. Run /train.")
 
     model_type = "semantic"
+    timer = StageTimer()
     try:
         if model_type == "tfidf":
-            matches = tfidf_matcher.recommend(request.preferences.model_dump(), top_n=10)
+            matches = tfidf_matcher.recommend(request.preferences.model_dump(),
+                                              top_n=10, timer=timer)
         else:
-            matches = semantic_matcher.recommend(request.preferences.model_dump(), top_n=10)
+            matches = semantic_matcher.recommend(request.preferences.model_dump(),
+                                                 top_n=10, timer=timer)
 
         db = get_db()
 
-        for match in matches:
-            await upsert_job_match(
-                db=db,
-                user_id=user_oid,
-                job_id=ObjectId(match.get("job_id")),
-                score=match["score"],
-                missing_skills=match["missing_skills"],
-                recalc=False,  # Defer top missing skill recalculation until all matches are upserted
-            )
+        with timer.stage("upsert"):
+            for match in matches:
+                await upsert_job_match(
+                    db=db,
+                    user_id=user_oid,
+                    job_id=ObjectId(match.get("job_id")),
+                    score=match["score"],
+                    missing_skills=match["missing_skills"],
+                    recalc=False,  # Defer top missing skill recalculation until all matches are upserted
+                )
+
+        with timer.stage("recalc_stats"):
+            await recalculate_top_missing_skill_for_user(db, user_oid)
 
-        await recalculate_top_missing_skill_for_user(db, user_oid)
+        timer.observe(RECOMMENDATION_STAGE_SECONDS, model=model_type)
+        response.headers["Server-Timing"] = timer.server_timing()
 
         return {"status": "success", "model_used": model_type,
                 "matches": matches}
@@ -140,6 +171,70 @@ async def get_recommendations(request: RecommendationRequest):
         )
 
 
+def refresh_models():
+    """
+    Rebuild the semantic artifact from the jobs collection and swap the cached
+    matchers. Blocking; also called by the ingestion scheduler when an incremental
+    semantic index update after ingestion fails.
+    """
+    global semantic_matcher, tfidf_matcher
+
+    with _artifact_lock:
+        build_semantic_model()
+        tfidf_matcher = JobMatcher()
+        semantic_matcher = SemanticJobMatcher()
+
+
+def index_jobs(jobs: List[dict]) -> int:
+    """
+    Add new or edited jobs (Mongo documents) to the cached semantic index without
+    retraining. Blocking (encodes the jobs); 0 when no model is loaded.
+    """
+    matcher = semantic_matcher
+    if matcher is None or not jobs:
+        return 0
+    return matcher.upsert_jobs(jobs)
+
+
+def unindex_jobs(job_ids: Iterable[str]) -> int:
+    """Stop recommending deleted jobs; 0 when no model is loaded."""
+    matcher = semantic_matcher
+    if matcher is None:
+        return 0
+    return matcher.remove_jobs(job_ids)
+
+
+def compact_semantic_index() -> int:
+    """
+    Reclaim tombstoned rows and, if the index changed since it was loaded or last
+    saved, write it back to semantic_model.pkl so a restart keeps the updates.
+    Returns the number of rows reclaimed.
+    """
+    matcher = semantic_matcher
+    if matcher is None:
+        return 0
+    reclaimed = matcher.compact()
+    if matcher.dirty:
+        with _artifact_lock:
+            # A rebuild may have replaced the matcher (and the artifact) meanwhile
+            if matcher is semantic_matcher:
+                matcher.save()
+    return reclaimed
+
+
+async def compact_periodically(interval: float = SEMANTIC_INDEX_COMPACT_INTERVAL):
+    """Run compact_semantic_index() every interval seconds (started from the app lifespan)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            reclaimed = await loop.run_in_executor(None, compact_semantic_index)
+            if reclaimed:
+                print(f"✅ Semantic index compacted ({reclaimed} stale row(s) reclaimed).")
+        except Exception as e:
+            print(f"⚠️ Semantic index compaction failed: {e}")
+
+
 @router.post("/train")
 async def trigger_training():
     """
@@ -147,9 +242,7 @@ async def trigger_training():
     """
 
     try:
-        build_semantic_model()
-        tfidf_matcher = JobMatcher()
-        semantic_matcher = SemanticJobMatcher()
+        refresh_models()
         return {"status": "success",
                 "message": "ML models rebuilt and cached."}
     except Exception as e:
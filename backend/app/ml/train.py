@@ -1,5 +1,9 @@
 import pandas as pd
 import pickle
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sentence_transformers import SentenceTransformer
 from .logic import clean_text, clean_text_for_embeddings
@@ -16,9 +20,36 @@ os.makedirs(MODEL_DIR, exist_ok=True)
 # Define the full path to use in pickle.dump()
 MODEL_PATH = os.path.join(MODEL_DIR, "semantic_model.pkl")
 
+SEMANTIC_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Texts per encoder forward pass
+ENCODE_BATCH_SIZE = 32
+
+# Per-process model used by the encoding pool workers
+_worker_model = None
+
+
+def representatives_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep one job per near-duplicate cluster (cluster_id, set at ingestion by
+    app/api/near_duplicates.py): the cluster's representative if loaded, else its
+    first member. Jobs without a cluster_id are all kept.
+    """
+    if "cluster_id" not in df.columns:
+        return df
+    clustered = df["cluster_id"].notna()
+    members = df[clustered].assign(_representative=df["external_id"] == df["cluster_id"])
+    kept = (
+        members.sort_values("_representative", ascending=False, kind="stable")
+        .drop_duplicates("cluster_id")
+        .drop(columns="_representative")
+    )
+    return pd.concat([kept, df[~clustered]]).sort_index().reset_index(drop=True)
+
+
 def fetch_jobs_data() -> pd.DataFrame:
     """
-    Fetches the jobs data from MongoDB
+    Fetches the jobs data from MongoDB, one job per near-duplicate cluster
     """
 
     print("Connecting to MongoDB via Utility...")
@@ -31,7 +62,9 @@ def fetch_jobs_data() -> pd.DataFrame:
     if not jobs_list:
         raise ValueError("No jobs found in the database. Run ingestion first.")
 
-    df = pd.DataFrame(jobs_list)
+    df = representatives_only(pd.DataFrame(jobs_list))
+    if len(df) < len(jobs_list):
+        print(f"Skipped {len(jobs_list) - len(df)} near-duplicate jobs.")
     df['processed_text'] = df['description'].apply(clean_text)
     return df
 
@@ -66,9 +99,113 @@ def build_model():
 
     print("Done!")
 
-def build_semantic_model():
+
+def _load_encoder(model_name: str) -> SentenceTransformer:
+    return SentenceTransformer(model_name, device="cpu")
+
+
+def _init_encode_worker(model_name: str, threads: int,
+                        load_encoder: Callable[[str], SentenceTransformer] = _load_encoder):
+    """
+    Pool initializer: pin the torch thread count and load one encoder per process.
+    """
+    global _worker_model
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_model = load_encoder(model_name)
+
+
+def _encode_batch(batch: List[str]) -> np.ndarray:
+    """
+    Encode one batch inside a pool worker. The batch is encoded as a single
+    forward pass, exactly like one iteration of SentenceTransformer.encode.
+    """
+    return _worker_model.encode(batch, batch_size=len(batch),
+                                show_progress_bar=False)
+
+
+def encode_texts(
+    model: SentenceTransformer,
+    texts: List[str],
+    model_name: str = SEMANTIC_MODEL_NAME,
+    batch_size: int = ENCODE_BATCH_SIZE,
+    num_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    load_encoder: Callable[[str], SentenceTransformer] = _load_encoder,
+) -> np.ndarray:
+    """
+    Encode texts into dense vectors, optionally sharded across worker processes.
+
+    The multi-process path reproduces the batching of SentenceTransformer.encode
+    (sort by length, cut into batch_size chunks) and hands whole batches to the
+    workers, so every text is encoded with the same neighbours and padding as in
+    the single-process path and the output rows are identical.
+
+    Args:
+        model: Loaded encoder, used for the single-process path.
+        texts: Cleaned texts to encode.
+        model_name: Name the pool workers load their own encoder from.
+        batch_size: Texts per forward pass.
+        num_workers: Worker processes (default ENCODE_WORKERS env or 1).
+        threads_per_worker: Torch threads per worker
+                            (default ENCODE_THREADS_PER_WORKER env or cores / workers).
+        load_encoder: Module-level (picklable) function the pool workers build their
+                      encoder with from model_name; default loads it on CPU.
+
+    Returns:
+        ndarray of shape (len(texts), dim) in input order.
+    """
+    # ENCODE_WORKERS=1 (the default) keeps the single-process path
+    if num_workers is None:
+        num_workers = int(os.getenv("ENCODE_WORKERS", "1"))
+    num_workers = max(1, min(num_workers, len(texts) // batch_size or 1))
+
+    if num_workers == 1:
+        return model.encode(texts, batch_size=batch_size,
+                            show_progress_bar=True)
+
+    if threads_per_worker is None:
+        threads_per_worker = int(os.getenv(
+            "ENCODE_THREADS_PER_WORKER",
+            max(1, (os.cpu_count() or 1) // num_workers),
+        ))
+
+    # Same ordering SentenceTransformer.encode uses internally
+    length_sorted_idx = np.argsort([-len(text) for text in texts])
+    batches = [
+        [texts[i] for i in length_sorted_idx[start:start + batch_size]]
+        for start in range(0, len(texts), batch_size)
+    ]
+
+    print(f"Encoding {len(batches)} batches on {num_workers} processes "
+          f"x {threads_per_worker} threads...")
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=ctx,
+        initializer=_init_encode_worker,
+        initargs=(model_name, threads_per_worker, load_encoder),
+    ) as pool:
+        encoded = list(pool.map(_encode_batch, batches,
+                                chunksize=max(1, len(batches) // (num_workers * 4))))
+
+    sorted_embeddings = np.concatenate(encoded, axis=0)
+    embeddings = np.empty_like(sorted_embeddings)
+    embeddings[length_sorted_idx] = sorted_embeddings
+    return embeddings
+
+
+def build_semantic_model(
+    num_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+):
     """
     Function to train the data on sentence-transformer
+
+    Args:
+        num_workers: Encoding processes (default ENCODE_WORKERS env or 1).
+        threads_per_worker: Torch threads per encoding process.
     Returns:
     """
 
@@ -81,13 +218,17 @@ def build_semantic_model():
 
     # Load the sentence-transformer lightweight Hugging Face Model
     print("Loading Sentence Transformer...")
-    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model = SentenceTransformer(SEMANTIC_MODEL_NAME)
 
     # Encode the job into dense vectors
     print("Encoding job descriptions (this may take a moment)...")
 
-    job_embeddings = model.encode(df['processed_text'].tolist(),
-                                  show_progress_bar=True)
+    job_embeddings = encode_texts(
+        model,
+        df['processed_text'].tolist(),
+        num_workers=num_workers,
+        threads_per_worker=threads_per_worker,
+    )
     data_to_save = {
         "embeddings": job_embeddings,
         "df": df,
@@ -0,0 +1,281 @@
+"""
+Microbenchmark for job_schema normalization and date parsing.
+
+Measures, per source:
+  - date parsing cost (µs/value) for the legacy strptime loop, _parse_date
+    without a source (ISO / epoch fast paths only) and with a source (memoized
+    winning format)
+  - normalization throughput (docs/s): normalizer -> to_canonical_document
+  - salary extraction from descriptions (µs/doc, hit count) for the legacy RemoteOK
+    three-regex loop and the combined pattern (extract_salary)
+
+Raw postings come from the recorded HTTP fixtures (INGESTION_HTTP_MODE=record,
+see backend/app/api/http_client.py) when there are any; otherwise each source's
+date format is benchmarked on synthetic postings (and salary extraction on the captured
+snapshot descriptions). Results are written as JSON.
+
+Run from project root:
+  python -m backend.benchmarks.bench_job_schema
+  python -m backend.benchmarks.bench_job_schema --fixture-dir path/to/fixtures --repeat 20
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.app.api import job_schema
+from backend.app.api.http_client import DEFAULT_FIXTURE_DIR
+from backend.app.api.job_schema import _parse_date, extract_salary, to_canonical_document
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Raw jobs inside one recorded response body, per source
+FIXTURE_JOBS: Dict[str, Callable[[Any], List[Dict[str, Any]]]] = {
+    "Adzuna": lambda body: body.get("results", []),
+    "Jobicy": lambda body: body.get("jobs", []),
+    "SerpAPI": lambda body: body.get("jobs_results", []),
+    "Arbeitnow": lambda body: body.get("data", []),
+    "The Muse": lambda body: body.get("results", []),
+    "Remotive": lambda body: body.get("jobs", []),
+    "RemoteOK": lambda body: [job for job in body if isinstance(job, dict) and job.get("id")],
+    "USAJobs": lambda body: body.get("SearchResult", {}).get("SearchResultItems", []),
+}
+
+# Date shape each provider sends, for synthetic postings
+SOURCE_DATE_FORMATS: Dict[str, Callable[[datetime], Any]] = {
+    "Adzuna": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    "Jobicy": lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S"),
+    "Arbeitnow": lambda dt: int(dt.timestamp()),
+    "The Muse": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+    "Remotive": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S"),
+    "RemoteOK": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+    "USAJobs": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.0000"),
+    "US dates": lambda dt: dt.strftime("%m/%d/%Y"),
+}
+
+
+def legacy_parse_date(value: Any) -> Optional[datetime]:
+    """_parse_date before format memoization: every strptime format in order, per value."""
+    if value is None or value == "" or value == "N/A":
+        return None
+    s = str(value).strip()
+    for fmt in (
+        "%Y-%m-%dT%H:%M:%S%z",
+        "%Y-%m-%dT%H:%M:%S.%f%z",
+        "%Y-%m-%dT%H:%M:%SZ",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d",
+        "%m/%d/%Y",
+        "%d/%m/%Y",
+    ):
+        try:
+            dt = datetime.strptime(s.replace("Z", "+00:00"), fmt)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.astimezone(timezone.utc)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+_LEGACY_SALARY_PATTERNS = [
+    r'\$(\d+)k?\s*-\s*\$(\d+)k?',
+    r'\$(\d{1,3}(?:,\d{3})*)\s*-\s*\$(\d{1,3}(?:,\d{3})*)',
+    r'(\d+)k?\s*-\s*(\d+)k?\s*(?:USD|dollars|per year|annually)',
+]
+
+
+def legacy_extract_salary(description: str) -> Tuple[Optional[int], Optional[int]]:
+    """RemoteOK's extract_salary_from_job before extract_salary: three patterns, one after another."""
+    for pattern in _LEGACY_SALARY_PATTERNS:
+        match = re.search(pattern, description, re.IGNORECASE)
+        if match:
+            scale = 1000 if "k" in match.group(0).lower() else 1
+            return (int(match.group(1).replace(",", "")) * scale,
+                    int(match.group(2).replace(",", "")) * scale)
+    return (None, None)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_fixture_jobs(fixture_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Raw postings per source from every recorded response under fixture_dir."""
+    jobs: Dict[str, List[Dict[str, Any]]] = {}
+    if not os.path.isdir(fixture_dir):
+        return jobs
+    for root, _, files in os.walk(fixture_dir):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(root, name), encoding="utf-8") as fd:
+                record = json.load(fd)
+            extract = FIXTURE_JOBS.get(record.get("source"))
+            if extract is None:
+                continue
+            try:
+                jobs.setdefault(record["source"], []).extend(extract(record["body"]))
+            except (AttributeError, TypeError):
+                continue
+    return jobs
+
+
+def synthetic_dates(n: int, seed: int = 7) -> Dict[str, List[Any]]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    moments = [start + timedelta(seconds=rng.randrange(90 * 86400), microseconds=rng.randrange(10**6))
+               for _ in range(n)]
+    return {source: [fmt(dt) for dt in moments] for source, fmt in SOURCE_DATE_FORMATS.items()}
+
+
+def time_per_value(fn: Callable[[Any], Any], values: List[Any], repeat: int) -> float:
+    """Best-of-repeat microseconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        best = min(best, time.perf_counter() - start)
+    return round(best / max(len(values), 1) * 1e6, 3)
+
+
+def bench_dates(source: str, values: List[Any], repeat: int) -> Dict[str, Any]:
+    job_schema._date_strategies.clear()
+    result = {
+        "source": source,
+        "values": len(values),
+        "parsed": sum(1 for value in values if _parse_date(value, source=source) is not None),
+        "legacy_us": time_per_value(legacy_parse_date, values, repeat),
+        "no_memo_us": time_per_value(_parse_date, values, repeat),
+        "memo_us": time_per_value(lambda value: _parse_date(value, source=source), values, repeat),
+    }
+    result["speedup_vs_legacy"] = round(result["legacy_us"] / max(result["memo_us"], 1e-9), 1)
+    return result
+
+
+def bench_normalization(source: str, normalize: Callable[[Dict[str, Any]], Dict[str, Any]],
+                        jobs: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    def one(job):
+        return to_canonical_document(normalize(job), source)
+
+    job_schema._date_strategies.clear()
+    per_doc_us = time_per_value(one, jobs, repeat)
+    return {
+        "source": source,
+        "docs": len(jobs),
+        "us_per_doc": per_doc_us,
+        "docs_per_s": round(1e6 / per_doc_us, 1) if per_doc_us else None,
+    }
+
+
+def bench_salaries(source: str, descriptions: List[str], repeat: int) -> Dict[str, Any]:
+    return {
+        "source": source,
+        "docs": len(descriptions),
+        "legacy_found": sum(1 for text in descriptions if legacy_extract_salary(text)[0] is not None),
+        "found": sum(1 for text in descriptions if extract_salary(text)[0] is not None),
+        "legacy_us": time_per_value(legacy_extract_salary, descriptions, repeat),
+        "combined_us": time_per_value(extract_salary, descriptions, repeat),
+    }
+
+
+def snapshot_descriptions() -> List[str]:
+    """Descriptions from the captured CSV / JSON snapshots (see snapshot_loader.py)."""
+    from backend.app.api.snapshot_loader import DEFAULT_SNAPSHOT_PATHS, find_snapshot_files, parse_snapshot
+    return [doc["description"] for path in find_snapshot_files(DEFAULT_SNAPSHOT_PATHS)
+            for doc in parse_snapshot(path)[1]]
+
+
+def run(fixture_dir: str = DEFAULT_FIXTURE_DIR, synthetic: int = 5000, repeat: int = 5,
+        output: Optional[str] = None) -> str:
+    """
+    Run the suite and write the JSON results file.
+
+    Returns:
+        Path of the results file.
+    """
+    fixture_jobs = load_fixture_jobs(fixture_dir)
+    date_results, normalize_results, salary_results = [], [], []
+
+    if fixture_jobs:
+        from backend.app.api.orchestrator import SOURCES
+        normalizers = {source.name: source.normalizer for source in SOURCES}
+        for source, jobs in sorted(fixture_jobs.items()):
+            normalize = normalizers[source]
+            dates = [to_canonical_document(normalize(job), source).get("posted_date") for job in jobs]
+            raw_dates = [normalize(job).get("Date") for job in jobs]
+            print(f"{source}: {len(jobs)} recorded postings ({sum(d is not None for d in dates)} dated)")
+            date_results.append(bench_dates(source, raw_dates, repeat))
+            normalize_results.append(bench_normalization(source, normalize, jobs, repeat))
+            descriptions = [str(normalize(job).get("Description") or "") for job in jobs]
+            salary_results.append(bench_salaries(source, descriptions, repeat))
+    else:
+        print(f"No fixtures in {fixture_dir}; using {synthetic} synthetic postings per source.")
+        for source, values in synthetic_dates(synthetic).items():
+            date_results.append(bench_dates(source, values, repeat))
+            jobs = [{"ID": i, "Position": "Software Engineer", "Company": "Acme",
+                     "Location": "Remote", "Tags": "python, sql", "Date": value,
+                     "Salary_Min": "80k"} for i, value in enumerate(values)]
+            normalize_results.append(bench_normalization(source, dict, jobs, repeat))
+        salary_results.append(bench_salaries("snapshots", snapshot_descriptions(), repeat))
+
+    for result in date_results:
+        print(f"  {result['source']:<10} legacy={result['legacy_us']}µs "
+              f"no-memo={result['no_memo_us']}µs memo={result['memo_us']}µs "
+              f"({result['speedup_vs_legacy']}x)")
+    for result in normalize_results:
+        print(f"  {result['source']:<10} {result['docs_per_s']} docs/s")
+    for result in salary_results:
+        print(f"  {result['source']:<10} salaries: legacy={result['legacy_us']}µs "
+              f"({result['legacy_found']} found) combined={result['combined_us']}µs "
+              f"({result['found']} found) of {result['docs']}")
+
+    report = {
+        "benchmark": "job_schema",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "fixture_dir": fixture_dir,
+            "fixtures": bool(fixture_jobs),
+            "synthetic": synthetic,
+            "repeat": repeat,
+        },
+        "date_parsing": date_results,
+        "normalization": normalize_results,
+        "salary_extraction": salary_results,
+    }
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H_%M_%S")
+        output = os.path.join(RESULTS_DIR, f"job_schema_{timestamp}.json")
+    with open(output, "w", encoding="utf-8") as fd:
+        json.dump(report, fd, indent=2)
+    print(f"Results written to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark job_schema normalization.")
+    parser.add_argument("--fixture-dir", default=os.getenv("INGESTION_FIXTURE_DIR", DEFAULT_FIXTURE_DIR))
+    parser.add_argument("--synthetic", type=int, default=5000,
+                        help="Synthetic postings per source when there are no fixtures")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    args = parser.parse_args()
+    run(args.fixture_dir, args.synthetic, args.repeat, args.output)
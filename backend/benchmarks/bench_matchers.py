@@ -0,0 +1,244 @@
+"""
+Benchmark suite for JobMatcher (TF-IDF) and SemanticJobMatcher.
+
+For each corpus size, builds both artifacts from a synthetic corpus, then measures:
+  - artifact build time and size on disk
+  - artifact load time, and RSS growth while loading (measured in a fresh process)
+  - recommend() latency (p50 / p99 / mean) over random user profiles
+  - throughput (requests/s) with N concurrent callers
+
+The semantic matcher uses HashingEncoder, so nothing is downloaded. Results are
+written as JSON (one file per run) so runs can be diffed or plotted.
+
+Run from project root:
+  python -m backend.benchmarks.bench_matchers
+  python -m backend.benchmarks.bench_matchers --sizes 10000 --queries 200
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+from backend.app.ml.logic import JobMatcher, SemanticJobMatcher
+from backend.benchmarks.synthetic import (
+    HashingEncoder,
+    make_corpus,
+    make_user_profiles,
+    write_semantic_artifact,
+    write_tfidf_artifact,
+)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_CONCURRENCY = [1, 4, 16]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fd:
+            pages = int(fd.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / 1e6 if platform.system() == "Darwin" else peak / 1e3
+
+
+def load_matcher(name: str, artifact_path: str):
+    if name == "JobMatcher":
+        return JobMatcher(model_path=artifact_path)
+    return SemanticJobMatcher(model_path=artifact_path, encoder=HashingEncoder())
+
+
+def measure_load(factory: Callable[[], Any]):
+    """Construct a matcher, returning (matcher, seconds)."""
+    start = time.perf_counter()
+    matcher = factory()
+    return matcher, time.perf_counter() - start
+
+
+def _load_rss_delta_mb(name: str, artifact_path: str) -> float:
+    rss_before = current_rss_mb()
+    matcher = load_matcher(name, artifact_path)  # noqa: F841 - held until measured
+    return current_rss_mb() - rss_before
+
+
+def measure_load_rss(name: str, artifact_path: str) -> float:
+    """
+    RSS growth (MB) from loading the artifact, in a freshly spawned interpreter.
+
+    In this process the corpus and earlier matchers have already been built and
+    freed, so the allocator reuses that memory and a load barely moves RSS.
+    """
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+        return pool.submit(_load_rss_delta_mb, name, artifact_path).result()
+
+
+def measure_latency(recommend: Callable[[dict], Any], profiles: List[dict],
+                    warmup: int) -> Dict[str, float]:
+    """Sequential recommend() calls; returns latency percentiles in ms."""
+    for profile in profiles[:warmup]:
+        recommend(profile)
+    samples = []
+    for profile in profiles:
+        start = time.perf_counter()
+        recommend(profile)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.array(samples)
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+        "mean_ms": round(float(samples.mean()), 3),
+        "samples": len(samples),
+    }
+
+
+def measure_throughput(recommend: Callable[[dict], Any], profiles: List[dict],
+                       concurrency: int) -> Dict[str, float]:
+    """Issue every profile through a pool of `concurrency` callers; returns req/s."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(recommend, profiles))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": len(profiles),
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(profiles) / elapsed, 2),
+    }
+
+
+def bench_matcher(name: str, artifact_path: str, build_seconds: float,
+                  factory: Callable[[], Any], profiles: List[dict],
+                  concurrency: List[int], warmup: int, top_n: int) -> Dict[str, Any]:
+    matcher, load_seconds = measure_load(factory)
+    # The matcher (and its memory) is released when bench_matcher returns
+    recommend = partial(matcher.recommend, top_n=top_n)
+
+    result = {
+        "matcher": name,
+        "build_s": round(build_seconds, 3),
+        "artifact_mb": round(os.path.getsize(artifact_path) / 1e6, 2),
+        "load_s": round(load_seconds, 3),
+        "load_rss_mb": round(measure_load_rss(name, artifact_path), 1),
+        "latency": measure_latency(recommend, profiles, warmup),
+        "throughput": [measure_throughput(recommend, profiles, c) for c in concurrency],
+    }
+    return result
+
+
+def bench_size(n_jobs: int, artifact_dir: str, profiles: List[dict],
+               concurrency: List[int], warmup: int, top_n: int) -> List[Dict[str, Any]]:
+    print(f"Building synthetic corpus of {n_jobs} jobs...")
+    df = make_corpus(n_jobs)
+    encoder = HashingEncoder()
+    results = []
+
+    tfidf_path = os.path.join(artifact_dir, f"model_{n_jobs}.pkl")
+    start = time.perf_counter()
+    write_tfidf_artifact(df, tfidf_path)
+    tfidf_build = time.perf_counter() - start
+    print(f"  JobMatcher artifact built in {tfidf_build:.1f}s")
+    results.append(bench_matcher(
+        "JobMatcher", tfidf_path, tfidf_build,
+        partial(load_matcher, "JobMatcher", tfidf_path),
+        profiles, concurrency, warmup, top_n,
+    ))
+
+    semantic_path = os.path.join(artifact_dir, f"semantic_model_{n_jobs}.pkl")
+    start = time.perf_counter()
+    write_semantic_artifact(df, semantic_path, encoder)
+    semantic_build = time.perf_counter() - start
+    print(f"  SemanticJobMatcher artifact built in {semantic_build:.1f}s")
+    results.append(bench_matcher(
+        "SemanticJobMatcher", semantic_path, semantic_build,
+        partial(load_matcher, "SemanticJobMatcher", semantic_path),
+        profiles, concurrency, warmup, top_n,
+    ))
+
+    for result in results:
+        result["corpus_size"] = n_jobs
+        print(f"  {result['matcher']}: p50={result['latency']['p50_ms']}ms "
+              f"p99={result['latency']['p99_ms']}ms load={result['load_s']}s")
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(sizes: List[int], queries: int = 100, warmup: int = 5,
+        concurrency: Optional[List[int]] = None, top_n: int = 10,
+        output: Optional[str] = None) -> str:
+    """
+    Run the suite and write the JSON results file.
+
+    Returns:
+        Path of the results file.
+    """
+    concurrency = concurrency or DEFAULT_CONCURRENCY
+    profiles = make_user_profiles(queries)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="matcher-bench-") as artifact_dir:
+        for n_jobs in sizes:
+            results.extend(bench_size(n_jobs, artifact_dir, profiles,
+                                      concurrency, warmup, top_n))
+
+    report = {
+        "benchmark": "matchers",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "sizes": sizes,
+            "queries": queries,
+            "warmup": warmup,
+            "concurrency": concurrency,
+            "top_n": top_n,
+            "encoder": "HashingEncoder",
+        },
+        "results": results,
+    }
+
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H_%M_%S")
+        output = os.path.join(RESULTS_DIR, f"matchers_{timestamp}.json")
+    with open(output, "w", encoding="utf-8") as fd:
+        json.dump(report, fd, indent=2)
+    print(f"Results written to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the job matchers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.warmup, args.concurrency, args.top_n, args.output)
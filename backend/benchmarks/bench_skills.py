@@ -0,0 +1,181 @@
+"""
+Throughput benchmark for skill extraction (skills.py).
+
+Measures, over the same postings:
+  - automaton build time for SKILL_VOCABULARY
+  - extraction throughput (docs/s, MB/s of title + description) of the Aho-Corasick
+    matcher versus one precompiled whole-word regex per alias
+  - coverage: postings with any skills_required from the source alone vs after extraction
+
+Postings come from the recorded HTTP fixtures (INGESTION_HTTP_MODE=record, see
+backend/app/api/http_client.py) when there are any; otherwise from the captured
+CSV / JSON snapshots (see backend/app/api/snapshot_loader.py). Results are written as JSON.
+
+Run from project root:
+  python -m backend.benchmarks.bench_skills
+  python -m backend.benchmarks.bench_skills --fixture-dir path/to/fixtures --repeat 5
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.app.api import skills
+from backend.app.api.http_client import DEFAULT_FIXTURE_DIR
+from backend.app.api.job_schema import _tags_to_skills
+from backend.app.api.snapshot_loader import DEFAULT_SNAPSHOT_PATHS, find_snapshot_files, snapshot_source
+from backend.app.api.text_match import KeywordMatcher, normalize_keyword
+from backend.benchmarks.bench_job_schema import RESULTS_DIR, _git_revision, load_fixture_jobs
+
+# (source, text, source skills) per posting
+Posting = Tuple[str, str, List[str]]
+
+
+def fixture_postings(fixture_dir: str) -> List[Posting]:
+    """Postings from recorded responses, through each source's normalizer."""
+    from backend.app.api.orchestrator import SOURCES
+    normalizers = {source.name: source.normalizer for source in SOURCES}
+    postings = []
+    for source, jobs in sorted(load_fixture_jobs(fixture_dir).items()):
+        for job in jobs:
+            normalized = normalizers[source](job)
+            text = f"{normalized.get('Position') or ''}\n{normalized.get('Description') or ''}"
+            postings.append((source, text, _tags_to_skills(normalized.get("Tags") or normalized.get("JobCategory"))))
+    return postings
+
+
+def snapshot_postings() -> List[Posting]:
+    """Postings from the normalizer CSVs under api/*/csv (raw columns, before extraction)."""
+    import csv
+
+    postings = []
+    for path in find_snapshot_files(DEFAULT_SNAPSHOT_PATHS):
+        source = snapshot_source(path)
+        if source is None or not path.endswith(".csv"):
+            continue
+        with open(path, newline="", encoding="utf-8") as fd:
+            for row in csv.DictReader(fd):
+                if "Position" not in row:
+                    break
+                postings.append((source, f"{row['Position']}\n{row.get('Description') or ''}",
+                                 _tags_to_skills(row.get("Tags"))))
+    return postings
+
+
+def regex_extractor() -> Callable[[str], List[str]]:
+    """Baseline: one compiled whole-word regex per alias, each scanning the whole text."""
+    patterns = []
+    for name, aliases in skills.SKILL_VOCABULARY.items():
+        for alias in dict.fromkeys(normalize_keyword(a) for a in [name, *aliases]):
+            patterns.append((name, re.compile(r"(?<!\w)" + re.escape(alias) + r"(?!\w)", re.IGNORECASE)))
+
+    def extract(text: str) -> List[str]:
+        found = []
+        for name, pattern in patterns:
+            if name not in found and pattern.search(text):
+                found.append(name)
+        return found
+
+    return extract
+
+
+def best_seconds(fn: Callable[[str], List[str]], texts: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(fixture_dir: str = DEFAULT_FIXTURE_DIR, repeat: int = 3, output: Optional[str] = None) -> str:
+    """
+    Run the benchmark and write the JSON results file.
+
+    Returns:
+        Path of the results file.
+    """
+    postings = fixture_postings(fixture_dir)
+    data = "fixtures"
+    if not postings:
+        print(f"No fixtures in {fixture_dir}; using the captured snapshots.")
+        postings = snapshot_postings()
+        data = "snapshots"
+    texts = [text for _, text, _ in postings]
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    print(f"{len(postings)} postings ({megabytes:.1f} MB of text) from {data}")
+
+    start = time.perf_counter()
+    KeywordMatcher(
+        (alias for name, aliases in skills.SKILL_VOCABULARY.items() for alias in [name, *aliases]),
+        whole_words=True,
+    )
+    build_ms = (time.perf_counter() - start) * 1000
+    skills.get_skill_matcher()
+
+    timings: Dict[str, float] = {
+        "automaton": best_seconds(skills.extract_skills, texts, repeat),
+        "regex_per_alias": best_seconds(regex_extractor(), texts, repeat),
+    }
+    extractors = {
+        name: {
+            "seconds": round(seconds, 4),
+            "docs_per_s": round(len(texts) / seconds, 1) if seconds else None,
+            "mb_per_s": round(megabytes / seconds, 2) if seconds else None,
+        }
+        for name, seconds in timings.items()
+    }
+    for name, result in extractors.items():
+        print(f"  {name:<16} {result['docs_per_s']} docs/s, {result['mb_per_s']} MB/s")
+
+    by_source: Dict[str, Dict[str, int]] = {}
+    for source, text, source_skills in postings:
+        counts = by_source.setdefault(source, {"postings": 0, "with_source_skills": 0, "with_skills": 0})
+        counts["postings"] += 1
+        counts["with_source_skills"] += bool(source_skills)
+        counts["with_skills"] += bool(skills.merge_skills(source_skills, text))
+    for source, counts in sorted(by_source.items()):
+        print(f"  {source:<10} skills on {counts['with_source_skills']} -> "
+              f"{counts['with_skills']} of {counts['postings']} postings")
+
+    report = {
+        "benchmark": "skills",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"fixture_dir": fixture_dir, "data": data, "repeat": repeat},
+        "vocabulary": {
+            "skills": len(skills.SKILL_VOCABULARY),
+            "patterns": len(skills.get_skill_matcher()),
+            "build_ms": round(build_ms, 2),
+        },
+        "postings": len(postings),
+        "megabytes": round(megabytes, 2),
+        "extractors": extractors,
+        "speedup_vs_regex": round(timings["regex_per_alias"] / timings["automaton"], 1),
+        "coverage": by_source,
+    }
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H_%M_%S")
+        output = os.path.join(RESULTS_DIR, f"skills_{timestamp}.json")
+    with open(output, "w", encoding="utf-8") as fd:
+        json.dump(report, fd, indent=2)
+    print(f"Results written to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction.")
+    parser.add_argument("--fixture-dir", default=os.getenv("INGESTION_FIXTURE_DIR", DEFAULT_FIXTURE_DIR))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Results file (default benchmarks/results/)")
+    args = parser.parse_args()
+    run(args.fixture_dir, args.repeat, args.output)
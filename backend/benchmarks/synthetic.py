@@ -0,0 +1,179 @@
+"""
+Synthetic job corpora and offline artifacts for benchmarking the matchers.
+
+Builds DataFrames shaped like the output of train.fetch_jobs_data() and writes
+model.pkl / semantic_model.pkl artifacts in the same format train.py produces,
+so JobMatcher and SemanticJobMatcher can be loaded from them unchanged.
+
+HashingEncoder stands in for the SentenceTransformer so the suite runs offline
+and in seconds; it exposes the same encode() call the matchers use.
+"""
+
+import os
+import pickle
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+from backend.app.api.top_jobs import TOP_JOBS
+
+SKILLS = [
+    "python", "java", "javascript", "react", "sql", "aws", "docker",
+    "kubernetes", "excel", "salesforce", "cdl", "forklift", "nursing",
+    "patient care", "cpr", "hvac", "plc", "autocad", "tableau", "pytorch",
+    "machine learning", "statistics", "linux", "networking", "sap",
+    "customer service", "logistics", "scheduling", "inventory", "welding",
+]
+
+WORDS = [
+    "pipeline", "analytics", "platform", "clinical", "warehouse", "route",
+    "dispatch", "security", "compliance", "testing", "deployment", "budget",
+    "forecast", "vendor", "contract", "install", "repair", "inspection",
+    "training", "reporting", "dashboard", "model", "research", "design",
+    "infrastructure", "network", "database", "frontend", "backend", "cloud",
+    "sales", "account", "territory", "quota", "shift", "safety",
+    "maintenance", "electrical", "solar", "turbine", "insurance", "policy",
+    "claims", "classroom", "curriculum", "student", "therapy", "patient",
+]
+
+LOCATIONS = [
+    "Remote", "New York, NY", "San Francisco, CA", "Austin, TX",
+    "Chicago, IL", "Seattle, WA", "Denver, CO", "Atlanta, GA",
+    "Boston, MA", "Portland, OR", "Remote, US", "Hybrid - Dallas, TX",
+]
+
+EMBEDDING_DIM = 384
+
+
+class HashingEncoder:
+    """
+    Deterministic, dependency-light replacement for SentenceTransformer.encode.
+
+    Hashes word uni/bigrams into a fixed-width L2-normalised float32 vector.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self._vectorizer = HashingVectorizer(
+            n_features=dim,
+            ngram_range=(1, 2),
+            alternate_sign=True,
+            norm="l2",
+        )
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), 10000):
+            chunk = texts[start:start + 10000]
+            vectors[start:start + len(chunk)] = (
+                self._vectorizer.transform(chunk).toarray()
+            )
+        return vectors[0] if single else vectors
+
+
+def make_corpus(n_jobs: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate n_jobs synthetic postings with the columns the matchers read.
+
+    Args:
+        n_jobs: Number of postings.
+        seed: RNG seed; the same seed always yields the same corpus.
+
+    Returns:
+        DataFrame with _id, title, company, location, description,
+        processed_text, skills_required, salary_range and source_url.
+    """
+    rng = np.random.default_rng(seed)
+    titles = np.array(TOP_JOBS)
+    words = np.array(WORDS + SKILLS)
+    skills = np.array(SKILLS)
+    locations = np.array(LOCATIONS)
+
+    title_idx = rng.integers(0, len(titles), n_jobs)
+    loc_idx = rng.integers(0, len(locations), n_jobs)
+    word_idx = rng.integers(0, len(words), (n_jobs, 40))
+    skill_idx = rng.integers(0, len(skills), (n_jobs, 4))
+    salary_min = rng.integers(30, 180, n_jobs) * 1000
+    salary_span = rng.integers(0, 60, n_jobs) * 1000
+    has_salary = rng.random(n_jobs) < 0.7
+
+    job_titles = titles[title_idx]
+    descriptions = [
+        f"{job_titles[i].lower()} " + " ".join(words[word_idx[i]])
+        for i in range(n_jobs)
+    ]
+
+    return pd.DataFrame({
+        "_id": [f"{i:024x}" for i in range(n_jobs)],
+        "title": job_titles,
+        "company": [f"Company {i % 5000}" for i in range(n_jobs)],
+        "location": locations[loc_idx],
+        "description": descriptions,
+        "processed_text": descriptions,
+        "skills_required": [list(skills[row]) for row in skill_idx],
+        "salary_range": [
+            {"min": float(lo), "max": float(lo + span), "currency": "USD"}
+            if ok else {"min": None, "max": None, "currency": "USD"}
+            for lo, span, ok in zip(salary_min, salary_span, has_salary)
+        ],
+        "source_url": [f"https://example.com/jobs/{i}" for i in range(n_jobs)],
+    })
+
+
+def make_user_profiles(n_profiles: int, seed: int = 1) -> List[dict]:
+    """Random user preference payloads shaped like routes_ml.UserPreferences."""
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(n_profiles):
+        salary_min = int(rng.integers(0, 150)) * 1000
+        profiles.append({
+            "desired_locations": list(rng.choice(LOCATIONS, 2, replace=False)),
+            "target_roles": list(rng.choice(TOP_JOBS, 2, replace=False)),
+            "skills": list(rng.choice(SKILLS, 3, replace=False)),
+            "experience_level": "mid",
+            "salary_min": salary_min or None,
+            "salary_max": None,
+        })
+    return profiles
+
+
+def _ensure_parent_dir(path: str) -> None:
+    directory = os.path.dirname(path)
+    # A bare filename lands in the working directory, which already exists
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def write_tfidf_artifact(df: pd.DataFrame, path: str) -> str:
+    """Fit TF-IDF like train.build_model and pickle (tfidf, matrix, df) to path."""
+    tfidf = TfidfVectorizer(
+        max_features=5000,
+        ngram_range=(1, 2),
+        min_df=2,
+        max_df=0.85,
+        sublinear_tf=True
+    )
+    tfidf_matrix = tfidf.fit_transform(df["processed_text"])
+    _ensure_parent_dir(path)
+    with open(path, "wb") as fd:
+        pickle.dump((tfidf, tfidf_matrix, df), fd)
+    return path
+
+
+def write_semantic_artifact(df: pd.DataFrame, path: str,
+                            encoder: HashingEncoder) -> str:
+    """Encode descriptions like train.build_semantic_model and pickle the dict."""
+    embeddings = encoder.encode(df["processed_text"].tolist())
+    _ensure_parent_dir(path)
+    with open(path, "wb") as fd:
+        pickle.dump({
+            "embeddings": embeddings,
+            "df": df,
+            "job_ids": df["_id"].astype(str).tolist(),
+        }, fd)
+    return path
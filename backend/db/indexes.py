@@ -53,6 +53,11 @@ async def ensure_indexes():
         unique=True,
         name="uniq_external_job",
     )
+    # Near-duplicate clusters across sources (app/api/near_duplicates.py)
+    await db.jobs.create_index(
+        [("cluster_id", 1)],
+        name="idx_jobs_cluster",
+    )
 
     # Job Matches
     await db.job_matches.create_index(
@@ -72,3 +77,13 @@ async def ensure_indexes():
         [("relevancy_score", 1)],
         name="idx_job_matches_score",
     )
+
+    # Ingestion run history (latest runs / last successful run per source)
+    await db.ingestion_runs.create_index(
+        [("sources", 1), ("started_at", -1)],
+        name="idx_ingestion_runs_sources_started",
+    )
+    await db.ingestion_runs.create_index(
+        [("succeeded_sources", 1), ("started_at", -1)],
+        name="idx_ingestion_runs_succeeded_started",
+    )
@@ -1,6 +1,7 @@
 import os
 from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
+from backend.db.monitoring import command_listeners
 
 load_dotenv()
 class MongoManager:
@@ -11,7 +12,7 @@ class MongoManager:
     async def connect(self, db_name: str):
         uri = os.getenv("MONGODB_CONNECT_STRING")
 
-        self.client = AsyncMongoClient(uri)
+        self.client = AsyncMongoClient(uri, event_listeners=command_listeners())
         self.db = self.client[db_name]
 
         await self.client.admin.command("ping")
@@ -0,0 +1,140 @@
+"""
+pymongo command monitoring: per-collection latency metrics and a slow-query log.
+
+COMMAND_MONITOR is passed as an event listener to every MongoClient /
+AsyncMongoClient the app creates (see command_listeners()). Each command is
+recorded in mongo_command_duration_seconds{collection, command}; commands
+slower than MONGO_SLOW_QUERY_MS (default 100) are printed with their query
+shape (filter/pipeline with literal values replaced by "?"), which is enough
+to spot regex scans and filters without a supporting index.
+"""
+
+import json
+import os
+
+from pymongo import monitoring
+
+from backend.utils.metrics import REGISTRY
+
+SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", "100"))
+
+MONGO_COMMAND_DURATION_SECONDS = REGISTRY.histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency, by collection and command.",
+    ["collection", "command"],
+)
+MONGO_COMMAND_FAILURES_TOTAL = REGISTRY.counter(
+    "mongo_command_failures_total",
+    "MongoDB commands that returned an error, by collection and command.",
+    ["collection", "command"],
+)
+MONGO_SLOW_COMMANDS_TOTAL = REGISTRY.counter(
+    "mongo_slow_commands_total",
+    "MongoDB commands slower than MONGO_SLOW_QUERY_MS, by collection and command.",
+    ["collection", "command"],
+)
+
+# Handshake, auth and session housekeeping; not useful as query metrics
+_IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "buildinfo",
+    "saslStart", "saslContinue", "authenticate", "getnonce", "endSessions",
+    "killCursors",
+}
+
+# Where each command keeps the part of its body that describes the query
+_SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+    "findAndModify": ("query", "sort"),
+    "createIndexes": ("indexes",),
+}
+
+
+def query_shape(value):
+    """
+    Replace literal values with "?" while keeping field names and operators.
+
+    {"title": {"$regex": "nurse", "$options": "i"}} -> {"title": {"$regex": "?", "$options": "?"}}
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = query_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def command_shape(command_name: str, command) -> dict:
+    """Shape of the query-describing fields of one command document."""
+    shape = {}
+    for field in _SHAPE_FIELDS.get(command_name, ()):
+        if field in command:
+            body = command[field]
+            if field in ("updates", "deletes"):
+                body = [op.get("q", {}) for op in body]
+            shape[field] = query_shape(body)
+    return shape
+
+
+def _collection_name(command_name: str, command) -> str:
+    if command_name == "getMore":
+        return str(command.get("collection", ""))
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Records latency per (collection, command) and logs slow commands."""
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS):
+        self.slow_ms = slow_ms
+        # (connection_id, request_id) -> (collection, command document)
+        self._in_flight = {}
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        self._in_flight[(event.connection_id, event.request_id)] = (
+            _collection_name(event.command_name, event.command),
+            event.command,
+        )
+
+    def _finish(self, event, failed: bool):
+        pending = self._in_flight.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        collection, command = pending
+        name = event.command_name
+        seconds = event.duration_micros / 1e6
+
+        MONGO_COMMAND_DURATION_SECONDS.observe(seconds, collection=collection, command=name)
+        if failed:
+            MONGO_COMMAND_FAILURES_TOTAL.inc(collection=collection, command=name)
+
+        if seconds * 1000 >= self.slow_ms:
+            MONGO_SLOW_COMMANDS_TOTAL.inc(collection=collection, command=name)
+            shape = json.dumps(command_shape(name, command), default=str)
+            print(f"🐢 Slow Mongo {name} on {event.database_name}.{collection}: "
+                  f"{seconds * 1000:.1f}ms shape={shape}")
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+COMMAND_MONITOR = CommandMonitor()
+
+
+def command_listeners() -> list:
+    """Event listeners to pass as MongoClient(..., event_listeners=...)."""
+    return [COMMAND_MONITOR]
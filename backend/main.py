@@ -1,3 +1,4 @@
+import asyncio
 import os
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,8 +16,12 @@ from backend.routers import (
     userstats,
     userjobinteractions,
     ingestion,
+    metrics,
 )
 from backend.app.ml import routes_ml
+from backend.services.ingestion_jobs import ingestion_jobs
+from backend.services.ingestion_scheduler import IngestionScheduler, scheduler_enabled
+from backend.utils.request_metrics import RequestMetricsMiddleware
 
 load_dotenv()
 
@@ -25,7 +30,21 @@ load_dotenv()
 async def lifespan(app: FastAPI):
     await mongo.connect(os.getenv("PROD_DB"))
     await ensure_indexes()
+    # Off unless INGESTION_SCHEDULER_ENABLED=true (see ingestion_scheduler.py)
+    scheduler = IngestionScheduler.from_env() if scheduler_enabled() else None
+    if scheduler:
+        scheduler.start()
+    # Reclaims deleted / replaced rows of the in-memory semantic index (see routes_ml)
+    compactor = None
+    if routes_ml.SEMANTIC_INDEX_COMPACT_INTERVAL > 0:
+        compactor = asyncio.create_task(routes_ml.compact_periodically())
     yield
+    if compactor:
+        compactor.cancel()
+        await asyncio.gather(compactor, return_exceptions=True)
+    if scheduler:
+        await scheduler.stop()
+    await ingestion_jobs.shutdown()
     await mongo.close()
 
 
@@ -33,6 +52,9 @@ app = FastAPI(lifespan=lifespan)
 
 API_SECRET = os.getenv("API_SECRET").strip()
 
+# Prometheus scrape endpoint; served without the secret header
+METRICS_PATH = "/metrics"
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -46,7 +68,7 @@ app.add_middleware(
 
 @app.middleware("http")
 async def verify_secret_header(request: Request, call_next):
-    if request.method == "OPTIONS":
+    if request.method == "OPTIONS" or request.url.path == METRICS_PATH:
         return await call_next(request)
     secret = request.headers.get("aijobhunt-api-secret")
     if secret != API_SECRET:
@@ -54,6 +76,9 @@ async def verify_secret_header(request: Request, call_next):
         return JSONResponse(status_code=403, content={"detail": "Forbidden"})
     return await call_next(request)
 
+# Added last so it is the outermost middleware and also times rejected requests
+app.add_middleware(RequestMetricsMiddleware)
+
 app.include_router(userstats.router, prefix="/user-stats", tags=["User Stats"])
 app.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
@@ -74,4 +99,5 @@ app.include_router(
 )
 app.include_router(ingestion.router, prefix="/ingestion", tags=["Ingestion"])
 app.include_router(routes_ml.router, prefix="/ml", tags=["Machine Learning"])
-app.include_router(users.router, prefix="/users", tags=["Users"])
\ No newline at end of file
+app.include_router(users.router, prefix="/users", tags=["Users"])
+app.include_router(metrics.router, prefix=METRICS_PATH, tags=["Metrics"])
\ No newline at end of file
@@ -1,55 +1,83 @@
 """
-HTTP endpoints to trigger top-jobs data pull (Adzuna, Jobicy, SerpAPI).
-"""
-import asyncio
-from fastapi import APIRouter, HTTPException
-
-router = APIRouter()
+HTTP endpoints to trigger top-jobs data pull (Adzuna, Jobicy, SerpAPI),
+or every source at once (POST /ingestion/all), and to follow the resulting jobs.
 
+Triggers return 202 with a job id right away; the pull runs in the background
+(see backend/services/ingestion_jobs.py). Poll GET /ingestion/jobs/{job_id}.
+"""
+from typing import List, Optional
 
-def _run_adzuna_top_jobs():
-    from backend.app.api.adzuna.adzuna_top_jobs_to_mongo import run
-    return run(results_per_page=50, max_pages_per_job=1)
+from fastapi import APIRouter, HTTPException, Query
+from pymongo import DESCENDING
 
+from backend.db.mongo import get_db
+from backend.services.ingestion_jobs import ingestion_jobs
 
-def _run_jobicy_top_jobs():
-    from backend.app.api.jobicy.jobicy_to_mongo import run
-    return run(count_per_tag=100)
+router = APIRouter()
 
 
-def _run_serpapi_top_jobs():
-    from backend.app.api.serpapi.serpapi_to_mongo import run
-    return run(location="United States", num=100)
+def _submit(sources: Optional[List[str]]):
+    try:
+        job, created = ingestion_jobs.submit(sources)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**job.to_dict(), "coalesced": not created}
 
 
-@router.post("/adzuna/top-jobs")
+@router.post("/adzuna/top-jobs", status_code=202)
 async def trigger_adzuna_top_jobs():
-    """Trigger Adzuna top-jobs ingestion. Returns count inserted."""
-    try:
-        loop = asyncio.get_event_loop()
-        count = await loop.run_in_executor(None, _run_adzuna_top_jobs)
-        return {"source": "Adzuna", "inserted": count}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Start Adzuna top-jobs ingestion. Returns the job to poll."""
+    return _submit(["Adzuna"])
 
 
-@router.post("/jobicy/top-jobs")
+@router.post("/jobicy/top-jobs", status_code=202)
 async def trigger_jobicy_top_jobs():
-    """Trigger Jobicy top-jobs ingestion. Returns count inserted."""
-    try:
-        loop = asyncio.get_event_loop()
-        count = await loop.run_in_executor(None, _run_jobicy_top_jobs)
-        return {"source": "Jobicy", "inserted": count}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Start Jobicy top-jobs ingestion. Returns the job to poll."""
+    return _submit(["Jobicy"])
 
 
-@router.post("/serpapi/top-jobs")
+@router.post("/serpapi/top-jobs", status_code=202)
 async def trigger_serpapi_top_jobs():
-    """Trigger SerpAPI top-jobs ingestion. Returns count inserted."""
-    try:
-        loop = asyncio.get_event_loop()
-        count = await loop.run_in_executor(None, _run_serpapi_top_jobs)
-        return {"source": "SerpAPI", "inserted": count}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Start SerpAPI top-jobs ingestion. Returns the job to poll."""
+    return _submit(["SerpAPI"])
+
+
+@router.post("/all", status_code=202)
+async def trigger_all_sources(sources: Optional[List[str]] = Query(None)):
+    """
+    Start ingestion of every source (or ?sources=Adzuna&sources=Jobicy) in parallel,
+    deduped across sources. Returns the job to poll.
+    """
+    return _submit(sources)
+
+
+@router.get("/jobs")
+async def list_ingestion_jobs():
+    """Jobs started by this instance, newest first."""
+    return [job.to_dict() for job in ingestion_jobs.recent()]
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Status, per-source progress, counts and errors of one ingestion job."""
+    job = ingestion_jobs.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    # Older job, or one started by another instance
+    run = await get_db().ingestion_runs.find_one({"_id": job_id})
+    if run is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    run["job_id"] = run.pop("_id")
+    return run
+
+
+@router.get("/runs")
+async def list_ingestion_runs(source: Optional[str] = None,
+                              limit: int = Query(20, ge=1, le=200)):
+    """Most recent ingestion runs (scheduled or manual), newest first."""
+    query = {"sources": source} if source else {}
+    cursor = get_db().ingestion_runs.find(query).sort("started_at", DESCENDING).limit(limit)
+    runs = await cursor.to_list(length=limit)
+    for run in runs:
+        run["job_id"] = run.pop("_id")
+    return runs
@@ -1,6 +1,8 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Depends
 from bson import ObjectId
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timezone
 
 from backend.db.mongo import get_db
@@ -15,6 +17,25 @@ from backend.models.user import UserPreferencesUpdate
 router = APIRouter()
 
 
+async def sync_semantic_index(upserted: Optional[List[dict]] = None,
+                              removed: Optional[List[str]] = None) -> None:
+    """
+    Apply a job change to the recommender's in-memory index (see
+    routes_ml.index_jobs / unindex_jobs) so it shows without retraining.
+    Encoding runs on the default executor; failures are logged, not raised.
+    """
+    from backend.app.ml.routes_ml import index_jobs, unindex_jobs
+
+    loop = asyncio.get_running_loop()
+    try:
+        if upserted:
+            await loop.run_in_executor(None, index_jobs, upserted)
+        if removed:
+            await loop.run_in_executor(None, unindex_jobs, removed)
+    except Exception as e:
+        print(f"⚠️ Could not update the semantic index: {e}")
+
+
 @router.post("/", response_model=JobInDB, status_code=201)
 async def create_job(job: JobPosting):
     db = get_db()
@@ -34,6 +55,7 @@ async def create_job(job: JobPosting):
     new_job = await db.jobs.find_one(
         {"_id": result.inserted_id}
     )
+    await sync_semantic_index(upserted=[new_job])
 
     return job_helper(new_job)
 
@@ -122,6 +144,7 @@ async def _apply_job_update(job_id: str, updates: JobPostingUpdate):
     updated = await db.jobs.find_one(
         {"_id": ObjectId(job_id)},
     )
+    await sync_semantic_index(upserted=[updated])
 
     return job_helper(updated)
 
@@ -150,6 +173,7 @@ async def delete_job(job_id: str):
 
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
+    await sync_semantic_index(removed=[job_id])
 
     return
 
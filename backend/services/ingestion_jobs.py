@@ -0,0 +1,334 @@
+"""
+Background ingestion jobs with status polling.
+
+Triggers (the /ingestion endpoints and the scheduler) call
+ingestion_jobs.submit(sources) and get a job back immediately; the pull itself
+runs orchestrator.run_all() on a dedicated, bounded thread pool so request
+handlers and the default executor are never tied up for minutes. Clients poll
+GET /ingestion/jobs/{job_id} for status, per-source progress, counts and errors.
+
+A trigger for sources an active job already covers returns that job instead of
+starting another (coalesced). Each source is guarded by a Mongo lease lock
+(ingestion_locks) owned by the job, not the instance, so a trigger that only partly
+overlaps a running job (e.g. "all" during a scheduled Adzuna run) skips the sources
+that job holds, here or on another instance, and reports them as skipped. While a
+job runs, a heartbeat renews its leases every third of INGESTION_LOCK_TTL, so a long
+pull keeps its locks; a source whose lease was lost anyway (e.g. the event loop was
+blocked past the TTL) is reported as failed.
+
+Every job is recorded in ingestion_runs under its job id, so status stays available
+after it drops out of the in-memory history or on another instance; its per-source
+run metrics (result.sources) also go to GET /metrics (see ingestion_metrics.py).
+Jobs a run inserted or updated are added to the recommender's semantic index right
+away (routes_ml.index_jobs), without waiting for a retrain.
+
+Env:
+- INGESTION_WORKERS (optional) — jobs that run at the same time, default 2
+- INGESTION_LOCK_TTL (optional) — lease seconds, default 7200; renewed while a job runs, so a
+  crashed run frees its lock after this
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from backend.db.mongo import get_db
+from backend.services.ingestion_metrics import observe_ingestion_run
+
+DEFAULT_WORKERS = 2
+DEFAULT_LOCK_TTL = 2 * 3600
+# Lease renewals per TTL while a job runs; a couple of missed beats still keep the lock
+LOCK_RENEWALS_PER_TTL = 3
+# Finished jobs kept in memory; older ones are served from ingestion_runs
+JOB_HISTORY = 100
+# Jobs read back and embedded per batch when feeding the semantic index
+INDEX_BATCH_SIZE = 500
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+async def acquire_ingestion_lock(db, source: str, owner: str, ttl: float = DEFAULT_LOCK_TTL) -> bool:
+    """
+    Take the lease lock for source. Succeeds if it is free, expired, or already held by
+    owner (one job); otherwise the upsert collides with the holder's document and returns False.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        await db.ingestion_locks.find_one_and_update(
+            {"_id": source, "$or": [{"locked_until": {"$lte": now}}, {"owner": owner}]},
+            {"$set": {
+                "owner": owner,
+                "acquired_at": now,
+                "locked_until": now + timedelta(seconds=ttl),
+            }},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def renew_ingestion_lock(db, source: str, owner: str, ttl: float = DEFAULT_LOCK_TTL) -> bool:
+    """Extend the lease if owner still holds it; False when it was lost (expired and taken)."""
+    result = await db.ingestion_locks.update_one(
+        {"_id": source, "owner": owner},
+        {"$set": {"locked_until": datetime.now(timezone.utc) + timedelta(seconds=ttl)}},
+    )
+    return result.matched_count == 1
+
+
+async def release_ingestion_lock(db, source: str, owner: str) -> None:
+    """Release the lock if we still hold it."""
+    await db.ingestion_locks.delete_one({"_id": source, "owner": owner})
+
+
+def all_source_names() -> List[str]:
+    from backend.app.api.orchestrator import SOURCES
+    return [source.name for source in SOURCES]
+
+
+def _run_all_blocking(sources: List[str], progress) -> Dict[str, Any]:
+    from backend.app.api.orchestrator import run_all
+    return run_all(sources=sources, progress=progress)
+
+
+async def index_ingested_jobs(db, external_ids: List[str]) -> int:
+    """Embed jobs an ingestion run wrote into the cached semantic index; returns how many."""
+    from backend.app.ml import routes_ml
+
+    if routes_ml.semantic_matcher is None:
+        return 0
+    loop = asyncio.get_running_loop()
+    indexed = 0
+    for start in range(0, len(external_ids), INDEX_BATCH_SIZE):
+        batch = external_ids[start:start + INDEX_BATCH_SIZE]
+        docs = await db.jobs.find({"external_id": {"$in": batch}}).to_list(length=len(batch))
+        indexed += await loop.run_in_executor(None, routes_ml.index_jobs, docs)
+    return indexed
+
+
+class IngestionJob:
+    """State of one triggered pull; updated from the worker thread, read by the status endpoint."""
+
+    def __init__(self, sources: List[str], trigger: str):
+        self.job_id = uuid.uuid4().hex
+        self.sources = sources
+        self.trigger = trigger
+        self.status = "queued"
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.progress: Dict[str, Dict[str, Any]] = {name: {"phase": "queued"} for name in sources}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def update_progress(self, source: str, phase: str, report: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self.progress[source] = {"phase": phase, **(report or {})}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            progress = {name: dict(state) for name, state in self.progress.items()}
+        done = sum(1 for state in progress.values() if state["phase"] in ("written", "failed", "skipped"))
+        return {
+            "job_id": self.job_id,
+            "sources": self.sources,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {"completed": done, "total": len(self.sources), "sources": progress},
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class IngestionJobManager:
+    """Runs IngestionJobs on a bounded thread pool and keeps their status."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, lock_ttl: float = DEFAULT_LOCK_TTL):
+        self.max_workers = max_workers
+        self.lock_ttl = lock_ttl
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "IngestionJobManager":
+        return cls(
+            max_workers=int(os.getenv("INGESTION_WORKERS", str(DEFAULT_WORKERS))),
+            lock_ttl=float(os.getenv("INGESTION_LOCK_TTL", str(DEFAULT_LOCK_TTL))),
+        )
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="ingestion")
+        return self._executor
+
+    def submit(self, sources: Optional[List[str]] = None,
+               trigger: str = "manual") -> Tuple[IngestionJob, bool]:
+        """
+        Start a job for sources (default: all registered sources).
+        Returns (job, created); created is False when an active job already covers them.
+        Raises ValueError for unknown source names.
+        """
+        known = all_source_names()
+        requested = sources or known
+        unknown = [name for name in requested if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown source(s) {unknown}; expected some of {known}")
+        requested = [name for name in known if name in requested]
+
+        for job in self._jobs.values():
+            if job.active and set(requested) <= set(job.sources):
+                return job, False
+
+        job = IngestionJob(requested, trigger)
+        self._jobs[job.job_id] = job
+        self._trim_history()
+        job.task = asyncio.create_task(self._run(job))
+        return job, True
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def recent(self) -> List[IngestionJob]:
+        return list(reversed(self._jobs.values()))
+
+    async def wait(self, job: IngestionJob) -> IngestionJob:
+        """Wait for a job to finish without cancelling it if the waiter is cancelled."""
+        if job.task is not None:
+            await asyncio.shield(job.task)
+        return job
+
+    async def shutdown(self) -> None:
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def lock_owner(self, job: IngestionJob) -> str:
+        """Lease owner for a job's source locks (unique per job, traceable to this instance)."""
+        return f"{self.owner}:{job.job_id}"
+
+    async def _heartbeat(self, db, job: IngestionJob, sources: List[str], lost: List[str]) -> None:
+        """Renew the job's leases until cancelled; sources whose lease is gone go to lost."""
+        owner = self.lock_owner(job)
+        while True:
+            await asyncio.sleep(self.lock_ttl / LOCK_RENEWALS_PER_TTL)
+            for name in sources:
+                if name in lost:
+                    continue
+                try:
+                    if not await renew_ingestion_lock(db, name, owner, self.lock_ttl):
+                        print(f"⚠️ Ingestion job {job.job_id} lost its {name} lock.")
+                        lost.append(name)
+                except Exception as e:
+                    # Transient; the lease outlives a few missed renewals
+                    print(f"⚠️ Could not renew the {name} ingestion lock: {e}")
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(self._jobs) - JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    async def _run(self, job: IngestionJob) -> None:
+        db = get_db()
+        locked = []
+        try:
+            for name in job.sources:
+                if await acquire_ingestion_lock(db, name, self.lock_owner(job), self.lock_ttl):
+                    locked.append(name)
+                else:
+                    job.update_progress(name, "skipped", {"error": "already running in another job"})
+
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            await db.ingestion_runs.insert_one({
+                "_id": job.job_id,
+                "sources": job.sources,
+                "trigger": job.trigger,
+                "status": job.status,
+                "started_at": job.started_at,
+                "owner": self.owner,
+            })
+            if locked:
+                loop = asyncio.get_running_loop()
+                lost: List[str] = []
+                heartbeat = asyncio.create_task(self._heartbeat(db, job, locked, lost))
+                try:
+                    job.result = await loop.run_in_executor(
+                        self._pool(), partial(_run_all_blocking, locked, job.update_progress)
+                    )
+                finally:
+                    heartbeat.cancel()
+                # Another job may have run the source alongside this one: not a clean run
+                for name in lost:
+                    report = job.result["sources"].get(name)
+                    if report is not None and not report["error"]:
+                        report["error"] = "lost its ingestion lock during the run"
+                # Can be thousands of ids; not kept in the job status or ingestion_runs
+                changed_ids = job.result.pop("changed_ids", [])
+                if changed_ids:
+                    try:
+                        indexed = await index_ingested_jobs(db, changed_ids)
+                        if indexed:
+                            print(f"✅ Added {indexed} ingested job(s) to the semantic index.")
+                    except Exception as e:
+                        print(f"⚠️ Could not update the semantic index: {e}")
+                        # The scheduler falls back to a full model refresh (INGESTION_REFRESH_MODEL)
+                        job.result["index_error"] = str(e)
+                failed = [name for name, report in job.result["sources"].items() if report["error"]]
+            else:
+                failed = []
+            succeeded = [name for name in locked if name not in failed]
+            if not succeeded:
+                job.status = "failed" if failed else "skipped"
+            else:
+                job.status = "succeeded" if len(succeeded) == len(job.sources) else "partial"
+        except asyncio.CancelledError:
+            job.status, job.error, succeeded = "failed", "cancelled", []
+            raise
+        except Exception as e:
+            print(f"⚠️ Ingestion job {job.job_id} failed: {e}")
+            job.status, job.error, succeeded = "failed", str(e), []
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            observe_ingestion_run(job.status, job.result)
+            try:
+                await db.ingestion_runs.update_one({"_id": job.job_id}, {"$set": {
+                    "status": job.status,
+                    "succeeded_sources": succeeded,
+                    "finished_at": job.finished_at,
+                    "duration_seconds": round(
+                        (job.finished_at - (job.started_at or job.created_at)).total_seconds(), 3
+                    ),
+                    "progress": job.to_dict()["progress"],
+                    "result": job.result,
+                    "error": job.error,
+                }})
+                for name in locked:
+                    await release_ingestion_lock(db, name, self.lock_owner(job))
+            except Exception as e:
+                print(f"⚠️ Could not record ingestion job {job.job_id}: {e}")
+
+
+ingestion_jobs = IngestionJobManager.from_env()
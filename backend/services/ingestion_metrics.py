@@ -0,0 +1,83 @@
+"""
+Prometheus metrics for ingestion runs, per source.
+
+The ingestion job manager passes every finished run's result (orchestrator.run_all())
+to observe_ingestion_run(); the numbers are exposed on GET /metrics next to the
+request and Mongo metrics. Counters add up across runs; the gauges hold each
+source's latest run, so a provider getting slower or returning fewer postings shows
+up as a step in its series.
+"""
+
+from typing import Any, Dict
+
+from backend.utils.metrics import REGISTRY
+
+# Per-source fetch and write phases take seconds to tens of minutes
+PHASE_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+# Source report counts exported as ingestion_postings_total{stage=...}
+POSTING_STAGES = ("fetched", "duplicates", "kept", "inserted", "updated", "unchanged",
+                  "duplicate_keys", "near_duplicates")
+
+INGESTION_RUNS_TOTAL = REGISTRY.counter(
+    "ingestion_runs_total",
+    "Ingestion jobs finished, by status.",
+    ["status"],
+)
+INGESTION_POSTINGS_TOTAL = REGISTRY.counter(
+    "ingestion_postings_total",
+    "Postings per source and stage (fetched, kept after cross-source dedupe, write outcome).",
+    ["source", "stage"],
+)
+INGESTION_HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "ingestion_http_requests_total",
+    "Provider requests per source (sent, pages received, retries, failed calls).",
+    ["source", "outcome"],
+)
+INGESTION_SOURCE_FAILURES_TOTAL = REGISTRY.counter(
+    "ingestion_source_failures_total",
+    "Source fetches or writes that failed.",
+    ["source"],
+)
+INGESTION_PHASE_SECONDS = REGISTRY.histogram(
+    "ingestion_phase_duration_seconds",
+    "Time spent fetching or writing one source in a run.",
+    ["source", "phase"],
+    buckets=PHASE_BUCKETS,
+)
+INGESTION_DOCS_PER_SECOND = REGISTRY.gauge(
+    "ingestion_docs_per_second",
+    "Postings kept per second of fetch + write in the source's latest run.",
+    ["source"],
+)
+INGESTION_HTTP_LATENCY_MS = REGISTRY.gauge(
+    "ingestion_http_latency_ms",
+    "Provider request latency percentiles in the source's latest run.",
+    ["source", "quantile"],
+)
+
+
+def observe_ingestion_run(status: str, result: Dict[str, Any]) -> None:
+    """Record one finished run (status, and its run_all() result when there is one)."""
+    INGESTION_RUNS_TOTAL.inc(status=status)
+    for source, report in ((result or {}).get("sources") or {}).items():
+        for stage in POSTING_STAGES:
+            if report.get(stage):
+                INGESTION_POSTINGS_TOTAL.inc(report[stage], source=source, stage=stage)
+        for phase in ("fetch", "write"):
+            if report.get(f"{phase}_seconds"):
+                INGESTION_PHASE_SECONDS.observe(report[f"{phase}_seconds"], source=source, phase=phase)
+        if report.get("error"):
+            INGESTION_SOURCE_FAILURES_TOTAL.inc(source=source)
+        if report.get("docs_per_second") is not None:
+            INGESTION_DOCS_PER_SECOND.set(report["docs_per_second"], source=source)
+        http = report.get("http")
+        if not http:
+            continue
+        for outcome, key in (("sent", "requests"), ("page", "pages"), ("retry", "retries"),
+                             ("failed", "failed_requests")):
+            if http.get(key):
+                INGESTION_HTTP_REQUESTS_TOTAL.inc(http[key], source=source, outcome=outcome)
+        for quantile, key in (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms"), ("1", "max_ms")):
+            if http.get(key) is not None:
+                INGESTION_HTTP_LATENCY_MS.set(http[key], source=source, quantile=quantile)
@@ -0,0 +1,186 @@
+"""
+In-process ingestion scheduler, started from the FastAPI lifespan.
+
+Each source in orchestrator.SOURCES runs on its own interval (plus jitter so
+sources and app instances drift apart). Runs are submitted to the shared
+ingestion job manager (ingestion_jobs.py), so they use the same bounded worker
+pool, Mongo lease locks and ingestion_runs history as manual triggers, and a
+scheduled run of a source that is already being pulled is coalesced. After a
+restart the next run is scheduled from the last successful one instead of
+firing immediately.
+
+Env:
+- INGESTION_SCHEDULER_ENABLED (optional) — "true" to start it, default off
+- INGESTION_INTERVALS (optional) — overrides, e.g. "Adzuna=3600,The Muse=43200" (seconds)
+- INGESTION_JITTER (optional) — +/- fraction of the interval, default 0.1
+- INGESTION_REFRESH_MODEL (optional) — "true" to rebuild the ML models after a run whose jobs
+  could not be added to the semantic index incrementally (ingestion_jobs.index_ingested_jobs)
+
+Jobs a run writes normally reach the recommender through that incremental index update, so
+no full (whole-corpus) rebuild runs on a timer.
+"""
+
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo import DESCENDING
+
+from backend.db.mongo import get_db
+from backend.services.ingestion_jobs import IngestionJobManager, ingestion_jobs
+
+# Seconds between runs per source; quota-limited sources run less often
+DEFAULT_INTERVALS: Dict[str, int] = {
+    "Adzuna": 6 * 3600,
+    "Arbeitnow": 6 * 3600,
+    "Remotive": 12 * 3600,
+    "Jobicy": 6 * 3600,
+    "SerpAPI": 24 * 3600,   # paid searches
+    "RemoteOK": 12 * 3600,
+    "USAJobs": 12 * 3600,
+    "The Muse": 12 * 3600,
+}
+DEFAULT_JITTER = 0.1
+# First run of a source that has never succeeded: spread over this many seconds
+INITIAL_SPREAD = 300
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def parse_intervals(value: Optional[str]) -> Dict[str, int]:
+    """Parse "Source=seconds,Source=seconds" into a dict (source names may contain spaces)."""
+    intervals = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, sep, seconds = item.partition("=")
+        if not sep:
+            raise ValueError(f"INGESTION_INTERVALS entry {item!r} must look like Source=seconds")
+        intervals[name.strip()] = int(seconds)
+    return intervals
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo hands back naive UTC datetimes
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _refresh_models_blocking():
+    from backend.app.ml.routes_ml import refresh_models
+    refresh_models()
+
+
+class IngestionScheduler:
+    """
+    One asyncio task per source, each sleeping until its next due time and then
+    submitting that source as an ingestion job.
+    """
+
+    def __init__(
+        self,
+        intervals: Optional[Dict[str, int]] = None,
+        jitter: float = DEFAULT_JITTER,
+        refresh_model: bool = False,
+        jobs: Optional[IngestionJobManager] = None,
+    ):
+        self.intervals = {**DEFAULT_INTERVALS, **(intervals or {})}
+        self.jitter = jitter
+        self.refresh_model = refresh_model
+        self.jobs = jobs or ingestion_jobs
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_again = False
+
+    @classmethod
+    def from_env(cls) -> "IngestionScheduler":
+        return cls(
+            intervals=parse_intervals(os.getenv("INGESTION_INTERVALS")),
+            jitter=float(os.getenv("INGESTION_JITTER", str(DEFAULT_JITTER))),
+            refresh_model=_env_flag("INGESTION_REFRESH_MODEL"),
+        )
+
+    def start(self) -> None:
+        for source, interval in self.intervals.items():
+            if interval > 0 and source not in self._tasks:
+                self._tasks[source] = asyncio.create_task(self._source_loop(source, interval))
+        print(f"⏰ Ingestion scheduler started for {len(self._tasks)} source(s).")
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        if self._refresh_task is not None:
+            tasks.append(self._refresh_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _jittered(self, interval: float) -> float:
+        return max(0.0, interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    async def _initial_delay(self, source: str, interval: float) -> float:
+        last = await get_db().ingestion_runs.find_one(
+            {"succeeded_sources": source},
+            sort=[("started_at", DESCENDING)],
+        )
+        if last is None:
+            return random.uniform(0, INITIAL_SPREAD)
+        due = _as_utc(last["started_at"]) + timedelta(seconds=self._jittered(interval))
+        return max(0.0, (due - datetime.now(timezone.utc)).total_seconds())
+
+    async def _source_loop(self, source: str, interval: float) -> None:
+        try:
+            delay = await self._initial_delay(source, interval)
+        except Exception as e:
+            print(f"⚠️ Could not read ingestion history for {source}: {e}")
+            delay = random.uniform(0, INITIAL_SPREAD)
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.run_source(source)
+            except Exception as e:
+                print(f"⚠️ Scheduled {source} ingestion failed: {e}")
+            delay = self._jittered(interval)
+
+    async def run_source(self, source: str) -> Optional[Dict[str, Any]]:
+        """
+        Submit one source as a scheduled job (or join the active job covering it) and wait.
+        Returns the orchestrator's per-source report, or None if the source did not run here.
+        """
+        job, _ = self.jobs.submit([source], trigger="scheduled")
+        await self.jobs.wait(job)
+        result = job.result or {}
+        report = result.get("sources", {}).get(source)
+        if job.error:
+            print(f"⚠️ Scheduled {source} ingestion failed: {job.error}")
+
+        # Only when the incremental semantic index update failed
+        if self.refresh_model and result.get("index_error"):
+            self._request_refresh()
+        return report
+
+    def _request_refresh(self) -> None:
+        """Start a full model refresh, or queue exactly one more if a refresh is already running."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_again = True
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._refresh_again = False
+            try:
+                await loop.run_in_executor(None, _refresh_models_blocking)
+                print("✅ ML models rebuilt after a failed semantic index update.")
+            except Exception as e:
+                print(f"⚠️ Model refresh after ingestion failed: {e}")
+            if not self._refresh_again:
+                return
+
+
+def scheduler_enabled() -> bool:
+    return _env_flag("INGESTION_SCHEDULER_ENABLED")
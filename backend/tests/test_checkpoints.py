@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+from backend.app.api.adzuna import adzuna_fetch_top_jobs as adzuna_fetch
+from backend.app.api.checkpoints import Checkpoint
+
+
+def adzuna_job(job_id, created):
+    return {"id": job_id, "created": created, "title": "Software Engineer"}
+
+
+# ------------------------
+# Ingestion checkpoints
+# ------------------------
+def test_checkpoint_filters_postings_from_earlier_runs():
+
+    checkpoint = Checkpoint(
+        "Adzuna",
+        "Software Engineer",
+        posted_date=datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc),
+        last_ids=["100"],
+    )
+
+    jobs = [
+        adzuna_job("102", "2026-03-02T08:00:00Z"),  # newer than the mark
+        adzuna_job("101", "2026-03-01T12:00:00Z"),  # same timestamp, unseen id
+        adzuna_job("100", "2026-03-01T12:00:00Z"),  # same timestamp, seen id
+        adzuna_job("99", "2026-02-27T09:30:00Z"),   # older than the mark
+    ]
+
+    fresh = checkpoint.filter_new(jobs)
+
+    assert [job["id"] for job in fresh] == ["102", "101"]
+    assert not checkpoint.changed
+
+
+def test_checkpoint_advance_moves_mark_and_id_window():
+
+    checkpoint = Checkpoint("Jobicy", "Data Analyst", last_ids=["7"])
+
+    checkpoint.advance([
+        {"id": 9, "pubDate": "2026-04-10 09:00:00"},
+        {"id": 8, "pubDate": "2026-04-11T10:15:00+00:00"},
+    ])
+    doc = checkpoint.to_document()
+
+    assert checkpoint.changed
+    assert doc["_id"] == "Jobicy|Data Analyst"
+    assert doc["posted_date"] == datetime(2026, 4, 11, 10, 15, tzinfo=timezone.utc)
+    assert doc["last_ids"] == ["9", "8", "7"]
+    assert checkpoint.is_known({"id": 9, "pubDate": "2026-04-10 09:00:00"})
+
+
+def reload(checkpoint):
+    """The checkpoint as the next run loads it from the store."""
+    doc = checkpoint.to_document()
+    return Checkpoint(doc["source"], doc["query"], doc["posted_date"], doc["last_ids"],
+                      pending_posted_date=doc["pending_posted_date"], resume_page=doc["resume_page"])
+
+
+def test_backlog_larger_than_page_cap_is_fetched_over_later_runs(monkeypatch):
+
+    # Adzuna, newest first: 5 postings since the last run, then ones it already has
+    listing = [adzuna_job(str(200 + day), f"2026-03-{day:02d}T09:00:00Z") for day in range(9, 4, -1)]
+    listing += [adzuna_job("100", "2026-03-01T12:00:00Z"), adzuna_job("99", "2026-02-27T09:30:00Z")]
+
+    async def fake_page(http, page=1, keywords=None, results_per_page=50, sort_by=None):
+        start = (page - 1) * results_per_page
+        return {"results": listing[start:start + results_per_page], "count": len(listing)}
+
+    monkeypatch.setattr(adzuna_fetch, "fetch_adzuna_page", fake_page)
+    mark = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    checkpoint = Checkpoint("Adzuna", "Software Engineer", posted_date=mark, last_ids=["100"])
+
+    def run():
+        return [job["id"] for job in adzuna_fetch.fetch_all_top_jobs(
+            ["Software Engineer"], results_per_page=2, max_pages_per_job=1,
+            checkpoints={"Software Engineer": checkpoint},
+        )]
+
+    assert run() == ["209", "208"]
+    # Cut short by the page cap: the mark stays so 207..205 are not hidden below it
+    assert checkpoint.to_document()["posted_date"] == mark
+    checkpoint = reload(checkpoint)
+    assert checkpoint.resume_page == 2
+
+    # A posting added before the next run pushes 208 onto page 2, where its id filters it
+    listing.insert(0, adzuna_job("210", "2026-03-10T09:00:00Z"))
+    assert run() == ["207"]
+    checkpoint = reload(checkpoint)
+    assert run() == ["206", "205"]
+    checkpoint = reload(checkpoint)
+    assert checkpoint.resume_page == 4
+    assert run() == []  # page 4 reaches postings older than the mark
+    checkpoint = reload(checkpoint)
+
+    assert checkpoint.resume_page is None
+    assert checkpoint.posted_date == datetime(2026, 3, 9, 9, 0, tzinfo=timezone.utc)
+    # Caught up: the next run starts from page 1 again and picks up the newcomer
+    assert run() == ["210"]
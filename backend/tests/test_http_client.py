@@ -0,0 +1,287 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from backend.app.api.http_client import (
+    CircuitOpenError,
+    FixtureNotFoundError,
+    HttpSession,
+    SourcePolicy,
+    TokenBucket,
+    request_log,
+    stream_sync,
+)
+
+
+# ------------------------
+# Local stand-in for a job-source API
+# ------------------------
+class StubSource:
+    """
+    Serves a queue of scripted (status, headers, body) responses on 127.0.0.1;
+    the last entry repeats once the queue is exhausted.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.hits = 0
+        self.request_headers = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                stub.request_headers.append(dict(self.headers))
+                status, headers, body = (
+                    stub.responses.pop(0) if len(stub.responses) > 1 else stub.responses[0]
+                )
+                payload = json.dumps(body).encode() if status != 304 else b""
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/jobs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fast_policy(**overrides):
+    settings = dict(rate=1000.0, burst=100, concurrency=4, max_retries=3,
+                    backoff_base=0.01, backoff_max=0.05,
+                    failure_threshold=2, reset_timeout=60.0)
+    settings.update(overrides)
+    return SourcePolicy(**settings)
+
+
+# ------------------------
+# Retry / backoff
+# ------------------------
+@pytest.mark.asyncio
+async def test_retries_429_honoring_retry_after(client):
+
+    stub = StubSource([
+        (429, {"Retry-After": "0"}, {"error": "slow down"}),
+        (503, {}, {"error": "unavailable"}),
+        (200, {}, {"jobs": [{"id": 1}]}),
+    ])
+    try:
+        async with HttpSession(policies={"StubRetry": fast_policy()}) as session:
+            data = await session.get_json("StubRetry", stub.url)
+    finally:
+        stub.close()
+
+    assert data == {"jobs": [{"id": 1}]}
+    assert stub.hits == 3
+
+
+@pytest.mark.asyncio
+async def test_request_log_counts_pages_retries_and_failures(client):
+
+    stub = StubSource([
+        (503, {}, {"error": "unavailable"}),
+        (200, {}, {"jobs": []}),
+        (404, {}, {"error": "not found"}),
+    ])
+    mark = request_log.mark("StubLog")
+    try:
+        async with HttpSession(policies={"StubLog": fast_policy()}) as session:
+            await session.get_json("StubLog", stub.url)
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get_json("StubLog", stub.url)
+    finally:
+        stub.close()
+
+    summary = request_log.summary("StubLog", mark)
+
+    assert (summary["requests"], summary["pages"], summary["retries"], summary["failed_requests"]) == (3, 1, 1, 1)
+    assert 0 < summary["p50_ms"] <= summary["p90_ms"] <= summary["max_ms"]
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(client):
+
+    stub = StubSource([(404, {}, {"error": "not found"})])
+    try:
+        async with HttpSession(policies={"StubNotFound": fast_policy()}) as session:
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get_json("StubNotFound", stub.url)
+    finally:
+        stub.close()
+
+    assert stub.hits == 1
+
+
+# ------------------------
+# Circuit breaker
+# ------------------------
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_failures(client):
+
+    stub = StubSource([(500, {}, {"error": "down"})])
+    policy = fast_policy(max_retries=1, failure_threshold=2)
+    try:
+        async with HttpSession(policies={"StubDown": policy}) as session:
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await session.get_json("StubDown", stub.url)
+            hits_when_opened = stub.hits
+
+            with pytest.raises(CircuitOpenError):
+                await session.get_json("StubDown", stub.url)
+    finally:
+        stub.close()
+
+    assert hits_when_opened == 4
+    assert stub.hits == hits_when_opened
+
+
+@pytest.mark.asyncio
+async def test_circuit_recovers_after_failed_trial(client):
+
+    stub = StubSource([
+        (500, {}, {"error": "down"}),
+        (503, {}, {"error": "still down"}),
+        (503, {}, {"error": "still down"}),
+        (404, {}, {"error": "not found"}),
+        (200, {}, {"jobs": []}),
+    ])
+    policy = fast_policy(max_retries=0, failure_threshold=1, reset_timeout=0.1)
+    try:
+        async with HttpSession(policies={"StubTrial": policy}) as session:
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get_json("StubTrial", stub.url)
+            with pytest.raises(CircuitOpenError):
+                await session.get_json("StubTrial", stub.url)
+
+            # Half-open trial fails with a 503: the circuit re-opens instead of sticking
+            await asyncio.sleep(0.15)
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get_json("StubTrial", stub.url)
+            with pytest.raises(CircuitOpenError):
+                await session.get_json("StubTrial", stub.url)
+
+            # A trial whose retry gets an answer (even a 404) closes it
+            session.policies["StubTrial"] = fast_policy(max_retries=1, failure_threshold=1,
+                                                        reset_timeout=0.1)
+            await asyncio.sleep(0.15)
+            with pytest.raises(httpx.HTTPStatusError):
+                await session.get_json("StubTrial", stub.url)
+            data = await session.get_json("StubTrial", stub.url)
+    finally:
+        stub.close()
+
+    assert data == {"jobs": []}
+    assert stub.hits == 5
+
+
+# ------------------------
+# Token bucket
+# ------------------------
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests(client):
+
+    bucket = TokenBucket(rate=50.0, burst=2)
+
+    start = time.monotonic()
+    for _ in range(7):
+        await bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 2 from the burst, then 5 at 50/s
+    assert elapsed >= 0.09
+
+
+# ------------------------
+# Record / replay
+# ------------------------
+@pytest.mark.asyncio
+async def test_record_then_replay_offline(client, tmp_path):
+
+    stub = StubSource([(200, {}, {"results": [{"id": "a1"}]})])
+    params = {"what": "Nurse", "app_key": "secret-key"}
+    try:
+        async with HttpSession(mode="record", fixture_dir=str(tmp_path),
+                               policies={"StubRecord": fast_policy()}) as session:
+            recorded = await session.get_json("StubRecord", stub.url, params=params)
+    finally:
+        stub.close()
+
+    fixture_files = list(tmp_path.rglob("*.json"))
+    assert len(fixture_files) == 1
+    assert "secret-key" not in fixture_files[0].read_text()
+
+    # Server is gone; replay serves the recorded body, whatever the credentials
+    async with HttpSession(mode="replay", fixture_dir=str(tmp_path)) as session:
+        replayed = await session.get_json(
+            "StubRecord", stub.url, params={"what": "Nurse", "app_key": "other-key"}
+        )
+        with pytest.raises(FixtureNotFoundError):
+            await session.get_json("StubRecord", stub.url, params={"what": "Driver"})
+
+    assert replayed == recorded
+
+
+# ------------------------
+# Response cache / conditional GET
+# ------------------------
+@pytest.mark.asyncio
+async def test_cached_feed_is_revalidated_with_etag(client):
+
+    stub = StubSource([
+        (200, {"ETag": '"v1"'}, [{"id": 1, "position": "Nurse"}]),
+        (304, {}, None),
+    ])
+    try:
+        async with HttpSession(policies={"StubFeed": fast_policy()}) as session:
+            first = await session.get_json("StubFeed", stub.url, cache_ttl=60)
+            fresh = await session.get_json("StubFeed", stub.url, cache_ttl=60)
+            hits_while_fresh = stub.hits
+            revalidated = await session.get_json("StubFeed", stub.url, cache_ttl=0)
+    finally:
+        stub.close()
+
+    assert hits_while_fresh == 1
+    assert stub.hits == 2
+    assert stub.request_headers[-1]["If-None-Match"] == '"v1"'
+    assert first == fresh == revalidated == [{"id": 1, "position": "Nurse"}]
+
+
+# ------------------------
+# Streaming
+# ------------------------
+@pytest.mark.asyncio
+async def test_stream_sync_applies_backpressure(client):
+
+    produced = []
+
+    async def pages():
+        for page in range(100):
+            await asyncio.sleep(0)
+            produced.append(page)
+            yield page
+
+    stream = stream_sync(pages(), maxsize=5)
+    first = [next(stream) for _ in range(3)]
+    time.sleep(0.1)
+
+    # Producer is paused by the bounded buffer, not racing to the end
+    assert first == [0, 1, 2]
+    assert len(produced) <= 3 + 5 + 1
+
+    assert list(stream) == list(range(3, 100))
@@ -0,0 +1,623 @@
+import asyncio
+import os
+import pickle
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.write_concern import WriteConcern
+
+from backend.app.api import job_schema
+from backend.app.api.job_schema import (
+    _parse_date,
+    content_hash,
+    export_canonical_to_csv,
+    extract_salary,
+    iter_export_rows,
+    to_canonical_document,
+)
+from backend.app.api.mongo_ingestion_utils import (
+    get_insert_batch_size,
+    get_write_mode,
+    insert_jobs_into_mongo,
+    new_write_report,
+    write_documents,
+)
+from backend.app.api.near_duplicates import NearDuplicateIndex
+from backend.app.api.orchestrator import (
+    SpooledDocuments,
+    drop_cross_source_duplicates,
+    fingerprint_owners,
+)
+from backend.app.api.query_planner import QueryPlanner, QueryStats
+from backend.app.api.remoteok.test_remoteok_api import route_remoteok_jobs
+from backend.app.api.skills import extract_skills
+from backend.app.api.snapshot_loader import find_snapshot_files, parse_snapshot
+from backend.db.mongo import get_db
+from backend.services import ingestion_jobs as jobs_module
+from backend.services.ingestion_jobs import (
+    IngestionJobManager,
+    acquire_ingestion_lock,
+    release_ingestion_lock,
+)
+from backend.services import ingestion_scheduler as scheduler_module
+from backend.services.ingestion_scheduler import IngestionScheduler, parse_intervals
+
+
+def normalize(job):
+    return {"ID": job["id"], "Position": job["title"], "Company": "Acme", "Date": "2026-05-01"}
+
+
+@pytest.fixture
+def jobs_collection():
+    mongo_client = MongoClient(os.getenv("MONGODB_CONNECT_STRING"))
+    collection = mongo_client[os.getenv("TEST_DB")]["jobs_ingestion_test"]
+    collection.create_index("external_id", unique=True)
+    collection.delete_many({})
+    yield collection
+    collection.drop()
+    mongo_client.close()
+
+
+# ------------------------
+# Date parsing
+# ------------------------
+def test_parse_date_fast_paths_and_source_memo():
+
+    utc = timezone.utc
+    assert _parse_date("2026-03-02T08:00:00Z") == datetime(2026, 3, 2, 8, tzinfo=utc)
+    assert _parse_date("2026-04-10 09:00:00") == datetime(2026, 4, 10, 9, tzinfo=utc)
+    assert _parse_date(1775811600) == _parse_date("1775811600000") == datetime(2026, 4, 10, 9, tzinfo=utc)
+    assert _parse_date("3 days ago") is None
+
+    # The first value decides the source's format; ambiguous ones then follow it
+    job_schema._date_strategies.clear()
+    assert _parse_date("13/04/2026", source="Demo") == datetime(2026, 4, 13, tzinfo=utc)
+    assert _parse_date("03/04/2026", source="Demo") == datetime(2026, 4, 3, tzinfo=utc)
+    assert _parse_date("03/04/2026") == datetime(2026, 3, 4, tzinfo=utc)
+    assert job_schema._date_strategies[("Demo", "date")] == "%d/%m/%Y"
+
+
+# ------------------------
+# Change-aware upsert
+# ------------------------
+def test_content_hash_ignores_audit_fields():
+
+    doc = to_canonical_document(normalize({"id": "a1", "title": "Nurse"}), "Adzuna")
+    stamped = {**doc, "ingested_at": "2026-05-02", "external_id": "other"}
+    changed = {**doc, "title": "Senior Nurse"}
+
+    assert content_hash(doc) == content_hash(stamped)
+    assert content_hash(doc) != content_hash(changed)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Salary Range: $120,800.00 - $217,400.", (120800, 217400)),
+    ("Pay is $70-110k depending on experience", (70000, 110000)),
+    ("70k to 90k USD", (70000, 90000)),
+    ("Paying between $80k and $100k a year", (80000, 100000)),
+    ("Between 80,000 and 95,000 dollars annually", (80000, 95000)),
+    ("USD $30 - USD $35 /Hr.", (62400, 72800)),
+    ("Earn $18.50 hourly", (38480, 38480)),
+    ("5-10 years of experience, 401k match, $5 gift card", (None, None)),
+])
+def test_salary_extracted_from_description(text, expected):
+
+    assert extract_salary(text) == expected
+    doc = to_canonical_document({"ID": "1", "Position": "Engineer", "Description": text}, "Jobicy")
+    assert (doc["salary_range"]["min"], doc["salary_range"]["max"]) == expected
+
+
+def test_skills_extracted_from_description():
+
+    doc = to_canonical_document({
+        "ID": "1", "Position": "Truck Driver", "Company": "Acme",
+        "Description": "Class A CDL required. Forklift experience a plus.",
+        "JobCategory": ["Transportation", "forklift"],
+    }, "USAJobs")
+
+    assert doc["skills_required"] == ["Transportation", "Forklift", "CDL Class A"]
+    # Whole words only: "Java" is not inside "JavaScript", "Go" is not a skill
+    assert extract_skills("JavaScript and K8S, go to C++") == ["JavaScript", "Kubernetes", "C++"]
+
+
+@pytest.mark.parametrize("output_format", ["csv.gz", "parquet"])
+def test_export_streams_and_reads_back(tmp_path, output_format):
+
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    jobs = ({"id": f"j{i}", "title": f"Engineer {i}"} for i in range(25))
+
+    path = export_canonical_to_csv(jobs, "Adzuna", normalize, str(tmp_path),
+                                   output_format=output_format)
+
+    assert path.endswith("." + output_format)
+    rows = list(iter_export_rows(path))
+    assert [row["external_id"] for row in rows] == [f"Adzuna_j{i}" for i in range(25)]
+    assert rows[3]["title"] == "Engineer 3"
+    assert export_canonical_to_csv(iter([]), "Adzuna", normalize, str(tmp_path)) == ""
+
+
+def test_snapshot_loader_parses_each_snapshot_shape(tmp_path):
+
+    snapshot_dir = tmp_path / "muse" / "csv"
+    snapshot_dir.mkdir(parents=True)
+    (snapshot_dir / "muse_20260501.csv").write_text(
+        "Company,Position,Location,Tags,Description,URL,Salary_Min,Salary_Max,Date,ID\n"
+        "Acme,Data Analyst,Remote,SQL; Python,,https://x,80k,,2026-05-01,42\n"
+    )
+    (tmp_path / "users.csv").write_text("_id,name,email\n1,Ada,ada@example.com\n")
+    exported = export_canonical_to_csv(
+        [{"id": "j1", "title": "Engineer"}], "Adzuna", normalize, str(tmp_path),
+        output_format="csv.gz",
+    )
+
+    parsed = {os.path.basename(path): parse_snapshot(path) for path in find_snapshot_files([str(tmp_path)])}
+
+    _, [muse], skipped = parsed["muse_20260501.csv"]
+    assert skipped is None
+    assert muse["external_id"] == "The Muse_42"
+    assert muse["skills_required"] == ["SQL", "Python"]
+    assert muse["salary_range"]["min"] == 80000
+    _, [adzuna], _ = parsed[os.path.basename(exported)]
+    assert adzuna["external_id"] == "Adzuna_j1"
+    assert adzuna["posted_date"] == datetime(2026, 5, 1, tzinfo=timezone.utc)
+    assert parsed["users.csv"][1:] == ([], "not a job snapshot")
+
+
+def test_upsert_writes_only_new_or_changed(jobs_collection):
+
+    jobs = [{"id": f"j{i}", "title": f"Engineer {i}"} for i in range(3)]
+
+    first = new_write_report()
+    written = insert_jobs_into_mongo(jobs, jobs_collection, "Adzuna", normalize,
+                                     mode="upsert", report=first)
+
+    assert written == 3
+    assert first["inserted"] == 3
+
+    jobs[1]["title"] = "Staff Engineer"
+    second = new_write_report()
+    written = insert_jobs_into_mongo(jobs, jobs_collection, "Adzuna", normalize,
+                                     mode="upsert", report=second)
+
+    assert written == 1
+    assert (second["inserted"], second["updated"], second["unchanged"]) == (0, 1, 2)
+    assert second["changed_ids"] == ["Adzuna_j1"]
+
+    updated = jobs_collection.find_one({"external_id": "Adzuna_j1"})
+    assert updated["title"] == "Staff Engineer"
+    assert updated["ingested_at"] <= updated["updated_at"]
+    assert jobs_collection.count_documents({}) == 3
+
+
+def test_write_mode_is_read_when_the_write_starts(monkeypatch):
+
+    # Set after import, as loading .env does
+    monkeypatch.setenv("INGESTION_WRITE_MODE", "upsert")
+    assert get_write_mode() == "upsert"
+    assert get_write_mode("insert") == "insert"
+
+
+def test_insert_batch_size_is_read_when_the_write_starts(monkeypatch):
+
+    monkeypatch.setenv("MONGO_INSERT_BATCH_SIZE", "25")
+    assert get_insert_batch_size() == 25
+
+
+def test_pipelined_inserts_count_duplicates_per_batch(jobs_collection):
+
+    jobs = [{"id": f"j{i % 7}", "title": f"Engineer {i % 7}"} for i in range(10)]
+
+    report = new_write_report()
+    written = insert_jobs_into_mongo(jobs, jobs_collection, "Adzuna", normalize, batch_size=3,
+                                     mode="insert", report=report, write_concern=WriteConcern(w=1))
+
+    assert written == report["inserted"] == 7
+    assert report["duplicate_keys"] == report["unchanged"] == 3
+    assert len(report["changed_ids"]) == 7
+    assert jobs_collection.count_documents({}) == 7
+
+
+# ------------------------
+# Cross-source dedupe
+# ------------------------
+def test_cross_source_duplicates_kept_by_first_source():
+
+    docs_by_source = {
+        "Adzuna": [{"title": "Sr. Engineer", "company": "Acme", "location": "Remote"}],
+        "Jobicy": [
+            {"title": "sr engineer", "company": "ACME", "location": "remote"},
+            {"title": "Nurse", "company": "Clinic", "location": "Austin, TX"},
+        ],
+    }
+
+    dropped = drop_cross_source_duplicates(docs_by_source, ["Adzuna", "Jobicy"])
+
+    assert dropped == {"Adzuna": 0, "Jobicy": 1}
+    assert [doc["title"] for doc in docs_by_source["Jobicy"]] == ["Nurse"]
+
+
+def test_spooled_sources_dedupe_on_fingerprints():
+
+    adzuna, jobicy = SpooledDocuments("Adzuna"), SpooledDocuments("Jobicy")
+    for doc in [{"title": "Sr. Engineer", "company": "Acme", "location": "Remote", "external_id": "a1"},
+                {"title": "Sr. Engineer", "company": "Acme", "location": "Remote", "external_id": "a2"}]:
+        adzuna.add(doc)
+    for doc in [{"title": "sr engineer", "company": "ACME", "location": "remote", "external_id": "j1"},
+                {"title": "Nurse", "company": "Clinic", "location": "Austin, TX", "external_id": "j2"},
+                {"title": "", "company": "Unknown", "external_id": "j3"}]:
+        jobicy.add(doc)
+
+    owner = fingerprint_owners({"Jobicy": jobicy.fingerprints, "Adzuna": adzuna.fingerprints},
+                               ["Adzuna", "Jobicy"])
+
+    assert (adzuna.duplicates(owner), jobicy.duplicates(owner)) == (0, 1)
+    # Repeats within the owning source are kept; documents without a fingerprint always are
+    assert [doc["external_id"] for doc in adzuna.kept(owner)] == ["a1", "a2"]
+    assert [doc["external_id"] for doc in jobicy.kept(owner)] == ["j2", "j3"]
+    adzuna.close()
+    jobicy.close()
+
+
+# ------------------------
+# Near-duplicate clustering
+# ------------------------
+def test_near_duplicates_share_cluster_across_sources(jobs_collection):
+
+    signatures = jobs_collection.database["job_signatures_test"]
+    signatures.delete_many({})
+    description = (
+        "We are hiring a backend engineer to build and operate the payment APIs that "
+        "power checkout for thousands of merchants. You will design services in Python, "
+        "own PostgreSQL schemas and queues, run on-call rotations, and work with product "
+        "and data teams on reliability, observability and fraud prevention. "
+    ) * 3
+    adzuna = {"external_id": "Adzuna_1", "title": "Backend Engineer", "company": "Acme Pay",
+              "description": description}
+    serpapi = {"external_id": "SerpAPI_x", "title": "Backend Engineer", "company": "Acme Pay, Inc.",
+               "description": description + " Apply via our careers page."}
+    jobicy = {"external_id": "Jobicy_7", "title": "Registered Nurse", "company": "Mercy Clinic",
+              "description": "Provide patient care on a busy medical-surgical unit, night shifts."}
+    try:
+        index = NearDuplicateIndex(signatures)
+
+        assert index.assign([adzuna]) == 0
+        assert index.assign([serpapi, jobicy]) == 1
+
+        assert adzuna["cluster_id"] == serpapi["cluster_id"] == "Adzuna_1"
+        assert jobicy["cluster_id"] == "Jobicy_7"
+
+        # Re-clustering a stored job keeps its cluster
+        serpapi.pop("cluster_id")
+        assert index.assign([serpapi]) == 0
+        assert serpapi["cluster_id"] == "Adzuna_1"
+    finally:
+        signatures.drop()
+
+
+def test_rejected_inserts_store_no_signature(jobs_collection):
+
+    signatures = jobs_collection.database["job_signatures_test"]
+    signatures.delete_many({})
+    description = (
+        "Build and operate the payment APIs that power checkout for thousands of merchants, "
+        "own PostgreSQL schemas and queues, and share on-call for reliability and fraud. "
+    ) * 3
+
+    def posting(external_id, title="Backend Engineer", text=description):
+        return {"external_id": external_id, "title": title, "company": "Acme Pay", "description": text}
+
+    try:
+        index = NearDuplicateIndex(signatures)
+        write_documents([posting("Adzuna_1")], jobs_collection, mode="insert", clusters=index)
+        # Written while clustering was off: in the jobs collection, not in the index
+        write_documents([posting("SerpAPI_x")], jobs_collection, mode="insert")
+
+        report = new_write_report()
+        write_documents(
+            [posting("SerpAPI_x"), posting("Jobicy_7", "Registered Nurse", "Night shifts on a surgical unit.")],
+            jobs_collection, mode="insert", report=report, clusters=index,
+        )
+
+        assert (report["inserted"], report["duplicate_keys"]) == (1, 1)
+        # The rejected SerpAPI_x would have joined Adzuna_1's cluster; it must not count or be indexed
+        assert report["near_duplicates"] == 0
+        assert sorted(doc["_id"] for doc in signatures.find()) == ["Adzuna_1", "Jobicy_7"]
+    finally:
+        signatures.drop()
+
+
+# ------------------------
+# Query planner
+# ------------------------
+def test_query_planner_merges_titles_covered_by_broader_ones():
+
+    def stats(query, ids, skipped_runs=0):
+        return QueryStats("SerpAPI", query, [str(i) for i in ids], runs=1, skipped_runs=skipped_runs)
+
+    history = {
+        "Truck Driver": stats("Truck Driver", range(0, 40)),
+        "CDL Driver": stats("CDL Driver", range(2, 22)),             # all inside Truck Driver
+        "Heavy Truck Driver": stats("Heavy Truck Driver", range(30, 50)),  # half new
+        "Commercial Driver": stats("Commercial Driver", range(5, 15), skipped_runs=3),
+        "Courier": stats("Courier", range(100, 103)),                # too few results to judge
+    }
+    queries = ["Truck Driver", "CDL Driver", "Heavy Truck Driver", "Commercial Driver",
+               "Courier", "Delivery Driver"]
+
+    plan = QueryPlanner(min_coverage=0.9, max_skips=3).plan("SerpAPI", queries, history)
+
+    assert plan.merged == {"CDL Driver": "Truck Driver"}
+    assert plan.run == ["Truck Driver", "Heavy Truck Driver", "Commercial Driver",
+                        "Courier", "Delivery Driver"]
+    assert plan.calls_saved == 1
+
+
+# ------------------------
+# RemoteOK multi-title routing
+# ------------------------
+def test_remoteok_routes_each_posting_to_every_matching_title():
+
+    feed = [
+        {"id": 1, "position": "Senior Software Engineer", "location": "Remote"},
+        {"id": 2, "position": "Senior Analyst", "location": "USA"},
+        {"id": 3, "position": "Machine Learning Engineer / AI Engineer", "location": "Remote"},
+        {"id": 4, "position": "Software Engineer", "location": "Berlin"},
+    ]
+
+    routed = route_remoteok_jobs(
+        feed,
+        ["Software Engineer", "OR Analyst", "AI Engineer", "Machine Learning Engineer"],
+        require_salary=False,
+    )
+
+    assert [job["id"] for job in routed["Software Engineer"]] == [1]
+    assert routed["OR Analyst"] == []
+    assert [job["id"] for job in routed["AI Engineer"]] == [3]
+    assert [job["id"] for job in routed["Machine Learning Engineer"]] == [3]
+
+
+# ------------------------
+# Scheduler
+# ------------------------
+def test_parse_intervals_allows_spaces_in_source_names():
+
+    assert parse_intervals("Adzuna=3600, The Muse=43200") == {"Adzuna": 3600, "The Muse": 43200}
+    assert parse_intervals("") == {}
+    with pytest.raises(ValueError):
+        parse_intervals("Adzuna")
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rebuilds_models_only_when_incremental_index_fails(monkeypatch):
+
+    class FakeJobs:
+        def __init__(self, result):
+            self.job = SimpleNamespace(result=result, error=None)
+
+        def submit(self, sources, trigger):
+            return self.job, True
+
+        async def wait(self, job):
+            return job
+
+    refreshes = []
+    monkeypatch.setattr(scheduler_module, "_refresh_models_blocking", lambda: refreshes.append(1))
+    written = {"Adzuna": {"inserted": 5, "updated": 0}}
+
+    indexed = IngestionScheduler(refresh_model=True, jobs=FakeJobs({"sources": written}))
+    await indexed.run_source("Adzuna")
+    assert indexed._refresh_task is None
+
+    failed = IngestionScheduler(refresh_model=True,
+                                jobs=FakeJobs({"sources": written, "index_error": "no matcher"}))
+    await failed.run_source("Adzuna")
+    await failed._refresh_task
+    assert refreshes == [1]
+
+
+@pytest.mark.asyncio
+async def test_ingestion_lock_blocks_overlapping_runs(client):
+
+    db = get_db()
+    await db.ingestion_locks.delete_many({})
+
+    assert await acquire_ingestion_lock(db, "Jobicy", "worker-a", ttl=60)
+    assert not await acquire_ingestion_lock(db, "Jobicy", "worker-b", ttl=60)
+    assert await acquire_ingestion_lock(db, "Adzuna", "worker-b", ttl=60)
+
+    await release_ingestion_lock(db, "Jobicy", "worker-a")
+    assert await acquire_ingestion_lock(db, "Jobicy", "worker-b", ttl=60)
+
+    await db.ingestion_locks.delete_many({})
+
+
+# ------------------------
+# Incremental semantic index
+# ------------------------
+class KeywordEncoder:
+    """One dimension per keyword, so similarities are predictable without a model."""
+
+    KEYWORDS = ("python", "nurse", "driver")
+
+    def encode(self, texts):
+        vectors = np.array([[float(word in text) for word in self.KEYWORDS] + [0.01]
+                            for text in ([texts] if isinstance(texts, str) else texts)])
+        return vectors[0] if isinstance(texts, str) else vectors
+
+
+def test_semantic_index_appends_tombstones_and_compacts(tmp_path):
+    from backend.app.ml.logic import SemanticJobMatcher
+
+    jobs = [
+        {"_id": ObjectId(), "title": "Python Developer", "description": "python apis", "location": "Remote"},
+        {"_id": ObjectId(), "title": "Nurse", "description": "nurse shifts", "location": "Remote"},
+    ]
+    encoder = KeywordEncoder()
+    artifact = tmp_path / "semantic_model.pkl"
+    with open(artifact, "wb") as fd:
+        pickle.dump({"embeddings": encoder.encode([job["description"] for job in jobs]),
+                     "df": pd.DataFrame(jobs), "job_ids": [str(job["_id"]) for job in jobs]}, fd)
+    matcher = SemanticJobMatcher(model_path=str(artifact), encoder=encoder)
+
+    def titles(role):
+        return [match["title"] for match in matcher.recommend({"target_roles": [role]})]
+
+    driver = {"_id": ObjectId(), "external_id": "Adzuna_d1", "cluster_id": "Adzuna_d1",
+              "title": "Truck Driver", "description": "driver routes", "location": "Remote"}
+    copy = {**driver, "_id": ObjectId(), "external_id": "Jobicy_d1"}
+    assert titles("driver") == []
+    assert matcher.upsert_jobs([driver, copy]) == 1
+    assert titles("driver") == ["Truck Driver"]
+
+    edited = {**jobs[0], "title": "Python Engineer"}
+    assert matcher.upsert_jobs([edited]) == 1
+    assert titles("python") == ["Python Engineer"]
+
+    assert matcher.remove_jobs([str(jobs[1]["_id"])]) == 1
+    assert titles("nurse") == []
+    assert matcher.tombstones == 2
+
+    assert matcher.compact() == 2
+    assert len(matcher.df) == len(matcher.job_embeddings) == 2
+    assert titles("python") == ["Python Engineer"] and titles("driver") == ["Truck Driver"]
+
+    matcher.save()
+    reloaded = SemanticJobMatcher(model_path=str(artifact), encoder=encoder)
+    assert sorted(reloaded.df["title"]) == ["Python Engineer", "Truck Driver"]
+
+
+# ------------------------
+# Background ingestion jobs
+# ------------------------
+@pytest.mark.asyncio
+async def test_duplicate_triggers_share_one_job(client, monkeypatch):
+
+    release = threading.Event()
+    calls = []
+
+    def fake_run_all(sources, progress):
+        calls.append(sources)
+        release.wait(5)
+        report = {"fetched": 3, "inserted": 2, "updated": 0, "unchanged": 1, "error": None}
+        progress("Jobicy", "written", report)
+        return {"sources": {"Jobicy": report}, "totals": report, "wall_seconds": 0.1}
+
+    monkeypatch.setattr(jobs_module, "_run_all_blocking", fake_run_all)
+    manager = IngestionJobManager(max_workers=1)
+    await get_db().ingestion_locks.delete_many({})
+
+    job, created = manager.submit(["Jobicy"])
+    same, created_again = manager.submit(["Jobicy"])
+
+    assert created and not created_again
+    assert same is job
+    assert job.to_dict()["status"] in ("queued", "running")
+
+    release.set()
+    await manager.wait(job)
+    status = job.to_dict()
+
+    assert calls == [["Jobicy"]]
+    assert status["status"] == "succeeded"
+    assert status["progress"]["completed"] == status["progress"]["total"] == 1
+    assert (await get_db().ingestion_runs.find_one({"_id": job.job_id}))["succeeded_sources"] == ["Jobicy"]
+
+    await get_db().ingestion_runs.delete_many({})
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_partly_overlapping_trigger_skips_locked_sources(client, monkeypatch):
+
+    release = threading.Event()
+    calls = []
+
+    def fake_run_all(sources, progress):
+        calls.append(sources)
+        if sources == ["Adzuna"]:
+            release.wait(5)
+        reports = {name: {"fetched": 1, "inserted": 1, "updated": 0, "unchanged": 0, "error": None}
+                   for name in sources}
+        return {"sources": reports, "totals": {}, "wall_seconds": 0.1}
+
+    monkeypatch.setattr(jobs_module, "_run_all_blocking", fake_run_all)
+    manager = IngestionJobManager(max_workers=2)
+    db = get_db()
+    await db.ingestion_locks.delete_many({})
+
+    scheduled, _ = manager.submit(["Adzuna"], trigger="scheduled")
+    while not calls:
+        await asyncio.sleep(0.01)
+    everything, created = manager.submit(["Adzuna", "Jobicy"])
+    await manager.wait(everything)
+
+    assert created
+    assert calls[1] == ["Jobicy"]
+    assert everything.to_dict()["progress"]["sources"]["Adzuna"]["phase"] == "skipped"
+    # The second job must not have released (or taken over) the running job's lock
+    assert (await db.ingestion_locks.find_one({"_id": "Adzuna"}))["owner"] == manager.lock_owner(scheduled)
+
+    release.set()
+    await manager.wait(scheduled)
+
+    assert scheduled.to_dict()["status"] == "succeeded"
+    assert await db.ingestion_locks.find_one({"_id": "Adzuna"}) is None
+
+    await db.ingestion_runs.delete_many({})
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_running_job_renews_its_lease_and_fails_when_it_is_lost(client, monkeypatch):
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_run_all(sources, progress):
+        started.set()
+        release.wait(5)
+        report = {"fetched": 1, "inserted": 1, "updated": 0, "unchanged": 0, "error": None}
+        return {"sources": {"Jobicy": report}, "totals": report, "wall_seconds": 0.1}
+
+    monkeypatch.setattr(jobs_module, "_run_all_blocking", fake_run_all)
+    manager = IngestionJobManager(max_workers=1, lock_ttl=0.3)
+    db = get_db()
+    await db.ingestion_locks.delete_many({})
+
+    # Outlive the TTL a few times over: the heartbeat keeps the lock
+    kept, _ = manager.submit(["Jobicy"])
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(1)
+    assert not await acquire_ingestion_lock(db, "Jobicy", "other", ttl=60)
+    release.set()
+    await manager.wait(kept)
+    assert kept.to_dict()["status"] == "succeeded"
+    assert await db.ingestion_locks.find_one({"_id": "Jobicy"}) is None
+
+    # Taken over mid-run (e.g. the lease expired while the loop was blocked): not a clean run
+    started.clear()
+    release.clear()
+    lost, _ = manager.submit(["Jobicy"])
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    await db.ingestion_locks.update_one({"_id": "Jobicy"}, {"$set": {"owner": "other"}})
+    await asyncio.sleep(0.5)
+    release.set()
+    await manager.wait(lost)
+
+    assert lost.to_dict()["status"] == "failed"
+    assert lost.result["sources"]["Jobicy"]["error"] == "lost its ingestion lock during the run"
+    # Releasing must leave the new owner's lock alone
+    assert (await db.ingestion_locks.find_one({"_id": "Jobicy"}))["owner"] == "other"
+
+    await db.ingestion_locks.delete_many({})
+    await db.ingestion_runs.delete_many({})
+    await manager.shutdown()
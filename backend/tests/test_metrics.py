@@ -0,0 +1,180 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from backend.db.monitoring import (
+    CommandMonitor,
+    MONGO_COMMAND_DURATION_SECONDS,
+    MONGO_SLOW_COMMANDS_TOTAL,
+    command_shape,
+    query_shape,
+)
+from backend.services.ingestion_metrics import observe_ingestion_run
+from backend.utils.metrics import MetricsRegistry
+from backend.utils.request_metrics import REQUESTS_TOTAL
+from backend.utils.timing import StageTimer
+
+
+# ------------------------
+# Metrics registry / stage timing
+# ------------------------
+@pytest.mark.asyncio
+async def test_histogram_renders_cumulative_buckets(client):
+
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo.", ["stage"], buckets=(0.1, 1.0))
+
+    hist.observe(0.05, stage="filter")
+    hist.observe(0.5, stage="filter")
+    hist.observe(5.0, stage="filter")
+
+    text = registry.render()
+
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="filter",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="filter",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="filter",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="filter"} 3' in text
+    assert hist.count(stage="filter") == 3
+
+
+@pytest.mark.asyncio
+async def test_stage_timer_server_timing_and_observe(client):
+
+    registry = MetricsRegistry()
+    hist = registry.histogram("stage_seconds", "Demo.", ["model", "stage"])
+
+    timer = StageTimer()
+    with timer.stage("filter"):
+        pass
+    with timer.stage("encode"):
+        pass
+    with timer.stage("filter"):
+        pass
+
+    header = timer.server_timing()
+
+    assert header.startswith("filter;dur=")
+    assert ", encode;dur=" in header
+
+    timer.observe(hist, model="semantic")
+
+    assert hist.count(model="semantic", stage="filter") == 1
+    assert hist.count(model="semantic", stage="encode") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_prometheus_format(client):
+
+    response = await client.get(
+        "/metrics",
+        headers={"aijobhunt-api-secret": os.getenv("API_SECRET")}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE recommendation_stage_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_skips_secret_header(client):
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_recorded_per_route(client):
+
+    before = REQUESTS_TOTAL.value(method="GET", route="/users/", status=403)
+    missing = REQUESTS_TOTAL.value(method="GET", route="/jobs", status=403)
+
+    # Missing secret header: rejected before routing, still labelled by its route
+    await client.get("/users/")
+    # No route matches: labelled by router prefix
+    await client.get("/jobs/no/such/path")
+
+    assert REQUESTS_TOTAL.value(method="GET", route="/users/", status=403) == before + 1
+    assert REQUESTS_TOTAL.value(method="GET", route="/jobs", status=403) == missing + 1
+
+    await client.get("/metrics")
+    response = await client.get("/metrics")
+
+    assert 'http_requests_total{method="GET",route="/metrics",status="200"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'http_requests_in_progress{method="GET",route="/metrics"} 1' in response.text
+
+
+# ------------------------
+# Mongo command monitoring
+# ------------------------
+@pytest.mark.asyncio
+async def test_query_shape_hides_literals(client):
+
+    query = {
+        "$or": [
+            {"title": {"$regex": "nurse", "$options": "i"}},
+            {"title": {"$regex": "driver", "$options": "i"}},
+            {"skills_required": {"$in": ["Python", "SQL"]}},
+        ]
+    }
+
+    assert query_shape(query) == {
+        "$or": [
+            {"title": {"$regex": "?", "$options": "?"}},
+            {"skills_required": {"$in": ["?"]}},
+        ]
+    }
+    assert command_shape("find", {"find": "jobs", "filter": {"_id": 1}}) == {
+        "filter": {"_id": "?"}
+    }
+
+
+@pytest.mark.asyncio
+async def test_command_monitor_records_latency_and_slow_queries(client):
+
+    monitor = CommandMonitor(slow_ms=50)
+    started = SimpleNamespace(
+        command_name="find",
+        command={"find": "jobs_monitor_test", "filter": {"title": {"$regex": "x"}}},
+        connection_id=("localhost", 27017),
+        request_id=1,
+    )
+    succeeded = SimpleNamespace(
+        command_name="find",
+        connection_id=("localhost", 27017),
+        request_id=1,
+        duration_micros=120_000,
+        database_name="aijobhunt_db_test",
+    )
+
+    monitor.started(started)
+    monitor.succeeded(succeeded)
+
+    labels = {"collection": "jobs_monitor_test", "command": "find"}
+    assert MONGO_COMMAND_DURATION_SECONDS.count(**labels) == 1
+    assert MONGO_SLOW_COMMANDS_TOTAL.value(**labels) == 1
+
+
+@pytest.mark.asyncio
+async def test_ingestion_run_metrics_exported_per_source(client):
+
+    report = {
+        "fetched": 12, "duplicates": 2, "kept": 10, "inserted": 7, "updated": 1, "unchanged": 2,
+        "duplicate_keys": 2, "near_duplicates": 0, "fetch_seconds": 4.0, "write_seconds": 1.0,
+        "docs_per_second": 2.0, "error": None,
+        "http": {"requests": 5, "pages": 4, "retries": 1, "failed_requests": 0,
+                 "p50_ms": 120.0, "p90_ms": 480.5, "p99_ms": 900.0, "max_ms": 900.0},
+    }
+    observe_ingestion_run("succeeded", {"sources": {"MetricsDemo": report}})
+
+    response = await client.get("/metrics")
+
+    assert 'ingestion_postings_total{source="MetricsDemo",stage="kept"} 10' in response.text
+    assert 'ingestion_postings_total{source="MetricsDemo",stage="duplicate_keys"} 2' in response.text
+    assert 'ingestion_http_requests_total{source="MetricsDemo",outcome="page"} 4' in response.text
+    assert 'ingestion_http_latency_ms{source="MetricsDemo",quantile="0.9"} 480.5' in response.text
+    assert 'ingestion_docs_per_second{source="MetricsDemo"} 2' in response.text
+    assert 'ingestion_phase_duration_seconds_count{source="MetricsDemo",phase="fetch"} 1' in response.text
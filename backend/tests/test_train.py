@@ -0,0 +1,45 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from backend.app.ml.train import encode_texts
+
+
+class BatchAwareEncoder:
+    """
+    Stand-in for SentenceTransformer: batches like SentenceTransformer.encode (sort by
+    length, cut into batch_size chunks) and mixes each batch's longest text into every
+    row, the way padding does, so a text encoded with different neighbours comes out
+    different.
+    """
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        order = np.argsort([-len(text) for text in texts])
+        rows = np.empty((len(texts), 3))
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            padded = max(len(texts[i]) for i in batch)
+            for i in batch:
+                rows[i] = (len(texts[i]), zlib.crc32(texts[i].encode()) % 997, padded)
+        return rows
+
+
+def load_batch_aware_encoder(model_name):
+    return BatchAwareEncoder()
+
+
+# ------------------------
+# Semantic model encoding
+# ------------------------
+@pytest.mark.asyncio
+async def test_multiprocess_encoding_matches_single_process(client):
+
+    texts = [f"job {i} " + "python developer " * (i % 7) for i in range(40)]
+    model = BatchAwareEncoder()
+
+    single = encode_texts(model, texts, batch_size=4, num_workers=1)
+    pooled = encode_texts(model, texts, batch_size=4, num_workers=2, threads_per_worker=1,
+                          load_encoder=load_batch_aware_encoder)
+
+    np.testing.assert_array_equal(pooled, single)
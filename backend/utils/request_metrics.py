@@ -0,0 +1,107 @@
+"""
+ASGI middleware recording per-route request metrics into the shared registry.
+
+Metrics (all labelled by method and route template, e.g. "/jobs/{job_id}"):
+  http_requests_total{method, route, status}
+  http_request_duration_seconds{method, route}
+  http_request_errors_total{method, route}        (5xx and unhandled exceptions)
+  http_requests_in_progress{method, route}
+
+The template is resolved before the request is handed on, the way the router
+will match it, so the in-progress gauge and requests rejected before routing
+(403) carry the same label as the rest. Paths no route matches (404) fall back
+to their router prefix (e.g. "/jobs"), or "other", to keep the label set bounded.
+
+Written as a plain ASGI middleware rather than @app.middleware("http") so the
+per-request cost is one pass over the route table, two perf_counter calls and
+a handful of dict updates.
+"""
+
+import time
+
+from starlette.routing import Match
+
+from backend.utils.metrics import REGISTRY
+
+REQUESTS_TOTAL = REGISTRY.counter(
+    "http_requests_total",
+    "HTTP requests handled, by method, route and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by method and route.",
+    ["method", "route"],
+)
+REQUEST_ERRORS_TOTAL = REGISTRY.counter(
+    "http_request_errors_total",
+    "HTTP requests that ended in a 5xx or an unhandled exception.",
+    ["method", "route"],
+)
+REQUESTS_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled, by method and route.",
+    ["method", "route"],
+)
+
+
+def _router_prefix(path: str) -> str:
+    """First path segment ("/jobs/abc" -> "/jobs"); bounded by the routers in main.py."""
+    end = path.find("/", 1)
+    return path if end == -1 else path[:end]
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._known_prefixes = None
+
+    def _router_label(self, scope) -> str:
+        if self._known_prefixes is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            self._known_prefixes = {
+                _router_prefix(getattr(route, "path", "")) for route in routes
+            }
+        prefix = _router_prefix(scope.get("path", ""))
+        return prefix if prefix in self._known_prefixes else "other"
+
+    def _route_label(self, scope) -> str:
+        """Template of the route the router will pick (first full match, else partial)."""
+        partial = None
+        for route in getattr(scope.get("app"), "routes", []):
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+            if match is Match.PARTIAL and partial is None:
+                partial = route.path  # wrong method: the router answers 405 for it
+        return partial or self._router_label(scope)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_label(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec(method=method, route=route)
+            REQUESTS_TOTAL.inc(method=method, route=route, status=status_code)
+            REQUEST_DURATION_SECONDS.observe(elapsed, method=method, route=route)
+            if status_code >= 500:
+                REQUEST_ERRORS_TOTAL.inc(method=method, route=route)
@@ -0,0 +1,40 @@
+"""
+Per-request stage timing.
+
+A StageTimer is created per request and passed down the hot path; each stage is
+wrapped in `with timer.stage("name"):`. The collected durations are rendered as
+a Server-Timing header and folded into a histogram for /metrics.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage, in first-seen order."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = (
+                self.durations.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. "filter;dur=12.41, encode;dur=3.02"."""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}"
+            for name, seconds in self.durations.items()
+        )
+
+    def observe(self, histogram, **labels) -> None:
+        """Record every stage into a Histogram labelled with `stage` plus labels."""
+        for name, seconds in self.durations.items():
+            histogram.observe(seconds, stage=name, **labels)
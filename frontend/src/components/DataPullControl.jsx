@@ -3,7 +3,10 @@ import { Card, Form, Button, Alert } from 'react-bootstrap';
 import api from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
-const INGESTION_TIMEOUT_MS = 120000;
+// Ingestion runs in the background; the trigger returns a job id that we poll
+const POLL_INTERVAL_MS = 2000;
+const POLL_TIMEOUT_MS = 30 * 60 * 1000;
+const ACTIVE_STATUSES = ['queued', 'running'];
 const SOURCES = [
   { value: 'adzuna', label: 'Adzuna' },
   { value: 'jobicy', label: 'Jobicy' },
@@ -11,6 +14,8 @@ const SOURCES = [
   { value: 'all', label: 'All' },
 ];
 
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 const DataPullControl = () => {
   const [source, setSource] = useState('adzuna');
   const [loading, setLoading] = useState(false);
@@ -21,15 +26,34 @@ const DataPullControl = () => {
 
   const devCredentialsEmail = import.meta.env.VITE_DEV_BYPASS_EMAIL;
 
-  const runOne = async (sourceKey) => {
-    const { data } = await api.post(
-      `/ingestion/${sourceKey}/top-jobs`,
-      null,
-      { timeout: INGESTION_TIMEOUT_MS }
-    );
+  const startJob = async (sourceKey) => {
+    const path = sourceKey === 'all' ? '/ingestion/all' : `/ingestion/${sourceKey}/top-jobs`;
+    const { data } = await api.post(path);
     return data;
   };
 
+  const waitForJob = async (job) => {
+    const deadline = Date.now() + POLL_TIMEOUT_MS;
+    while (ACTIVE_STATUSES.includes(job.status)) {
+      if (Date.now() > deadline) {
+        throw new Error('Timed out waiting for ingestion to finish.');
+      }
+      const { completed, total } = job.progress;
+      setStatus(`Pulling… ${completed}/${total} sources done`);
+      await sleep(POLL_INTERVAL_MS);
+      ({ data: job } = await api.get(`/ingestion/jobs/${job.job_id}`));
+    }
+    return job;
+  };
+
+  const toResults = (job) =>
+    Object.entries(job.progress.sources).map(([name, report]) => ({
+      source: name,
+      inserted: report.inserted ?? 0,
+      updated: report.updated ?? 0,
+      error: report.error,
+    }));
+
   const handlePull = async () => {
     setError(null);
     setResults([]);
@@ -38,22 +62,13 @@ const DataPullControl = () => {
 
     if (user.email == devCredentialsEmail) {
       try {
-        if (source === 'all') {
-          const list = ['adzuna', 'jobicy', 'serpapi'];
-          const out = [];
-          for (const key of list) {
-            setStatus(`Pulling ${key}…`);
-            const data = await runOne(key);
-            out.push(data);
-          }
-          setResults(out);
-          setStatus(null);
-        } else {
-          setStatus(`Pulling ${source}…`);
-          const data = await runOne(source);
-          setResults([data]);
-          setStatus(null);
+        setStatus(`Pulling ${source}…`);
+        const job = await waitForJob(await startJob(source));
+        setResults(toResults(job));
+        if (job.status === 'failed') {
+          throw new Error(job.error || 'every source failed');
         }
+        setStatus(null);
 
         // -- ML TRAINING --
         setStatus("Training ML Models...");
@@ -102,7 +117,11 @@ const DataPullControl = () => {
         {results.length > 0 && (
           <div className="mt-3 small text-success">
             {results.map((r, i) => (
-              <div key={i}>{r.source}: {r.inserted} jobs inserted.</div>
+              <div key={i} className={r.error ? 'text-danger' : undefined}>
+                {r.source}: {r.error
+                  ? r.error
+                  : `${r.inserted} jobs inserted, ${r.updated} updated.`}
+              </div>
             ))}
           </div>
         )}